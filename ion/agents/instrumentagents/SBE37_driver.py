@@ -22,6 +22,8 @@ from ion.agents.instrumentagents.instrument_connection import InstrumentConnecti
 from ion.agents.instrumentagents.instrument_driver import InstrumentDriver
 from ion.agents.instrumentagents.instrument_driver import InstrumentDriverClient
 from ion.agents.instrumentagents.instrument_fsm import InstrumentFSM
+from ion.agents.instrumentagents.line_framer import LineFramer
+from ion.agents.instrumentagents.line_framer import LineDispatcher
 from ion.agents.instrumentagents.instrument_constants import DriverCommand
 from ion.agents.instrumentagents.instrument_constants import DriverState
 from ion.agents.instrumentagents.instrument_constants import DriverEvent
@@ -254,10 +256,11 @@ class SBE37Driver(InstrumentDriver):
         self._instrument_connection = None
                 
         """
-        A string holding incomming line fragment not yet terminated by a
-        newline.
+        The framer holding incomming line fragments not yet terminated by a
+        newline, and detecting prompts at the end of the unterminated tail.
         """
-        self._line_buffer = ''
+        self._line_framer = LineFramer(SBE37Prompt.NEWLINE,
+                            (SBE37Prompt.PROMPT,SBE37Prompt.BAD_COMMAND))
 
         """
         The queue holding completed line strings for processing by state
@@ -265,6 +268,13 @@ class SBE37Driver(InstrumentDriver):
         depending on the command and state.
         """
         self._data_lines = []
+        
+        """
+        The number of leading lines in the data queue already known not to
+        contain sample data, so that repeated sample parsing in autosample
+        mode only looks at new lines.
+        """
+        self._data_lines_parsed = 0
                 
         """
         A queue of samples collected and parsed form the output buffer
@@ -652,6 +662,14 @@ class SBE37Driver(InstrumentDriver):
             SBE37State.AUTOSAMPLE : self.state_handler_autosample
         }
         
+        """
+        Combined sample and parameter line dispatcher. A single compiled
+        expression selects the parser, if any, matching each output line.
+        """
+        self._line_dispatcher = LineDispatcher([('sample',self._sample_parser)])
+        for (key,val) in self.parameters.iteritems():
+            self._line_dispatcher.add(key,val['parser'])
+        
         """
         Instrument state machine.
         """
@@ -1015,7 +1033,7 @@ class SBE37Driver(InstrumentDriver):
             yield self.send(self.proc_supid,'driver_event_occurred',content)                                    
 
             # Clear data lines and sample buffer.
-            self._data_lines = []
+            self._clear_data_lines()
             self._sample_buffer = []
             
             # Get the prompt and send start command without waiting for
@@ -1026,7 +1044,7 @@ class SBE37Driver(InstrumentDriver):
         elif event == SBE37Event.EXIT:            
 
             # Clear data lines and sample buffer.
-            self._data_lines = []
+            self._clear_data_lines()
             self._sample_buffer = []
                   
         elif event == SBE37Event.STOP_AUTOSAMPLE:
@@ -1181,35 +1199,13 @@ class SBE37Driver(InstrumentDriver):
         if IO_LOG:
             self._logfile.write(dataFrag)
 
-        # Add the fragment to the line buffer.
-        self._line_buffer += dataFrag
-
-        new_lines = False
-   
-        # If the line buffer has newlines, extract complete lines and add
-        # to the data buffer. Keep the tail fragment if any in the line buffer
-        # to append further incomming data to.
-        if SBE37Prompt.NEWLINE in self._line_buffer:
-            lines = self._line_buffer.split(SBE37Prompt.NEWLINE)
-            self._line_buffer = lines[-1]
-            self._data_lines += lines[0:-1]
-            new_lines = True
-
-        # If the linebuffer ends with a prompt, extract and append the
-        # prefix data to the data buffer. Keep the prompt in the line buffer.
-        if self._line_buffer.endswith(SBE37Prompt.PROMPT):
-            self._data_lines.append(self._line_buffer.replace(SBE37Prompt.PROMPT,''))
-            self._line_buffer = SBE37Prompt.PROMPT
-            new_lines = True
-
-        # If the line buffer ends with a bad command prompt, extract and
-        # append the prefix data to the data buffer. Keep the prompt in the
-        # line buffer.
-        elif self._line_buffer.endswith(SBE37Prompt.BAD_COMMAND):
-            self._data_lines.append(self._line_buffer.
-                                    replace(SBE37Prompt.BAD_COMMAND,''))
-            self._line_buffer = SBE37Prompt.BAD_COMMAND
-            new_lines = True
+        # Add the fragment to the line framer. Completed lines, including
+        # the data preceding a normal or bad command prompt, are added to
+        # the data buffer. A detected prompt is kept in the framer tail.
+        lines = self._line_framer.feed(dataFrag)
+        new_lines = len(lines)>0
+        if new_lines:
+            self._data_lines.extend(lines)
 
         # If new complete lines are detected, send an EVENT_DATA_RECEIVED.
         if new_lines and self._fsm.get_current_state() == SBE37State.AUTOSAMPLE:
@@ -1217,21 +1213,21 @@ class SBE37Driver(InstrumentDriver):
         
         # If a normal or bad command prompt is detected, send an
         # EVENT_PROMPTED
-        if self._line_buffer == SBE37Prompt.PROMPT:
+        if self._line_framer.tail_is(SBE37Prompt.PROMPT):
             if self._prompt_acquired_deferred:
                 d,self._prompt_acquired_deferred = \
                                     self._prompt_acquired_deferred, None
                 self._stop_wakeup()
                 d.callback(SBE37Prompt.PROMPT)
             
-        elif self._line_buffer == SBE37Prompt.BAD_COMMAND:
+        elif self._line_framer.tail_is(SBE37Prompt.BAD_COMMAND):
             if self._prompt_acquired_deferred:
                 d,self._prompt_acquired_deferred = \
                                     self._prompt_acquired_deferred, None
                 self._stop_wakeup()
                 d.callback(SBE37Prompt.BAD_COMMAND)
         
-        elif self._line_buffer == '' and len(self._data_lines)>0 and \
+        elif self._line_framer.tail_is('') and len(self._data_lines)>0 and \
             self._data_lines[-1] == SBE37Prompt.PROMPT:
             if self._autosample_prompt_acquired_deferred:
                 d,self._autosample_prompt_acquired_deferred = \
@@ -2137,7 +2133,7 @@ class SBE37Driver(InstrumentDriver):
         reply = {'success':None,'result':None}        
 
         # Clear data lines.
-        self._data_lines = []
+        self._clear_data_lines()
         
         # Acquire prompt.
         yield self._get_prompt()
@@ -2156,7 +2152,7 @@ class SBE37Driver(InstrumentDriver):
             reply['result'] = samples
         
         # Clear data lines.    
-        self._data_lines = []
+        self._clear_data_lines()
         
         defer.returnValue(reply)
         
@@ -2170,7 +2166,7 @@ class SBE37Driver(InstrumentDriver):
         self._debug_print('updating parameters')
         
         # Clear data lines.
-        self._data_lines = []
+        self._clear_data_lines()
         
         # Get prompt, issue device status command, issue device calibration
         # status command. Await prompt for each.
@@ -2183,7 +2179,7 @@ class SBE37Driver(InstrumentDriver):
         self._read_param_values(self._data_lines)
         
         # Clear data lines.
-        self._data_lines = []
+        self._clear_data_lines()
         
         defer.returnValue(None)
 
@@ -2313,38 +2309,51 @@ class SBE37Driver(InstrumentDriver):
         """
         Parse data buffer and extract all sample output lines. Remove
         sample output lines from the data buffer, and return a list of
-        samples.
+        samples. Lines left over from previous calls are known not to be
+        samples and are not parsed again.
         @retval A list of data sample dictionaries.
         """
         samples = []
         new_data_lines = []
-        for line in self._data_lines:
-            sample_data = self._sample_parser.parse(line)
-            if sample_data != None:
+        for line in self._data_lines[self._data_lines_parsed:]:
+            (key,sample_data) = self._line_dispatcher.dispatch(line)
+            if key == 'sample':
                 samples.append(sample_data)
             else:
                 new_data_lines.append(line)
-        self._data_lines = new_data_lines
+        del self._data_lines[self._data_lines_parsed:]
+        self._data_lines.extend(new_data_lines)
+        self._data_lines_parsed = len(self._data_lines)
         
         return samples
 
 
+    def _clear_data_lines(self):
+        """
+        Empty the data buffer and reset the sample parsing position.
+        """
+        self._data_lines = []
+        self._data_lines_parsed = 0
+
+
     def _read_param_values(self,lines):
         """
         Extract all parameter values from device status update output.
-        Use the parameter parser objects to match and extract data line by
-        line.
+        Use the combined line dispatcher to match each line once and
+        extract the parameter value it holds.
         """
         
         self._debug_print('reading parameter values')
 
+        new_vals = {}
+        for line in lines:
+            (key,new_val) = self._line_dispatcher.dispatch(line)
+            if key in self.parameters and new_val != None \
+                and key not in new_vals:
+                new_vals[key] = new_val
+
         for (key,val) in self.parameters.iteritems():
-            parser = val['parser']
-            new_val = None
-            for line in lines:
-                new_val = parser.parse(line)
-                if new_val != None:
-                    break
+            new_val = new_vals.get(key,None)
             if new_val != None:
                 val['value'] = new_val
             else:
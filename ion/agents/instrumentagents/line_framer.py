@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+
+"""
+@file ion/agents/instrumentagents/line_framer.py
+@brief Incremental line framing and combined regex dispatch for device
+output streams, shared by the instrument drivers.
+"""
+
+import re
+
+import ion.util.ionlog
+log = ion.util.ionlog.getLogger(__name__)
+
+
+"""
+Python 2 limits a compiled pattern to 100 groups. Combined dispatch
+patterns are split into chunks below this limit.
+"""
+MAX_GROUPS_PER_PATTERN = 99
+
+
+class LineFramer(object):
+    """
+    Split a stream of device output fragments into newline terminated
+    lines. Each fragment is scanned once for the newline: the unterminated
+    tail is kept as a list of fragments and only joined when a line is
+    completed. Prompt detection only looks at the end of the tail, so the
+    cost of a fragment does not depend on how much output came before it.
+    """
+
+    def __init__(self, newline='\r\n', prompts=()):
+        """
+        @param newline the line terminator used by the device.
+        @param prompts a sequence of device prompts, checked in order, that
+            complete a line without a terminator. A detected prompt is kept
+            as the new tail so it can be tested with tail_is().
+        """
+        self.newline = newline
+        self.prompts = tuple(prompts)
+
+        """
+        Number of trailing tail characters needed to detect a newline that
+        straddles two fragments, or a prompt at the end of the tail.
+        """
+        self._edge_len = len(newline) - 1
+        self._window = max([len(newline)] + [len(p) for p in self.prompts])
+
+        self._fragments = []
+        self._tail_len = 0
+        self._tail_end = ''
+
+    def feed(self, frag):
+        """
+        Add a data fragment to the framer.
+        @param frag a string data fragment received from the device.
+        @retval A list of the lines completed by this fragment, in order.
+            If the tail ends with a prompt, the data preceding the prompt is
+            returned as a final line and the tail is reset to the prompt.
+        """
+        lines = []
+        if not frag:
+            return lines
+
+        edge = self._tail_end[len(self._tail_end) - self._edge_len:] \
+            if self._edge_len > 0 else ''
+        self._fragments.append(frag)
+
+        if self.newline in edge + frag:
+            parts = ''.join(self._fragments).split(self.newline)
+            self._set_tail(parts.pop())
+            lines.extend(parts)
+        else:
+            self._tail_len += len(frag)
+            self._tail_end = (self._tail_end + frag[-self._window:])[-self._window:]
+
+        for prompt in self.prompts:
+            if self._tail_end.endswith(prompt):
+                lines.append(self.tail.replace(prompt, ''))
+                self._set_tail(prompt)
+                break
+
+        return lines
+
+    @property
+    def tail(self):
+        """
+        The unterminated data following the last complete line.
+        """
+        if len(self._fragments) > 1:
+            self._fragments = [''.join(self._fragments)]
+        return self._fragments[0] if self._fragments else ''
+
+    def tail_is(self, value):
+        """
+        Compare the tail to a string without joining long tails.
+        """
+        if self._tail_len != len(value):
+            return False
+        return self.tail == value
+
+    def reset(self):
+        """
+        Discard the tail.
+        """
+        self._set_tail('')
+
+    def _set_tail(self, tail):
+        self._fragments = [tail] if tail else []
+        self._tail_len = len(tail)
+        self._tail_end = tail[-self._window:]
+
+
+class LineDispatcher(object):
+    """
+    Match lines against a set of parsers with a single combined regular
+    expression. Each parser is an object with a 'pattern' attribute and a
+    parse(line) method, such as the drivers' DeviceIOParser. The combined
+    expression selects the first parser whose pattern matches at the start
+    of the line, and only that parser is run to extract the value. Patterns
+    must not use numbered back references or inline flags.
+    """
+
+    def __init__(self, parsers=()):
+        """
+        @param parsers a sequence of (key, parser) pairs, in priority order.
+        """
+        self._keys = []
+        self._parsers = []
+        self._chunks = None
+        for (key, parser) in parsers:
+            self.add(key, parser)
+
+    def add(self, key, parser):
+        """
+        Add a parser to the end of the dispatch order.
+        """
+        self._keys.append(key)
+        self._parsers.append(parser)
+        self._chunks = None
+
+    def __len__(self):
+        return len(self._parsers)
+
+    def dispatch(self, line):
+        """
+        Find the first parser matching a line and parse it.
+        @param line a line of device output.
+        @retval A (key, value) tuple for the matching parser, or
+            (None, None) if no parser matches.
+        """
+        if self._chunks is None:
+            self._compile()
+        for regex in self._chunks:
+            match = regex.match(line)
+            if match:
+                index = int(match.lastgroup[1:])
+                return (self._keys[index], self._parsers[index].parse(line))
+        return (None, None)
+
+    def _compile(self):
+        """
+        Build the combined expressions, each wrapping its alternatives in
+        a named group '_<index>' that identifies the matching parser.
+        """
+        chunks = []
+        alternatives = []
+        ngroups = 0
+        for (index, parser) in enumerate(self._parsers):
+            groups = re.compile(parser.pattern).groups + 1
+            if alternatives and ngroups + groups > MAX_GROUPS_PER_PATTERN:
+                chunks.append(re.compile('|'.join(alternatives)))
+                alternatives = []
+                ngroups = 0
+            alternatives.append('(?P<_%i>%s)' % (index, parser.pattern))
+            ngroups += groups
+        if alternatives:
+            chunks.append(re.compile('|'.join(alternatives)))
+        self._chunks = chunks
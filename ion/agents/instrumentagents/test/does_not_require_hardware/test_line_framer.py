@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+@file ion/agents/instrumentagents/test/does_not_require_hardware/test_line_framer.py
+@brief Test cases for incremental line framing and combined line dispatch.
+"""
+
+import re
+
+from twisted.trial import unittest
+
+from ion.agents.instrumentagents.line_framer import LineFramer
+from ion.agents.instrumentagents.line_framer import LineDispatcher
+
+
+class StubParser(object):
+    """
+    Minimal parser with the DeviceIOParser interface.
+    """
+    def __init__(self, pattern, getval):
+        self.pattern = pattern
+        self.regex = re.compile(pattern)
+        self.getval = getval
+
+    def parse(self, line):
+        match = self.regex.match(line)
+        if match:
+            return self.getval(match)
+        return None
+
+
+class TestLineFramer(unittest.TestCase):
+
+    def setUp(self):
+        self.framer = LineFramer('\r\n', ('S>', '?cmd S>'))
+
+    def test_split_lines(self):
+        self.assertEqual(self.framer.feed('abc\r\ndef\r\ngh'), ['abc', 'def'])
+        self.assertEqual(self.framer.tail, 'gh')
+        self.assertEqual(self.framer.feed('i\r\n'), ['ghi'])
+        self.assertTrue(self.framer.tail_is(''))
+
+    def test_fragmented_line(self):
+        for c in '12.3456, 0.12345, 1.234':
+            self.assertEqual(self.framer.feed(c), [])
+        self.assertEqual(self.framer.feed('\r\n'), ['12.3456, 0.12345, 1.234'])
+
+    def test_newline_across_fragments(self):
+        self.assertEqual(self.framer.feed('abc\r'), [])
+        self.assertEqual(self.framer.feed('\ndef'), ['abc'])
+        self.assertEqual(self.framer.tail, 'def')
+
+    def test_prompt(self):
+        self.assertEqual(self.framer.feed('ds output\r\nlast'), ['ds output'])
+        self.assertEqual(self.framer.feed(' line S'), [])
+        self.assertEqual(self.framer.feed('>'), ['last line '])
+        self.assertTrue(self.framer.tail_is('S>'))
+        self.assertFalse(self.framer.tail_is('?cmd S>'))
+
+        # A prompt followed by a newline is a complete line.
+        self.assertEqual(self.framer.feed('\r\n'), ['S>'])
+        self.assertTrue(self.framer.tail_is(''))
+
+    def test_matches_unframed_split(self):
+        data = ''.join(['%i.0, %i.5, 0.1\r\n' % (i, i) for i in range(200)])
+        expected = data.split('\r\n')[:-1]
+        lines = []
+        for i in range(0, len(data), 7):
+            lines.extend(self.framer.feed(data[i:i+7]))
+        self.assertEqual(lines, expected)
+
+    def test_single_char_newline(self):
+        framer = LineFramer('\n')
+        self.assertEqual(framer.feed('a\nb'), ['a'])
+        self.assertEqual(framer.feed('\n'), ['b'])
+
+
+class TestLineDispatcher(unittest.TestCase):
+
+    def test_dispatch(self):
+        dispatcher = LineDispatcher([
+            ('sample', StubParser(r'^#? *(-?\d+\.\d+), *(-?\d+\.\d+)',
+                                  lambda m: (float(m.group(1)), float(m.group(2))))),
+            ('navg', StubParser(r'number of samples to average = (\d+)',
+                                lambda m: int(m.group(1)))),
+            ('sal', StubParser(r'(do not )?output salinity',
+                               lambda m: False if m.group(1) else True))])
+
+        self.assertEqual(dispatcher.dispatch('# 20.1, 0.5'), ('sample', (20.1, 0.5)))
+        self.assertEqual(dispatcher.dispatch('number of samples to average = 4'),
+                         ('navg', 4))
+        self.assertEqual(dispatcher.dispatch('do not output salinity'), ('sal', False))
+        self.assertEqual(dispatcher.dispatch('output salinity'), ('sal', True))
+        self.assertEqual(dispatcher.dispatch('S>'), (None, None))
+
+    def test_first_parser_wins(self):
+        dispatcher = LineDispatcher()
+        dispatcher.add('a', StubParser(r'abc', lambda m: 'a'))
+        dispatcher.add('b', StubParser(r'ab', lambda m: 'b'))
+        self.assertEqual(dispatcher.dispatch('abc'), ('a', 'a'))
+        self.assertEqual(dispatcher.dispatch('abd'), ('b', 'b'))
+
+    def test_many_groups(self):
+        # More groups than a single compiled pattern may hold.
+        dispatcher = LineDispatcher()
+        for i in range(100):
+            dispatcher.add(i, StubParser(r'P%i = ((\d+)-(\d+))$' % i,
+                                         lambda m: int(m.group(2))))
+        self.assertEqual(len(dispatcher), 100)
+        self.assertEqual(dispatcher.dispatch('P0 = 1-2'), (0, 1))
+        self.assertEqual(dispatcher.dispatch('P99 = 7-8'), (99, 7))
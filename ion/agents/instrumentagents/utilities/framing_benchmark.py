@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+@file ion/agents/instrumentagents/utilities/framing_benchmark.py
+@brief Throughput benchmark for driver line framing and sample parsing,
+using the output of the SBE49 and NMEA0183 simulators.
+"""
+
+"""
+Use:
+
+bin/mypython ion/agents/instrumentagents/utilities/framing_benchmark.py [options]
+
+options:
+-n --no_lines       number of simulated device output lines
+-f --frag_size      size of the fragments the output is delivered in
+"""
+
+import re
+import time
+import datetime
+from optparse import OptionParser
+
+from ion.agents.instrumentagents.SBE37_driver import SBE37Prompt
+from ion.agents.instrumentagents.line_framer import LineFramer
+from ion.agents.instrumentagents.line_framer import LineDispatcher
+from ion.agents.instrumentagents.simulators.sim_SBE49 import Instrument
+from ion.agents.instrumentagents.simulators.sim_NMEA0183 import BuildGPGGA
+
+
+SAMPLE_PATTERN = r'^#? *(-?\d+\.\d+), *(-?\d+\.\d+), *(-?\d+\.\d+)(, *(-?\d+\.\d+))?'
+
+
+class SampleParser(object):
+    """
+    DeviceIOParser stand in returning the matched sample fields.
+    """
+    pattern = SAMPLE_PATTERN
+    regex = re.compile(SAMPLE_PATTERN)
+
+    def parse(self, line):
+        match = self.regex.match(line)
+        if match:
+            return match.groups()
+        return None
+
+
+def sbe_output(no_lines):
+    """
+    Autosample output of the SBE49 simulator, interleaved with the occasional
+    non sample line that stays in the driver data buffer.
+    """
+    sim = Instrument()
+    lines = []
+    for i in xrange(no_lines):
+        if i % 50 == 0:
+            lines.append('S>' + SBE37Prompt.NEWLINE)
+        else:
+            lines.append(sim.get_next_sample())
+    return ''.join(lines)
+
+
+def nmea_output(no_lines):
+    """
+    GPGGA output of the NMEA0183 simulator.
+    """
+    t0 = datetime.datetime(2011, 5, 1)
+    return ''.join([BuildGPGGA({'time':t0 + datetime.timedelta(seconds=i),
+                                'lat':32.87 + i * 1e-5,
+                                'lon':-117.25 - i * 1e-5})
+                    for i in xrange(no_lines)])
+
+
+def fragments(data, frag_size):
+    return [data[i:i+frag_size] for i in xrange(0, len(data), frag_size)]
+
+
+def run_legacy(frags):
+    """
+    The previous SBE37Driver.gotData scheme: string concatenation, a split
+    of the line buffer per fragment and a reparse of every buffered line.
+    """
+    parser = SampleParser()
+    line_buffer = ''
+    data_lines = []
+    samples = 0
+    for frag in frags:
+        line_buffer += frag
+        if SBE37Prompt.NEWLINE in line_buffer:
+            lines = line_buffer.split(SBE37Prompt.NEWLINE)
+            line_buffer = lines[-1]
+            data_lines += lines[0:-1]
+            new_data_lines = []
+            for line in data_lines:
+                if parser.parse(line) != None:
+                    samples += 1
+                else:
+                    new_data_lines.append(line)
+            data_lines = new_data_lines
+    return samples
+
+
+def run_framer(frags):
+    """
+    The LineFramer and LineDispatcher scheme used by the drivers.
+    """
+    framer = LineFramer(SBE37Prompt.NEWLINE,
+                        (SBE37Prompt.PROMPT, SBE37Prompt.BAD_COMMAND))
+    dispatcher = LineDispatcher([('sample', SampleParser())])
+    data_lines = []
+    parsed = 0
+    samples = 0
+    for frag in frags:
+        lines = framer.feed(frag)
+        if not lines:
+            continue
+        data_lines.extend(lines)
+        new_data_lines = []
+        for line in data_lines[parsed:]:
+            (key, value) = dispatcher.dispatch(line)
+            if key == 'sample':
+                samples += 1
+            else:
+                new_data_lines.append(line)
+        del data_lines[parsed:]
+        data_lines.extend(new_data_lines)
+        parsed = len(data_lines)
+    return samples
+
+
+def run_nmea_framer(frags):
+    framer = LineFramer('\r\n')
+    count = 0
+    for frag in frags:
+        count += len(framer.feed(frag))
+    return count
+
+
+def timeit(label, func, frags, nbytes):
+    t0 = time.time()
+    result = func(frags)
+    delta_t = time.time() - t0
+    print '%-28s %8i lines %8.3f s %10.1f kB/s' % (label, result, delta_t,
+                                                   nbytes / 1024.0 / delta_t)
+
+
+if __name__ == '__main__':
+
+    parser = OptionParser()
+    parser.add_option('-n','--no_lines',dest='no_lines',
+                      type='int',action='store',default=20000,
+                      help='number of simulated device output lines')
+    parser.add_option('-f','--frag_size',dest='frag_size',
+                      type='int',action='store',default=16,
+                      help='size of the data fragments delivered to the driver')
+    (options, args) = parser.parse_args()
+
+    data = sbe_output(options.no_lines)
+    frags = fragments(data, options.frag_size)
+    print 'SBE49 simulator output, %i bytes in %i fragments' % (len(data),
+                                                                len(frags))
+    timeit('legacy gotData', run_legacy, frags, len(data))
+    timeit('LineFramer/LineDispatcher', run_framer, frags, len(data))
+
+    data = nmea_output(options.no_lines)
+    frags = fragments(data, options.frag_size)
+    print 'NMEA0183 simulator output, %i bytes in %i fragments' % (len(data),
+                                                                   len(frags))
+    timeit('LineFramer', run_nmea_framer, frags, len(data))
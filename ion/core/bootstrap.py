@@ -74,7 +74,7 @@ def _set_container_args(contargs=None):
                 if type(evargs) is dict:
                     ioninit.cont_args.update(evargs)
             except Exception, e:
-                log.error('Invalid argument format: ', e)
+                log.error('Invalid argument format: %s', e)
         elif contargs.find('=') > 0:
             # Key=value arguments separated by comma
             log.info("Parsing KV")
@@ -91,8 +91,8 @@ def _set_container_args(contargs=None):
     else:
         ioninit.sys_name = ioninit.container_instance.id
 
-def spawn_processes(procs, sup=None):
-    return ioninit.container_instance.spawn_processes(procs, sup)
+def spawn_processes(procs, sup=None, **kwargs):
+    return ioninit.container_instance.spawn_processes(procs, sup, **kwargs)
 
 def create_supervisor():
     return ioninit.container_instance.create_supervisor()
@@ -1,7 +1,42 @@
+import bisect
 import re
 
 from twisted.internet import defer
 
+from ion.util.cache import LRUDict
+
+# Characters that make a query more than a literal string
+REGEX_SPECIAL_CHARS = frozenset('.^$*+?{}[]\\|()')
+
+# Compiled query patterns, the least recently used is dropped when full
+PATTERN_CACHE_SIZE = 64
+_patterns = LRUDict(PATTERN_CACHE_SIZE)
+
+def compile_pattern(regex):
+    """
+    Return the compiled pattern for a query regex, keeping the most recently
+    used ones.
+    """
+    if not isinstance(regex, basestring):
+        return regex
+
+    pattern = _patterns.get(regex)
+    if pattern is None:
+        pattern = re.compile(regex)
+        _patterns[regex] = pattern
+    return pattern
+
+def anchored_prefix(regex):
+    """
+    Return the literal prefix of a query of the form '^prefix', or None if
+    the query is any other regex.
+    """
+    if not isinstance(regex, basestring) or not regex.startswith('^'):
+        return None
+    prefix = regex[1:]
+    if REGEX_SPECIAL_CHARS.intersection(prefix):
+        return None
+    return prefix
 
 
 class Store(object):
@@ -10,6 +45,10 @@ class Store(object):
     def __init__(self):
         self.kvs = {}
 
+        # Sorted keys of the kvs dict for prefix queries, built on demand
+        self._sorted_keys = None
+        self._sorted_kvs = None
+
     def read(self, key):
         """
         """
@@ -20,17 +59,50 @@ class Store(object):
     def write(self, key, value):
         """
         """
-        return defer.maybeDeferred(self.kvs.update, {key:value})
+        return defer.maybeDeferred(self._write, key, value)
 
     put = write
 
+    def _write(self, key, value):
+        """
+        """
+        if key not in self.kvs and self._sorted_kvs is self.kvs:
+            bisect.insort(self._sorted_keys, key)
+        self.kvs[key] = value
+
     def query(self, regex):
         return defer.maybeDeferred(self._query, regex)
 
     def _query(self, regex):
         """
+        @brief Find the keys matching a regex
+        @retval list with the matched part of each matching key
         """
-        return [re.search(regex,m).group() for m in self.kvs.keys() if re.search(regex,m)]
+        prefix = anchored_prefix(regex)
+        if prefix is not None:
+            # Every key with the prefix matches it exactly
+            keys = self._get_sorted_keys()
+            result = []
+            i = bisect.bisect_left(keys, prefix)
+            while i < len(keys) and keys[i].startswith(prefix):
+                result.append(prefix)
+                i += 1
+            return result
+
+        search = compile_pattern(regex).search
+        result = []
+        for key in self.kvs:
+            match = search(key)
+            if match:
+                result.append(match.group())
+        return result
+
+    def _get_sorted_keys(self):
+        # Rebuild if the kvs dict was replaced or changed behind our back
+        if self._sorted_kvs is not self.kvs or len(self._sorted_keys) != len(self.kvs):
+            self._sorted_keys = sorted(self.kvs)
+            self._sorted_kvs = self.kvs
+        return self._sorted_keys
 
     def delete(self, key):
         return defer.maybeDeferred(self._delete, key)
@@ -39,7 +111,12 @@ class Store(object):
         """
         """
         del self.kvs[key]
-        return 
+        if self._sorted_kvs is self.kvs:
+            keys = self._sorted_keys
+            i = bisect.bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
+        return
 
 
 class MessageSpaceRegistry(Store):
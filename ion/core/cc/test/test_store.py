@@ -1,4 +1,9 @@
 
+import time
+
+import ion.util.ionlog
+log = ion.util.ionlog.getLogger(__name__)
+
 from twisted.internet import defer
 from twisted.trial import unittest
 
@@ -34,3 +39,47 @@ class StoreTest(unittest.TestCase):
         #as long as this doesn't error, it passes
         
 
+    def test_query_regex(self):
+        self.store.kvs = {'proc.one':1, 'proc.two':2, 'sup.one':3}
+        result = self.store._query('one$')
+        self.assertEquals(sorted(result), ['one', 'one'])
+        result = self.store._query('p.*o')
+        self.assertEquals(sorted(result), ['p.o', 'proc.o', 'proc.two'])
+
+    @defer.inlineCallbacks
+    def test_query_prefix(self):
+        self.store.kvs = {'proc_one':1, 'proc_two':2, 'sup_one':3}
+        result = yield self.store.query('^proc')
+        self.assertEquals(result, ['proc', 'proc'])
+
+        yield self.store.write('proc_three', 3)
+        yield self.store.write('proc_one', 4)
+        result = yield self.store.query('^proc')
+        self.assertEquals(result, ['proc', 'proc', 'proc'])
+
+        yield self.store.delete('proc_two')
+        result = yield self.store.query('^proc_t')
+        self.assertEquals(result, ['proc_t'])
+
+        # Replacing the backend is noticed
+        self.store.kvs = {'sup_two':1}
+        result = yield self.store.query('^sup')
+        self.assertEquals(result, ['sup'])
+        result = yield self.store.query('^proc')
+        self.assertEquals(result, [])
+
+    def test_query_many_keys(self):
+        for i in xrange(100000):
+            self.store._write('proc_%06d' % i, i)
+
+        t0 = time.time()
+        scan_result = self.store._query('proc_0012')
+        scan_time = time.time() - t0
+
+        t0 = time.time()
+        prefix_result = self.store._query('^proc_0012')
+        prefix_time = time.time() - t0
+
+        self.assertEquals(len(scan_result), 100)
+        self.assertEquals(scan_result, prefix_result)
+        log.info('Query of 100000 keys: regex %f s, prefix %f s', scan_time, prefix_time)
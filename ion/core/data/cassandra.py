@@ -232,9 +232,9 @@ class CassandraStore(TCPConnection):
         uname = credentials.username
         pword = credentials.password
         authorization_dictionary = {'username': uname, 'password': pword}
-        log.info("Connecting to %s on port %s " % (host,port))
-        log.info("Using keyspace %s" % (self._keyspace,))
-        log.info("authorization_dictionary; %s" % (str(authorization_dictionary),))
+        log.info("Connecting to %s on port %s ", host, port)
+        log.info("Using keyspace %s", self._keyspace)
+        log.info("authorization_dictionary; %s", authorization_dictionary)
         ### Create the twisted factory for the TCP connection  
         self._manager = ManagedCassandraClientFactory(keyspace=self._keyspace, credentials=authorization_dictionary)
         
@@ -280,7 +280,7 @@ class CassandraStore(TCPConnection):
 
 
         if toc - tic > 4.0:
-            log.info('Cassandra get operation elapsed time %f; result size: %s' % (toc - tic, lval))
+            log.info('Cassandra get operation elapsed time %f; result size: %s', toc - tic, lval)
 
         self.get_stats.add_stats(tic,toc,lval)
 
@@ -323,7 +323,7 @@ class CassandraStore(TCPConnection):
 
 
         if toc - tic > 4.0:
-            log.info('Cassandra batch get operation elapsed time %f; result size: %s' % (toc - tic, lval))
+            log.info('Cassandra batch get operation elapsed time %f; result size: %s', toc - tic, lval)
 
         self.batch_get_stats.add_stats(tic,toc,lval)
 
@@ -355,7 +355,7 @@ class CassandraStore(TCPConnection):
         toc = time.time()
 
         if toc - tic > 4.0:
-            log.info('Cassandra put operation elapsed time %f; result size: %s' % (toc - tic, len(value)))
+            log.info('Cassandra put operation elapsed time %f; result size: %s', toc - tic, len(value))
 
         self.put_stats.add_stats(tic,toc,len(value))
 
@@ -382,7 +382,7 @@ class CassandraStore(TCPConnection):
         toc = time.time()
 
         if toc - tic > 4.0:
-            log.warn('Cassandra batch_put operation elapsed time %f; result size: %s' % (toc - tic, len(batch_request)))
+            log.warn('Cassandra batch_put operation elapsed time %f; result size: %s', toc - tic, len(batch_request))
 
         self.batch_put_stats.add_stats(tic,toc,len(batch_request))
 
@@ -413,7 +413,7 @@ class CassandraStore(TCPConnection):
         toc = time.time()
 
         if toc - tic > 4.0:
-            log.info('CassandraStore has_key operation elapsed time %f;' % (toc - tic))
+            log.info('CassandraStore has_key operation elapsed time %f;', toc - tic)
 
         self.has_stats.add_stats(tic,toc)
 
@@ -449,7 +449,7 @@ class CassandraStore(TCPConnection):
         toc = time.time()
 
         if toc - tic > 4.0:
-            log.info('CassandraStore batch_has_key operation elapsed time %f;' % (toc - tic))
+            log.info('CassandraStore batch_has_key operation elapsed time %f;', toc - tic)
 
         self.has_stats.add_stats(tic,toc)
 
@@ -561,7 +561,7 @@ class CassandraIndexedStore(CassandraStore):
         toc = time.time()
 
         if toc - tic > 4.0:
-            log.info('Cassandra put operation elapsed time %f; result size: %s' % (toc - tic, len(value)))
+            log.info('Cassandra put operation elapsed time %f; result size: %s', toc - tic, len(value))
 
         self.put_stats.add_stats(tic,toc,len(value))
 
@@ -589,7 +589,7 @@ class CassandraIndexedStore(CassandraStore):
         toc = time.time()
 
         if toc - tic > 4.0:
-            log.warn('Cassandra batch_put operation elapsed time %f; result size: %s' % (toc - tic, len(batch_request)))
+            log.warn('Cassandra batch_put operation elapsed time %f; result size: %s', toc - tic, len(batch_request))
 
         self.batch_put_stats.add_stats(tic,toc,len(batch_request))
 
@@ -616,7 +616,7 @@ class CassandraIndexedStore(CassandraStore):
         toc = time.time()
 
         if toc - tic > 4.0:
-            log.info('Cassandra update_index operation elapsed time %f;' % (toc - tic))
+            log.info('Cassandra update_index operation elapsed time %f;', toc - tic)
 
         self.update_stats.add_stats(tic,toc)
 
@@ -705,7 +705,7 @@ class CassandraIndexedStore(CassandraStore):
         toc = time.time()
 
         if toc - tic > 4.0:
-            log.info('Cassandra Query operation elapsed time %f; # of rows returned: %d, # of predicates in request: %d' % (toc - tic, len(rows), len(predicates)))
+            log.info('Cassandra Query operation elapsed time %f; # of rows returned: %d, # of predicates in request: %d', toc - tic, len(rows), len(predicates))
 
         self.query_stats.add_stats(tic,toc,len(predicates), len(rows))
 
@@ -771,7 +771,7 @@ class CassandraDataManager(TCPConnection):
         host = storage_resource.get_host()
         port = storage_resource.get_port()
         authorization_dictionary = storage_resource.get_credentials()
-        log.info("host: %s and port: %s" % (host,str(port)))
+        log.info("host: %s and port: %s", host, port)
         self._manager = ManagedCassandraClientFactory(credentials=authorization_dictionary)
         
         TCPConnection.__init__(self,host,port,self._manager)
@@ -785,7 +785,7 @@ class CassandraDataManager(TCPConnection):
         @param persistent_archive is an ion resource which defines the properties of a Key Space
         """
         keyspace = persistent_archive.name
-        log.info("Creating keyspace with name %s" % (keyspace,))
+        log.info("Creating keyspace with name %s", keyspace)
         #Check to see if replication_factor and strategy_class is defined in the persistent_archive
         ksdef = KsDef(name=keyspace, replication_factor=1,
                 strategy_class='org.apache.cassandra.locator.SimpleStrategy',
@@ -815,7 +815,7 @@ class CassandraDataManager(TCPConnection):
         @param persistent_archive is a persistent archive object which defines the properties of a Key Space
         """
         keyspace = persistent_archive.name
-        log.info("Removing keyspace with name %s" % (keyspace,))
+        log.info("Removing keyspace with name %s", keyspace)
         yield self.client.system_drop_keyspace(keyspace)
         
     @timeout(cassandra_timeout)
@@ -854,18 +854,18 @@ class CassandraDataManager(TCPConnection):
         """
         yield self.client.set_keyspace(persistent_archive.name)
         desc = yield self.client.describe_keyspace(persistent_archive.name)
-        log.info("Describe keyspace return %s" % (desc,))
+        log.info("Describe keyspace return %s", desc)
         #Retrieve the correct column family by filtering by name
         select_cf = lambda cf_name: cf_name.name == cache.name
         cf_defs = filter(select_cf, desc.cf_defs)
         #Raise an exception if it doesn't find the column family
         assert len(cf_defs) == 1
         cf_id = cf_defs[0].id
-        log.info("Update column family with %s,%s,%s,%s%s" % (persistent_archive.name, cache.name, cf_id, cache.column_type, cache.comparator_type))
+        log.info("Update column family with %s,%s,%s,%s%s", persistent_archive.name, cache.name, cf_id, cache.column_type, cache.comparator_type)
         
         column = cache.column_metadata[0]
-        log.info("column attrs %s " % (column.__dict__))
-        log.info("Column message fields: %s,%s,%s" % (column.column_name,column.validation_class, column.index_name))
+        log.info("column attrs %s ", column.__dict__)
+        log.info("Column message fields: %s,%s,%s", column.column_name, column.validation_class, column.index_name)
 
         cf_column_metadata = self.__generate_column_metadata(cache)
         cf_def = CfDef(keyspace = persistent_archive.name,
@@ -874,7 +874,7 @@ class CassandraDataManager(TCPConnection):
                        column_type=cache.column_type,
                        comparator_type=cache.comparator_type,
                        column_metadata= cf_column_metadata)   
-        log.info("cf_def: " + str(cf_def))      
+        log.info("cf_def: %s", cf_def)
         yield self.client.system_update_column_family(cf_def) 
     
     @defer.inlineCallbacks
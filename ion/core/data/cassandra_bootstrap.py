@@ -34,10 +34,10 @@ def parse_cassandra_config(username, password, storage_provider, keyspace=None):
     Get init args from the bootstrap
     """
 
-    log.info('CassandraBootStrap Args: Uname - %s, Password - %s, Keyspace - %s' % (username,'******',keyspace))
+    log.info('CassandraBootStrap Args: Uname - %s, Password - %s, Keyspace - %s', username, '******', keyspace)
 
 
-    log.debug('Configuring Cassandra Connection: %s' % str(storage_provider))
+    log.debug('Configuring Cassandra Connection: %s', storage_provider)
     host = storage_provider["host"]
     port = storage_provider["port"]
 
@@ -53,7 +53,7 @@ def parse_cassandra_config(username, password, storage_provider, keyspace=None):
 
     manager = ManagedCassandraClientFactory(**client_factory_kwargs)
 
-    log.info('CassandraBootStrap Manager: Host - %s, Port - %s' % (host, port))
+    log.info('CassandraBootStrap Manager: Host - %s, Port - %s', host, port)
 
     return (host, port, manager)
 
@@ -61,8 +61,8 @@ class CassandraIndexedStoreBootstrap(CassandraIndexedStore):
     
     def __init__(self, username, password, storage_provider, keyspace, column_family):
 
-        log.info("CassandraIndexedStoreBootstrap: username - %s, password - %s, storage_provider - %s, keyspace - %s, column_family - %s" %
-        (username, '******', storage_provider, keyspace, column_family))
+        log.info("CassandraIndexedStoreBootstrap: username - %s, password - %s, storage_provider - %s, keyspace - %s, column_family - %s",
+        username, '******', storage_provider, keyspace, column_family)
 
         host, port, manager = parse_cassandra_config(username, password, storage_provider, keyspace)
 
@@ -83,8 +83,8 @@ class CassandraStoreBootstrap(CassandraStore):
 
     def __init__(self, username, password, storage_provider, keyspace, column_family):
 
-        log.info("CassandraStoreBootstrap: username - %s, password - %s, storage_provider - %s, keyspace - %s, column_family - %s" %
-        (username, '******', storage_provider, keyspace, column_family))
+        log.info("CassandraStoreBootstrap: username - %s, password - %s, storage_provider - %s, keyspace - %s, column_family - %s",
+        username, '******', storage_provider, keyspace, column_family)
 
         host, port, manager = parse_cassandra_config(username, password, storage_provider, keyspace)
 
@@ -147,7 +147,7 @@ class CassandraSchemaProvider(object):
         if storage_conf is None:
             storage_conf = self._storage_conf
 
-        log.debug('Configuring Cassandra: \n %s \n' % storage_conf)
+        log.debug('Configuring Cassandra: \n %s \n', storage_conf)
 
         try:
             keyspace = storage_conf[PERSISTENT_ARCHIVE]['name']
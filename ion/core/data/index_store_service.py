@@ -89,7 +89,7 @@ class IndexStoreService(ServiceProcess):
         @retval return a cassandra_rows type. The key attribute will be set and each row will contain one column 
         with the name value.
         """
-        log.debug("In op_query: request %s" % request)
+        log.debug("In op_query: request %s", request)
 
         query_predicates = Query()    
         for attr in request.attrs:
@@ -119,7 +119,7 @@ class IndexStoreService(ServiceProcess):
                 col.column_name = name
                 col.column_value = val
         
-        log.debug("op_query Result %s" % response)
+        log.debug("op_query Result %s", response)
 
         yield self.reply_ok(msg,response)
             
@@ -187,7 +187,7 @@ class IndexStoreService(ServiceProcess):
         @retval return a string that is "True" or "False" in a CassandraRow message
         """
         key_exists = yield self._indexed_store.has_key(request.key)
-        log.info("key_exists: " + str(key_exists))
+        log.info("key_exists: %s", key_exists)
         response = yield self.message_client.create_instance(ROW_TYPE)
         response.value = str(int(key_exists))
         yield self.reply_ok(msg, response)
@@ -329,7 +329,7 @@ class IndexStoreServiceClient(ServiceClient):
         row.key = key
         (result, headers, msg) = yield self.rpc_send('has_key', row)
         ret = bool(int(result.value))
-        log.info("%s" % (ret,))
+        log.info("%s", ret)
         defer.returnValue(ret)
         
     @defer.inlineCallbacks
@@ -391,7 +391,7 @@ class IndexStore(object):
         @retVal A data structure representing Cassandra rows. See the class
         docstring for the description of the data structure.
         """
-        log.debug("In query: predicates %s" % query_predicates)
+        log.debug("In query: predicates %s", query_predicates)
 
         predicates = query_predicates.get_predicates()
 
@@ -428,12 +428,12 @@ class IndexStore(object):
             if self.kvs.has_key(k):
                 result[k] = self.kvs.get(k).copy()
 
-        log.debug("Query Results: %s" % result)
+        log.debug("Query Results: %s", result)
 
         return defer.succeed(result)                
     
     def _update_index(self, key, index_attributes):
-        log.debug("In _update_index: key %s index_attributes %s" % (key,index_attributes))
+        log.debug("In _update_index: key %s index_attributes %s", key, index_attributes)
         #Ensure that we are updating attributes that are indexed.
         query_attribute_names = set(self.indices.keys())
         index_attribute_names = set(index_attributes.keys())
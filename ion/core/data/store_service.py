@@ -135,7 +135,7 @@ class StoreService(ServiceProcess):
         @retval return a string that is "True" or "False" in a CassandraRow message
         """
         key_exists = yield self._store.has_key(request.key)
-        log.info("key_exists: " + str(key_exists))
+        log.info("key_exists: %s", key_exists)
         response = yield self.message_client.create_instance(ROW_TYPE)
         response.value = str(int(key_exists))
         yield self.reply_ok(msg, response)
@@ -205,5 +205,5 @@ class StoreServiceClient(ServiceClient):
         row.key = key
         (result, headers, msg) = yield self.rpc_send('has_key', row)
         ret = bool(int(result.value))
-        log.info("%s" % (ret,))
+        log.info("%s", ret)
         defer.returnValue(ret)
\ No newline at end of file
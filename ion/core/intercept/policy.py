@@ -16,18 +16,19 @@ from ion.core import ioninit
 from ion.core.intercept.interceptor import EnvelopeInterceptor
 
 from ion.core.messaging.message_client import MessageInstance
+from ion.core.object import object_utils
 
 from ion.core.process.cprocess import Invocation
 
 import time
+from collections import deque
+from itertools import islice
 
 from ion.util.config import Config
 
 from ion.services.coi.datastore_bootstrap.ion_preload_config \
     import OWNED_BY_ID, HAS_ROLE_ID, ROLE_NAMES_BY_ID, ROLE_IDS_BY_NAME
-from ion.services.dm.inventory.association_service import AssociationServiceClient, ASSOCIATION_QUERY_MSG_TYPE
-from ion.services.dm.inventory.association_service import IDREF_TYPE
-from ion.core.messaging.message_client import MessageClient
+from ion.services.dm.inventory.association_service import AssociationServiceClient
 
 from google.protobuf.internal.containers import RepeatedScalarFieldContainer
 
@@ -72,23 +73,163 @@ def construct_policy_lists(policydb):
 policydb_filename = ioninit.adjust_dir(CONF.getValue('policydecisionpointdb'))
 policy_dictionary = construct_policy_lists(Config(policydb_filename).getObject())
 
-def construct_user_role_lists(userroledict):
+class RoleTableError(Exception):
+    """
+    Raised for role table snapshots and deltas which can not be applied
+    """
+
+class RoleTable(object):
+    """
+    @brief The roles of the users known to this container.
+    Every change is a delta (version, op, ooi_id, role) with op 'set_user_role'
+    or 'unset_user_role' and a version one higher than the last. The recent
+    deltas are kept so a replica of the table can catch up from a snapshot
+    by applying the deltas after the snapshot version in order. Versions
+    only count the changes of one table; tables changed independently, like
+    those of two identity registries, can not exchange deltas.
+    The roles of a user are a frozenset which is replaced, never modified,
+    when they change.
+    """
+
+    SET_ROLE = 'set_user_role'
+    UNSET_ROLE = 'unset_user_role'
+
+    def __init__(self, role_subjects=None, max_deltas=10000):
+        """
+        @param role_subjects dict of role name to the certificate subjects
+            configured for the role
+        @param max_deltas number of recent deltas kept for deltas_since
+        """
+        self.role_subjects = {}
+        for role, subjects in (role_subjects or {}).iteritems():
+            self.role_subjects[role] = frozenset(subjects)
+
+        self.version = 0
+        self._user_roles = {}
+        self._max_deltas = max_deltas
+        self._deltas = deque()
+        # Deltas received ahead of the one applying next, by version
+        self._pending = {}
+
+    def get_roles(self, ooi_id):
+        return self._user_roles.get(ooi_id, frozenset())
+
+    def has_role(self, ooi_id, role):
+        return role in self._user_roles.get(ooi_id, ())
+
+    def subject_has_role(self, subject, role):
+        return subject in self.role_subjects[role]
+
+    def set_role(self, ooi_id, role):
+        """
+        @retval the delta for the change, None if the user had the role already
+        """
+        if self.has_role(ooi_id, role):
+            return None
+        return self._apply((self.version + 1, self.SET_ROLE, ooi_id, role))
+
+    def unset_role(self, ooi_id, role):
+        """
+        @retval the delta for the change, None if the user did not have the role
+        """
+        if not self.has_role(ooi_id, role):
+            return None
+        return self._apply((self.version + 1, self.UNSET_ROLE, ooi_id, role))
+
+    def _apply(self, delta):
+        version, op, ooi_id, role = delta
+        roles = self._user_roles.get(ooi_id, frozenset())
+        if op == self.SET_ROLE:
+            roles = roles | frozenset([role])
+        elif op == self.UNSET_ROLE:
+            roles = roles - frozenset([role])
+        else:
+            raise RoleTableError('Unknown role table operation "%s"' % op)
+
+        if roles:
+            self._user_roles[ooi_id] = roles
+        else:
+            self._user_roles.pop(ooi_id, None)
+
+        self.version = version
+        self._deltas.append(delta)
+        if len(self._deltas) > self._max_deltas:
+            self._deltas.popleft()
+        return delta
+
+    def apply_deltas(self, deltas):
+        """
+        @brief Apply deltas of another table in version order. Deltas already
+        applied are ignored, deltas after a missing version wait for it.
+        @retval the number of deltas applied
+        """
+        for delta in deltas:
+            if delta[0] > self.version:
+                self._pending[delta[0]] = tuple(delta)
+
+        applied = 0
+        while self.version + 1 in self._pending:
+            self._apply(self._pending.pop(self.version + 1))
+            applied += 1
+        return applied
+
+    def deltas_since(self, version):
+        """
+        @retval the deltas after the given version, or None if they are no
+        longer kept and a snapshot is needed
+        """
+        if version >= self.version:
+            return []
+        if not self._deltas or self._deltas[0][0] > version + 1:
+            return None
+        return list(islice(self._deltas, version + 1 - self._deltas[0][0], None))
+
+    def snapshot(self):
+        """
+        @retval the state of the table as a dict of plain types
+        """
+        users = {}
+        for ooi_id, roles in self._user_roles.iteritems():
+            users[ooi_id] = sorted(roles)
+        return {'version': self.version, 'users': users}
+
+    def restore(self, snapshot):
+        """
+        @brief Replace the state of the table with a snapshot
+        """
+        try:
+            version = int(snapshot['version'])
+            user_roles = {}
+            for ooi_id, roles in snapshot['users'].iteritems():
+                if roles:
+                    user_roles[ooi_id] = frozenset(roles)
+        except (KeyError, TypeError, ValueError, AttributeError), ex:
+            raise RoleTableError('Invalid role table snapshot: %s' % str(ex))
+
+        self._user_roles = user_roles
+        self.version = version
+        self._deltas.clear()
+        for pending_version in [v for v in self._pending if v <= version]:
+            del self._pending[pending_version]
+        # Deltas received while waiting for the snapshot
+        self.apply_deltas([])
+
+def construct_role_table(userroledict):
     roles = userroledict['roles']
 
-    roledict = {}
+    role_subjects = {}
     for role_name in ('ADMIN', 'DATA_PROVIDER', 'MARINE_OPERATOR', 'EARLY_ADOPTER'):
-        roledict[role_name] = {'subject': set(roles[role_name]), 'ooi_id': set()}
+        role_subjects[role_name] = roles[role_name]
 
-    return roledict
+    return RoleTable(role_subjects, CONF.getValue('role_table_deltas', 10000))
 
 userroledb_filename = ioninit.adjust_dir(CONF.getValue('userroledb'))
-role_user_dict = construct_user_role_lists(Config(userroledb_filename).getObject())
-user_role_dict = {} # cache the current role for an ooi_id
+role_table = construct_role_table(Config(userroledb_filename).getObject())
 
 def subject_has_role(subject, role):
     if role == 'ANONYMOUS':
         return True
-    return subject in role_user_dict[role]['subject']
+    return role_table.subject_has_role(subject, role)
 
 # Role methods
 def user_has_role(ooi_id, role):
@@ -100,37 +241,23 @@ def user_has_role(ooi_id, role):
     elif role == 'AUTHENTICATED':
         return ooi_id != 'ANONYMOUS'
     else:
-        return ooi_id in role_user_dict[role]['ooi_id']
+        return role_table.has_role(ooi_id, role)
 
 def get_current_roles(ooi_id):
-    roles = user_role_dict.get(ooi_id, None)
-    if roles is None:       return ['AUTHENTICATED']
-
     # If more than one role, just grab one for now. There should be only one.
-    roles -= set(['ANONYMOUS', 'AUTHENTICATED'])
+    roles = role_table.get_roles(ooi_id) - frozenset(['ANONYMOUS', 'AUTHENTICATED'])
     if len(roles) == 0:     return ['AUTHENTICATED']
 
     return list(roles)
 
 def map_ooi_id_to_role(ooi_id, role):
-    if not role in role_user_dict:
-        role_user_dict[role] = {'subject': set(), 'ooi_id': set()}
-    role_user_dict[role]['ooi_id'].add(ooi_id)
-
-    if not ooi_id in user_role_dict:
-        user_role_dict[ooi_id] = set()
-    user_role_dict[ooi_id].add(role)
+    role_table.set_role(ooi_id, role)
 
 def unmap_ooi_id_from_role(ooi_id, role):
-    if role in role_user_dict:
-        if ooi_id in role_user_dict[role]['ooi_id']:
-            role_user_dict[role]['ooi_id'].remove(ooi_id)
-    if ooi_id in user_role_dict:
-        if role in user_role_dict[ooi_id]:
-            user_role_dict[ooi_id].remove(role)
+    role_table.unset_role(ooi_id, role)
 
 def map_ooi_id_to_subject_role(subject, ooi_id, role):
-    if subject in role_user_dict[role]['subject']:
+    if role_table.subject_has_role(subject, role):
         map_ooi_id_to_role(ooi_id, role)
 
 # Role convenience methods
@@ -176,6 +303,21 @@ def load_roles_from_associations(asc):
     for user_id, role_id in role_map.iteritems():
         map_ooi_id_to_role(user_id, ROLE_NAMES_BY_ID[role_id])
 
+def link_can_reach_resource(type_id, resources):
+    """
+    @brief Decide whether find_uuids_traverse_gpbs must load a child of the
+    given type. It must if the type is one of the resources or if the GPB
+    descriptor of the type allows it to link to further objects. The
+    descriptor check is computed once per type.
+    """
+    if type_id in resources:
+        return True
+    try:
+        return object_utils.type_has_links(type_id)
+    except object_utils.ObjectUtilException:
+        # Unknown type - search it to be safe
+        return True
+
 class PolicyInterceptor(EnvelopeInterceptor):
     def before(self, invocation):
         msg = invocation.content
@@ -314,31 +456,20 @@ class PolicyInterceptor(EnvelopeInterceptor):
 
     @defer.inlineCallbacks
     def check_owner(self, user_id, uuid_list, invocation):
-        self.mc = MessageClient(proc=invocation.process)
         self.asc = AssociationServiceClient(proc=invocation.process)
 
-        for uuid in uuid_list:        
-            request = yield self.mc.create_instance(ASSOCIATION_QUERY_MSG_TYPE)
-
-            request.object = request.CreateObject(IDREF_TYPE)
-            request.object.key = user_id
-
-            request.predicate = request.CreateObject(IDREF_TYPE)
-            request.predicate.key = OWNED_BY_ID
+        # One request for all the resources in the message
+        log.info('Calling association service for user id <%s> and %d uuids' % (user_id, len(uuid_list)))
+        owned_list = yield self.asc.association_exists_many(uuid_list, OWNED_BY_ID, user_id)
+        log.info('Return from association service call for user id <%s>' % user_id)
 
-            request.subject = request.CreateObject(IDREF_TYPE)
-            request.subject.key = uuid
-
-            # make the request
-            log.warn('Calling association service for user id <%s> and uuid <%s>' % (user_id, uuid))
-            result = yield self.asc.association_exists(request)
-            log.warn('Return from association service call for user id <%s> and uuid <%s>' % (user_id, uuid))
-            if result.result == False:
+        for uuid, owned in zip(uuid_list, owned_list):
+            if not owned:
                 log.warn('Policy Interceptor: Authentication failed. User <%s> does not own resource <%s>.' % (user_id, uuid))
                 invocation.drop(note='Not authorized', code=Invocation.CODE_UNAUTHORIZED)
                 return
             else:
-                log.warn('Policy Interceptor: User <%s> owns resource <%s>.' % (user_id, uuid))
+                log.info('Policy Interceptor: User <%s> owns resource <%s>.' % (user_id, uuid))
 
     def find_uuids(self, invocation, msg, user_id, resources):
         """
@@ -355,6 +486,8 @@ class PolicyInterceptor(EnvelopeInterceptor):
             wrapper = content.Message
             repo = content.Repository
             uuid_list = self.find_uuids_traverse_gpbs(invocation, msg, wrapper, repo, user_id, resources)
+            if invocation.status != Invocation.STATUS_PROCESS:
+                return
             if len(uuid_list) == 0:
                 log.error("Policy Interceptor: Rejecting improperly defined message.  No uuids found.")
                 invocation.drop(note='Error: Expected uuids missing from message payload!', code=Invocation.CODE_BAD_REQUEST)
@@ -364,22 +497,27 @@ class PolicyInterceptor(EnvelopeInterceptor):
             log.error("Policy Interceptor: Rejecting improperly defined message missing MessageInstance [%s]." % str(msg))
             invocation.drop(note='Error: MessageInstance missing from message payload!', code=Invocation.CODE_BAD_REQUEST)
 
-    def find_uuids_traverse_gpbs(self, invocation, msg, wrapper, repo, user_id, resources, uuid_list = None):
+    def find_uuids_traverse_gpbs(self, invocation, msg, wrapper, repo, user_id, resources, uuid_list = None, visited = None):
         log.info('Policy Interceptor: In check_resource_ownership_traverse_gpbs')
 
         if uuid_list is None:
             uuid_list = []
+        if visited is None:
+            visited = set()
 
-        childLinksSet = wrapper.ChildLinks
-        
-        if len(childLinksSet) == 0:
-            log.info('Policy Interceptor: Returning from check_resource_ownership_traverse_gpbs.  ChildLinksSet zero length.')
-            return
-            
         for link in wrapper.ChildLinks:
+            # The link carries the type of the child, so children which can
+            # not be or lead to a resource are not loaded at all
+            typeId = link.type.object_id
+            if not link_can_reach_resource(typeId, resources):
+                continue
+
+            # Objects shared by several parents are only searched once
+            if link.key in visited:
+                continue
+            visited.add(link.key)
+
             obj = repo.get_linked_object(link)
-            type = obj.ObjectType
-            typeId = type.object_id
             log.info('Policy Interceptor: In check_resource_ownership_traverse_gpbs.  Child type: <%s>' % str(typeId))
             if typeId in resources:
                 log.info('Policy Interceptor: In check_resource_ownership_traverse_gpbs.  Child type match found in resources')
@@ -407,7 +545,6 @@ class PolicyInterceptor(EnvelopeInterceptor):
                 log.info('Policy Interceptor: In check_resource_ownership_traverse_gpbs.  Added UUID: %s to return list' % uuid)
 
             log.info('Policy Interceptor: Recursing.')
-            self.find_uuids_traverse_gpbs(invocation, msg, obj, repo, user_id, resources, uuid_list)
+            if self.find_uuids_traverse_gpbs(invocation, msg, obj, repo, user_id, resources, uuid_list, visited) is None:
+                return
         return uuid_list
-                
-
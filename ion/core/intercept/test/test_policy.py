@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+
+"""
+@file ion/core/intercept/test/test_policy.py
+@brief Test cases for the resource id search and the role table of the policy interceptor
+"""
+
+import random
+import time
+
+import ion.util.ionlog
+log = ion.util.ionlog.getLogger(__name__)
+
+from twisted.trial import unittest
+
+from ion.core.intercept import policy
+from ion.core.intercept.policy import PolicyInterceptor, RoleTable, RoleTableError
+from ion.core.object import workbench, object_utils
+from ion.core.process.cprocess import Invocation
+
+RESOURCE_CFG_REQUEST_TYPE = object_utils.create_type_identifier(object_id=10, version=1)
+PROTECTED_RESOURCE_DELETE_REQ_TYPE = object_utils.create_type_identifier(object_id=20044, version=1)
+CDM_DATASET_TYPE = object_utils.create_type_identifier(object_id=10001, version=1)
+CDM_ARRAY_STRUC_TYPE = object_utils.create_type_identifier(object_id=10025, version=1)
+CDM_BOUNDED_ARRAY_TYPE = object_utils.create_type_identifier(object_id=10021, version=1)
+CDM_F64_ARRAY_TYPE = object_utils.create_type_identifier(object_id=10014, version=1)
+
+RESOURCES = {20044: 'resource_ids'}
+
+
+class FindUuidsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.wb = workbench.WorkBench('No Process Test')
+        self.pi = PolicyInterceptor('policy')
+
+    def _count_loads(self, repo):
+        loads = []
+        get_linked_object = repo.get_linked_object
+        def counting_get_linked_object(link):
+            loads.append(link.type.object_id)
+            return get_linked_object(link)
+        self.patch(repo, 'get_linked_object', counting_get_linked_object)
+        return loads
+
+    def _find_uuids(self, request):
+        invocation = Invocation()
+        uuid_list = self.pi.find_uuids_traverse_gpbs(invocation, {}, request, request.Repository, 'ANONYMOUS', RESOURCES)
+        return invocation, uuid_list
+
+    def _make_dataset_request(self, nvariables, nbounded_arrays):
+        repo = self.wb.create_repository(RESOURCE_CFG_REQUEST_TYPE)
+        request = repo.root_object
+        request.configuration = repo.create_object(CDM_DATASET_TYPE)
+
+        ds = request.configuration
+        ds.MakeRootGroup()
+        root = ds.root_group
+        dim = root.AddDimension('time', nbounded_arrays * 10)
+        root.AddAttribute('title', root.DataType.STRING, ['large dataset'])
+
+        for i in xrange(nvariables):
+            var = root.AddVariable('var_%d' % i, root.DataType.DOUBLE, [dim])
+            var.AddAttribute('units', root.DataType.STRING, ['m'])
+
+            content = repo.create_object(CDM_ARRAY_STRUC_TYPE)
+            for j in xrange(nbounded_arrays):
+                ba = repo.create_object(CDM_BOUNDED_ARRAY_TYPE)
+                ba.bounds.add()
+                ba.bounds[0].origin = j * 10
+                ba.bounds[0].size = 10
+                arr = repo.create_object(CDM_F64_ARRAY_TYPE)
+                arr.value.extend([float(val) for val in xrange(j * 10, (j + 1) * 10)])
+                ba.ndarray = arr
+                ref = content.bounded_arrays.add()
+                ref.SetLink(ba)
+            var.content = content
+
+        return request
+
+    def test_type_has_links(self):
+        self.assertTrue(object_utils.type_has_links(CDM_DATASET_TYPE.object_id))
+        self.assertTrue(object_utils.type_has_links(CDM_BOUNDED_ARRAY_TYPE.object_id))
+        self.assertFalse(object_utils.type_has_links(CDM_F64_ARRAY_TYPE.object_id))
+
+    def test_find_resource_ids(self):
+        repo = self.wb.create_repository(RESOURCE_CFG_REQUEST_TYPE)
+        request = repo.root_object
+        request.configuration = repo.create_object(PROTECTED_RESOURCE_DELETE_REQ_TYPE)
+        request.configuration.resource_ids.append('resource_1')
+        request.configuration.resource_ids.append('resource_2')
+
+        invocation, uuid_list = self._find_uuids(request)
+        self.assertEqual(invocation.status, Invocation.STATUS_PROCESS)
+        self.assertEqual(uuid_list, ['resource_1', 'resource_2'])
+
+    def test_missing_resource_id(self):
+        repo = self.wb.create_repository(RESOURCE_CFG_REQUEST_TYPE)
+        request = repo.root_object
+        request.configuration = repo.create_object(PROTECTED_RESOURCE_DELETE_REQ_TYPE)
+
+        invocation, uuid_list = self._find_uuids(request)
+        self.assertEqual(invocation.status, Invocation.STATUS_DROP)
+        self.assertEqual(invocation.code, Invocation.CODE_BAD_REQUEST)
+
+    def test_large_dataset(self):
+        request = self._make_dataset_request(20, 50)
+        loads = self._count_loads(request.Repository)
+
+        t0 = time.time()
+        invocation, uuid_list = self._find_uuids(request)
+        planned_time = time.time() - t0
+        self.assertEqual(invocation.status, Invocation.STATUS_PROCESS)
+        self.assertEqual(uuid_list, [])
+
+        # The arrays can not lead to a resource and are never loaded
+        self.assertFalse(CDM_F64_ARRAY_TYPE.object_id in loads)
+        planned_loads = len(loads)
+
+        # Compare with following every link
+        del loads[:]
+        self.patch(policy, 'link_can_reach_resource', lambda type_id, resources: True)
+        t0 = time.time()
+        invocation, uuid_list = self._find_uuids(request)
+        full_time = time.time() - t0
+        self.assertEqual(uuid_list, [])
+        self.assertTrue(CDM_F64_ARRAY_TYPE.object_id in loads)
+
+        log.info('Policy check of a dataset with %d bounded arrays: %d loads in %f s, every link %d loads in %f s',
+                 20 * 50, planned_loads, planned_time, len(loads), full_time)
+        self.assertTrue(planned_loads < len(loads))
+
+
+class RoleTableTest(unittest.TestCase):
+
+    ROLES = ('ADMIN', 'DATA_PROVIDER', 'MARINE_OPERATOR', 'EARLY_ADOPTER')
+
+    def _fill(self, table, nusers):
+        deltas = []
+        for i in xrange(nusers):
+            deltas.append(table.set_role('user_%d' % i, self.ROLES[i % 4]))
+            if i % 3 == 0:
+                deltas.append(table.set_role('user_%d' % i, 'EARLY_ADOPTER'))
+        # Every tenth user loses its first role again
+        for i in xrange(0, nusers, 10):
+            deltas.append(table.unset_role('user_%d' % i, self.ROLES[i % 4]))
+        return [delta for delta in deltas if delta is not None]
+
+    def test_set_and_unset(self):
+        table = RoleTable({'ADMIN': ['/CN=admin']})
+        self.assertEqual(table.version, 0)
+        self.assertTrue(table.subject_has_role('/CN=admin', 'ADMIN'))
+
+        self.assertEqual(table.set_role('user', 'ADMIN'), (1, RoleTable.SET_ROLE, 'user', 'ADMIN'))
+        self.assertEqual(table.set_role('user', 'ADMIN'), None)
+        self.assertEqual(table.version, 1)
+
+        roles = table.get_roles('user')
+        table.set_role('user', 'EARLY_ADOPTER')
+        self.assertEqual(roles, frozenset(['ADMIN']))
+        self.assertEqual(table.get_roles('user'), frozenset(['ADMIN', 'EARLY_ADOPTER']))
+
+        self.assertEqual(table.unset_role('user', 'DATA_PROVIDER'), None)
+        self.assertEqual(table.unset_role('user', 'ADMIN'), (3, RoleTable.UNSET_ROLE, 'user', 'ADMIN'))
+        self.assertEqual(table.deltas_since(1), [(2, RoleTable.SET_ROLE, 'user', 'EARLY_ADOPTER'),
+                                                 (3, RoleTable.UNSET_ROLE, 'user', 'ADMIN')])
+        self.assertEqual(table.deltas_since(3), [])
+
+    def test_current_roles(self):
+        self.patch(policy, 'role_table', RoleTable())
+        self.assertEqual(policy.get_current_roles('user'), ['AUTHENTICATED'])
+
+        policy.map_ooi_id_to_role('user', 'AUTHENTICATED')
+        policy.map_ooi_id_to_role('user', 'ADMIN')
+        self.assertEqual(policy.get_current_roles('user'), ['ADMIN'])
+        # Reading the current roles does not change them
+        self.assertEqual(policy.role_table.get_roles('user'), frozenset(['AUTHENTICATED', 'ADMIN']))
+        self.assertTrue(policy.user_has_admin_role('user'))
+
+        policy.unmap_ooi_id_from_role('user', 'ADMIN')
+        self.assertFalse(policy.user_has_admin_role('user'))
+        self.assertEqual(policy.get_current_roles('user'), ['AUTHENTICATED'])
+
+    def test_snapshot_restore(self):
+        table = RoleTable()
+        self._fill(table, 100000)
+
+        t0 = time.time()
+        snapshot = table.snapshot()
+        replica = RoleTable()
+        replica.restore(snapshot)
+        log.info('Snapshot and restore of 100000 users: %f s', time.time() - t0)
+
+        self.assertEqual(replica.version, table.version)
+        self.assertEqual(replica.snapshot(), snapshot)
+        self.assertEqual(replica.get_roles('user_1'), frozenset(['DATA_PROVIDER']))
+        self.assertEqual(replica.get_roles('user_10'), frozenset())
+        self.assertEqual(replica.get_roles('user_9'), frozenset(['DATA_PROVIDER', 'EARLY_ADOPTER']))
+
+        self.assertRaises(RoleTableError, replica.restore, {'users': {}})
+
+    def test_delta_replay(self):
+        table = RoleTable()
+        deltas = self._fill(table, 100000)
+        self.assertEqual(len(deltas), table.version)
+
+        # Deltas arriving out of order, some of them twice, are applied in version order
+        chunks = [deltas[i:i + 1000] for i in xrange(0, len(deltas), 1000)]
+        random.seed(1)
+        random.shuffle(chunks)
+        chunks.append(chunks[0])
+
+        t0 = time.time()
+        replica = RoleTable()
+        for chunk in chunks:
+            replica.apply_deltas(chunk)
+        log.info('Replay of %d deltas for 100000 users: %f s', len(deltas), time.time() - t0)
+
+        self.assertEqual(replica.version, table.version)
+        self.assertEqual(replica.snapshot(), table.snapshot())
+
+    def test_catch_up(self):
+        table = RoleTable(max_deltas=100)
+        self._fill(table, 1000)
+
+        replica = RoleTable()
+        replica.restore(table.snapshot())
+        version = table.version
+
+        table.set_role('new_user', 'ADMIN')
+        table.unset_role('user_1', 'DATA_PROVIDER')
+        self.assertEqual(replica.apply_deltas(table.deltas_since(version)), 2)
+        self.assertEqual(replica.snapshot(), table.snapshot())
+
+        # Older changes are gone, a snapshot is needed
+        self.assertEqual(table.deltas_since(version - 100), None)
+
+        # Deltas which arrived before the snapshot are kept when they are newer
+        early = RoleTable()
+        early.apply_deltas(table.deltas_since(version + 1))
+        self.assertEqual(early.version, 0)
+        early.restore(dict(table.snapshot(), version=version + 1,
+                           users=dict(table.snapshot()['users'], new_user=['ADMIN'], user_1=['DATA_PROVIDER'])))
+        self.assertEqual(early.version, table.version)
+        self.assertEqual(early.snapshot(), table.snapshot())
@@ -126,6 +126,10 @@ def install_msgpacker():
 
 install_msgpacker()
 
+# Incremented whenever logging levels change. Loggers obtained through
+# ion.util.ionlog cache their level checks against this version.
+log_levels_version = 0
+
 def set_log_levels(levelfilekey=None):
     """
     Sets logging levels of per module loggers to given values. Loggers of
@@ -134,6 +138,7 @@ def set_log_levels(levelfilekey=None):
     log levels. Otherwise, read the file indicated by filename and if it exists,
     set the log levels as given.
     """
+    global log_levels_version
     if levelfilekey == None:
         set_log_levels('loglevels')
         set_log_levels('loglevelslocal')
@@ -154,6 +159,7 @@ def set_log_levels(levelfilekey=None):
         assert type(levellist) is list
         for level in levellist:
             logging.getLogger(level[0]).setLevel(level[1])
+        log_levels_version += 1
 
 set_log_levels()
 
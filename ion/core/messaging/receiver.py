@@ -131,7 +131,7 @@ class Receiver(BasicLifecycleObject):
             raise RuntimeError("Messaging name undefined: "+self.xname)
 
         yield self._init_receiver(name_config)
-        log.debug("Receiver %s initialized (queue attached) cfg=%s" % (self.xname,name_config))
+        log.debug("Receiver %s initialized (queue attached) cfg=%s", self.xname, name_config)
 
     @defer.inlineCallbacks
     def _init_receiver(self, receiver_config, store_config=False):
@@ -155,7 +155,7 @@ class Receiver(BasicLifecycleObject):
         """
         #self.consumer.register_callback(self.receive)
         yield self.consumer.consume(self.receive)
-        log.debug("Receiver %s activated (consumer enabled)" % self.xname)
+        log.debug("Receiver %s activated (consumer enabled)", self.xname)
 
     #@defer.inlineCallbacks
     def on_deactivate(self, *args, **kwargs):
@@ -176,7 +176,7 @@ class Receiver(BasicLifecycleObject):
 
     def on_error(self, cause= None, *args, **kwargs):
         if cause:
-            log.error("Receiver error: %s" % cause)
+            log.error("Receiver error: %s", cause)
             pass
         else:
             raise RuntimeError("Illegal state change")
@@ -209,12 +209,12 @@ class Receiver(BasicLifecycleObject):
         @note is called from carrot as normal method; no return expected
         @param msg instance of carrot.backends.txamqp.Message
         """
-        log.info('Start Receiver.Receive on proc: %s' % str(self.process))
+        log.info('Start Receiver.Receive on proc: %s', self.process)
 
 
         if self.rec_shutoff:
             log.warn("MESSAGE RECEIVED AFTER SHUTOFF - DROPPED")
-            log.warn("Dropped message: "+str(msg.payload))
+            log.warn("Dropped message: %s", msg.payload)
             # @todo ACK for now. Should be requeue.
             yield msg.ack()
             defer.returnValue()
@@ -239,7 +239,7 @@ class Receiver(BasicLifecycleObject):
 
             # Interceptor failed message.  Call error handler(s)
             if inv1.status != Invocation.STATUS_PROCESS:
-                log.info("Message error! to=%s op=%s" % (data.get('receiver',None), data.get('op',None)))
+                log.info("Message error! to=%s op=%s", data.get('receiver',None), data.get('op',None))
                 try:
                     for error_handler in self.error_handlers:
                         yield defer.maybeDeferred(error_handler, data, msg, inv1.code)
@@ -259,7 +259,7 @@ class Receiver(BasicLifecycleObject):
                     workbench = self.process.workbench
                     process = self.process
 
-                    log.info('Process "%s" Receiver Message Headers: OP - %s, Sender - %s, Convid - %s, Performative - %s, Protocol - %s' % (process.proc_name, op, sender, convid, performative, protocol))
+                    log.info('Process "%s" Receiver Message Headers: OP - %s, Sender - %s, Convid - %s, Performative - %s, Protocol - %s', process.proc_name, op, sender, convid, performative, protocol)
 
 
                     if protocol != 'rpc':
@@ -268,19 +268,19 @@ class Receiver(BasicLifecycleObject):
                         Receiver.non_rpc_index += 1
                         convid = 'Non RPC request ID %d' % self.non_rpc_index
 
-                        log.info('Setting NON RPC request workbench_context: %s, in Proc: %s ' % (convid, self.process))
+                        log.info('Setting NON RPC request workbench_context: %s, in Proc: %s ', convid, self.process)
 
                         process.context = process.conversation_context.create_context(convid)
 
                     elif performative == 'request':
                         # if it is an rpc request - set the context
-                        log.info('Setting RPC request workbench_context: %s, in Proc: %s ' % (convid, self.process))
+                        log.info('Setting RPC request workbench_context: %s, in Proc: %s ', convid, self.process)
 
                         process.context = process.conversation_context.create_context(convid)
 
                     else:
                         #log.warn('Message headers: \n%s' % pu.pprint_to_string(data))
-                        log.info('Dont set context if it is not a request: %s, in Proc: %s ' % (convid, self.process))
+                        log.info('Dont set context if it is not a request: %s, in Proc: %s ', convid, self.process)
 
                         try:
                             process.context = process.conversation_context.get_context(convid)
@@ -289,11 +289,11 @@ class Receiver(BasicLifecycleObject):
                             if self.name not in data['receiver']:
                                 log.info('Recieved an RPC message for which I have no conversation - I am eavesdropping on another conversation!')
                             else:
-                                log.exception("Invalid convid which has no context: \nMessage Content - %s\nConversation Context - %s " % (str(data.items()), str(process.conversation_context)))
+                                log.exception("Invalid convid which has no context: \nMessage Content - %s\nConversation Context - %s ", data.items(), process.conversation_context)
                                 raise ReceiverError('Could not set Conversation Context!')
 
 
-                    log.info('Receiver Context: %s' % str(self.process.context))
+                    log.info('Receiver Context: %s', self.process.context)
 
                 else:
                     workbench = None
@@ -310,7 +310,7 @@ class Receiver(BasicLifecycleObject):
                     content = data.get('content')
                     workbench.put_repository(content.Repository)
 
-                    log.debug("WORKBENCH STATE after incoming message is added:\n%s" % str(workbench))
+                    log.debug("WORKBENCH STATE after incoming message is added:\n%s", workbench)
 
 
                 # Make the calls into the application code (e.g. process receive)
@@ -332,9 +332,9 @@ class Receiver(BasicLifecycleObject):
 
                     if workbench is not None:
 
-                        log.info('After Message Handler: Process "%s" Receiver Message Headers: OP - %s, Convid - %s, Performative - %s, Protocol - %s' % (process.proc_name, op, convid, performative, protocol))
+                        log.info('After Message Handler: Process "%s" Receiver Message Headers: OP - %s, Convid - %s, Performative - %s, Protocol - %s', process.proc_name, op, convid, performative, protocol)
 
-                        log.info('Receiver Context: %s' % str(process.context))
+                        log.info('Receiver Context: %s', process.context)
 
                         # Try to remove the conversation from the conversation dictionary - no matter what we are done with this convid...
                         try:
@@ -349,7 +349,7 @@ class Receiver(BasicLifecycleObject):
                         # Cleanup the workbench after an op...
                         if protocol != 'rpc':
                             # if it is not an rpc conversation - clean up the context
-                            log.info('Clearing Non RPC request workbench_context: %s, in Proc: %s ' % (convid, process))
+                            log.info('Clearing Non RPC request workbench_context: %s, in Proc: %s ', convid, process)
 
                             # Clear anything created in this context
                             workbench.manage_workbench_cache(convid)
@@ -372,14 +372,14 @@ class Receiver(BasicLifecycleObject):
                             count = workbench.count_persistent()
                             if count > 0:
                                     # Print a warning if someone else is using the persistence tricks...
-                                log.info('The "%s" process is holding persistent state in %d repository objects!' % (process.proc_name, count))
+                                log.info('The "%s" process is holding persistent state in %d repository objects!', process.proc_name, count)
 
 
 
                         elif performative == 'request':
                             # if it is the end of an rpc request - clean up the context
 
-                            log.info('Clearing RPC request workbench_context: %s, in Proc: %s ' % (convid, process))
+                            log.info('Clearing RPC request workbench_context: %s, in Proc: %s ', convid, process)
 
                             # Clear anything created in this context
                             workbench.manage_workbench_cache(convid)
@@ -400,18 +400,18 @@ class Receiver(BasicLifecycleObject):
                             count = workbench.count_persistent()
                             if count > 0:
                                     # Print a warning if someone else is using the persistence tricks...
-                                log.info('The "%s" process is holding persistent state in %d repository objects!' % (process.proc_name, count))
+                                log.info('The "%s" process is holding persistent state in %d repository objects!', process.proc_name, count)
 
 
 
                         else:
-                            log.info('No context to clear in Proc: %s ' % (process))
+                            log.info('No context to clear in Proc: %s ', process)
 
 
                         log.info(workbench.cache_info())
 
 
-        log.info( 'End Receiver.Receive on proc: %s' % str(self.process))
+        log.info('End Receiver.Receive on proc: %s', self.process)
         defer.returnValue(None)
 
     @defer.inlineCallbacks
@@ -440,7 +440,7 @@ class Receiver(BasicLifecycleObject):
             # TODO fix this
             # For now, silently dropping message
             if inv1.status == Invocation.STATUS_DROP:
-                log.info("Message dropped! to=%s op=%s" % (msg.get('receiver',None), msg.get('op',None)))
+                log.info("Message dropped! to=%s op=%s", msg.get('receiver',None), msg.get('op',None))
             else:
 
                 if hasattr(self.process, 'context') and msg.get('protocol') == 'rpc' and msg.get('performative') == 'request':
@@ -452,9 +452,9 @@ class Receiver(BasicLifecycleObject):
             log.exception("Send error")
         else:
             if inv1.status != Invocation.STATUS_DROP:
-                log.info("===Message SENT! >>>> %s -> %s: %s:%s:%s===" % (msg.get('sender',None),
+                log.info("===Message SENT! >>>> %s -> %s: %s:%s:%s===", msg.get('sender',None),
                                 msg.get('receiver',None), msg.get('protocol',None),
-                                msg.get('performative',None), msg.get('op',None)))
+                                msg.get('performative',None), msg.get('op',None))
                 defer.returnValue(msg)
                 #log.debug("msg"+str(msg))
 
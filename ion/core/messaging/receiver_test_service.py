@@ -42,7 +42,7 @@ class ReceiverService(ServiceProcess):
         log.info('Starting Op A')
 
         context = self.context.get('progenitor_convid', 'None Set!')
-        log.info('Got Context: "%s"' % context)
+        log.info('Got Context: "%s"', context)
         self.action.callback(context)
 
         log.info('Replying OK')
@@ -60,7 +60,7 @@ class ReceiverService(ServiceProcess):
         log.info('Starting Op B')
 
         context = self.context.get('progenitor_convid', 'None Set!')
-        log.info('Got Context: "%s"' % context)
+        log.info('Got Context: "%s"', context)
         self.action.callback(context)
 
         log.info('Replying OK')
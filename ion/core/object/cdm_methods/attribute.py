@@ -93,5 +93,5 @@ def uni(text):
 
     except Exception, uee:
 
-        log.warn('Sanitizing attribute character encoding failed!!!!\n%s' % str(uee))
+        log.warn('Sanitizing attribute character encoding failed!!!!\n%s', uee)
         return '*** Unknown character encoding in attribute string ***'
\ No newline at end of file
@@ -194,13 +194,13 @@ def _get_attribs(src, dst, attname):
         try:
             src_att = src.FindAttributeByName(attname)
         except OOIObjectError, ex:
-            log.warn("Error finding attribute by name.  Cause: %s" % str(ex))
+            log.warn("Error finding attribute by name.  Cause: %s", ex)
 
     if dst.HasAttribute(attname):
         try:
             dst_att = dst.FindAttributeByName(attname)
         except OOIObjectError, ex:
-            log.warn("Error finding attribute by name.  Cause: %s" % str(ex))
+            log.warn("Error finding attribute by name.  Cause: %s", ex)
     
     return (src_att, dst_att)
 
@@ -216,15 +216,11 @@ def _find_group_by_name(self, name=''):
     if not name:
         raise ValueError('Invalid argument "name" -- Please specify a non-empty string')
 
-    result = None
-    for group in self.groups:
-        if group.name == name:
-            result = group
-            break
-    if None == result:
+    idx = self.groups.IndexByName(name)
+    if -1 == idx:
         raise OOIObjectError('Requested group name not found: "%s"' % str(name))
 
-    return result
+    return self.groups[idx]
 
 
 @_gpb_source
@@ -238,15 +234,11 @@ def _find_attribute_by_name(self, name):
     if not name:
         raise ValueError('Invalid argument "name" -- Please specify a non-empty string')
 
-    result = None
-    for att in self.attributes:
-        if att.name == name:
-            result = att
-            break
-    if None == result:
+    idx = self.attributes.IndexByName(name)
+    if -1 == idx:
         raise OOIObjectError('Requested attribute name not found: "%s"' % str(name))
 
-    return result
+    return self.attributes[idx]
 
 
 @_gpb_source
@@ -259,23 +251,16 @@ def _find_dimension_by_name(self, name):
     if not name:
         raise ValueError('Invalid argument "name" -- Please specify a non-empty string')
 
-    result = None
-
     if self.ObjectType == CDM_VARIABLE_TYPE:
-        for dim in self.shape:
-            if dim.name == name:
-                result = dim
-                break
+        dims = self.shape
     else:
-        for dim in self.dimensions:
-            if dim.name == name:
-                result = dim
-                break
+        dims = self.dimensions
 
-    if None == result:
+    idx = dims.IndexByName(name)
+    if -1 == idx:
         raise OOIObjectError('Requested dimension name not found: "%s"' % str(name))
 
-    return result
+    return dims[idx]
 
 
 @_gpb_source
@@ -288,15 +273,11 @@ def _find_variable_by_name(self, name):
     if not name:
         raise ValueError('Invalid argument "name" -- Please specify a non-empty string')
 
-    result = None
-    for var in self.variables:
-        if var.name == name:
-            result = var
-            break
-    if None == result:
+    idx = self.variables.IndexByName(name)
+    if -1 == idx:
         raise OOIObjectError('Requested variable name not found: "%s"' % str(name))
 
-    return result
+    return self.variables[idx]
 
 
 @_gpb_source
@@ -309,13 +290,7 @@ def _find_variable_index_by_name(self, name):
     if not name:
         raise ValueError('Invalid argument "name" -- Please specify a non-empty string')
 
-    result = -1
-    for i in xrange(0, len(self.variables)):
-        var = self.variables[i]
-        if var is not None and var.name == name:
-            result = i
-            break
-
+    result = self.variables.IndexByName(name)
     if -1 == result:
         raise OOIObjectError('Requested variable not found: "%s"' % str(name))
 
@@ -332,13 +307,7 @@ def _find_attribute_index_by_name(self, name):
     if not name:
         raise ValueError('Invalid argument "name" -- Please specify a non-empty string')
 
-    result = -1
-    for i in xrange(0, len(self.attributes)):
-        atrib = self.attributes[i]
-        if atrib is not None and atrib.name == name:
-            result = i
-            break
-
+    result = self.attributes.IndexByName(name)
     if -1 == result:
         raise OOIObjectError('Requested attribute not found: "%s"' % str(name))
 
@@ -355,13 +324,7 @@ def _cdm_resource_has_attribute(self, name):
     if not name:
         raise ValueError('Invalid argument "name" -- Please specify a non-empty string')
 
-    result = False
-    for att in self.attributes:
-        if att.name == name:
-            result = True
-            break
-
-    return result
+    return -1 != self.attributes.IndexByName(name)
 
 
 @_gpb_source
@@ -399,7 +362,7 @@ def _set_attribute(self, name, values, data_type=None):
     data_type = data_type or atr.data_type
     try:
         _add_attribute(self, name, int(data_type), values)
-        log.warn('Old references to the attribute "%s" are now detached and will not point to the new attribute value' % name)
+        log.warn('Old references to the attribute "%s" are now detached and will not point to the new attribute value', name)
     except Exception, ex:
         log.warn('WARNING! Exception may have left this resource in an invalid state')
         atr_link = self.attributes.add()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+"""
+@file ion/core/object/cdm_methods/test/test_group.py
+@brief test for the name lookups of CDM group and variable objects
+"""
+
+import time
+
+import ion.util.ionlog
+log = ion.util.ionlog.getLogger(__name__)
+
+from twisted.trial import unittest
+
+from ion.core.object import workbench
+from ion.core.object.gpb_wrapper import ContainerWrapper
+from ion.core.object.object_utils import OOIObjectError, CDM_GROUP_TYPE
+
+
+class CdmGroupNameIndexTest(unittest.TestCase):
+
+    def _make_group(self, nattributes):
+        wb = workbench.WorkBench('No Process Test')
+        repo = wb.create_repository(CDM_GROUP_TYPE)
+        group = repo.root_object
+        group.name = 'root'
+        for i in xrange(nattributes):
+            group.AddAttribute('att_%d' % i, group.DataType.STRING, ['value %d' % i])
+        return group
+
+    def _lookup_cost(self, group, name, count=1000):
+        """
+        Returns the items read from the containers per lookup, and the time
+        of count lookups after the first one which builds the index.
+        """
+        group.FindAttributeByName(name)
+
+        reads = []
+        getitem = ContainerWrapper.__getitem__
+        def counting_getitem(container, key):
+            reads.append(key)
+            return getitem(container, key)
+        self.patch(ContainerWrapper, '__getitem__', counting_getitem)
+
+        t0 = time.time()
+        for i in xrange(count):
+            group.FindAttributeByName(name)
+        elapsed = time.time() - t0
+        self.patch(ContainerWrapper, '__getitem__', getitem)
+
+        return len(reads) / float(count), elapsed
+
+    def test_lookup_does_not_scale(self):
+        small = self._make_group(20)
+        large = self._make_group(2000)
+
+        small_reads, small_time = self._lookup_cost(small, 'att_19')
+        large_reads, large_time = self._lookup_cost(large, 'att_1999')
+        log.info('1000 lookups: 20 attributes %f s, 2000 attributes %f s', small_time, large_time)
+
+        # A linear scan would read every attribute up to the one found
+        self.assertEqual(large_reads, small_reads)
+        self.assertTrue(large_reads <= 2, large_reads)
+
+    def test_add_attribute(self):
+        group = self._make_group(3)
+        self.assertEqual(group.FindAttributeIndexByName('att_2'), 2)
+        self.assertFalse(group.HasAttribute('new_att'))
+
+        group.AddAttribute('new_att', group.DataType.STRING, ['new'])
+        self.assertTrue(group.HasAttribute('new_att'))
+        self.assertEqual(group.FindAttributeIndexByName('new_att'), 3)
+        self.assertEqual(group.FindAttributeByName('new_att').GetValue(), 'new')
+
+    def test_remove_attribute(self):
+        group = self._make_group(4)
+        self.assertEqual(group.FindAttributeIndexByName('att_3'), 3)
+
+        group.RemoveAttribute('att_1')
+        self.assertFalse(group.HasAttribute('att_1'))
+        self.assertRaises(OOIObjectError, group.FindAttributeByName, 'att_1')
+        self.assertEqual(group.FindAttributeIndexByName('att_2'), 1)
+        self.assertEqual(group.FindAttributeIndexByName('att_3'), 2)
+        self.assertEqual(group.FindAttributeByName('att_3').GetValue(), 'value 3')
+
+    def test_set_attribute(self):
+        group = self._make_group(3)
+        group.SetAttribute('att_0', ['changed'])
+        self.assertEqual(group.FindAttributeByName('att_0').GetValue(), 'changed')
+        self.assertEqual(group.FindAttributeIndexByName('att_1'), 0)
+        self.assertEqual(group.FindAttributeIndexByName('att_0'), 2)
+
+    def test_renamed_attribute(self):
+        group = self._make_group(3)
+        att = group.FindAttributeByName('att_1')
+        att.name = 'renamed'
+        self.assertFalse(group.HasAttribute('att_1'))
+        self.assertEqual(group.FindAttributeIndexByName('renamed'), 1)
+
+    def test_variables_and_dimensions(self):
+        group = self._make_group(0)
+        dim = group.AddDimension('time', 10)
+        var = group.AddVariable('temp', group.DataType.FLOAT, [dim])
+        group.AddVariable('salt', group.DataType.FLOAT, [dim])
+
+        self.assertEqual(group.FindDimensionByName('time').length, 10)
+        self.assertEqual(group.FindVariableByName('temp').name, 'temp')
+        self.assertEqual(group.FindVariableIndexByName('salt'), 1)
+        self.assertEqual(var.FindDimensionByName('time').length, 10)
+        self.assertRaises(OOIObjectError, group.FindVariableByName, 'depth')
+
+        var.AddAttribute('units', group.DataType.STRING, ['degC'])
+        self.assertEqual(var.FindAttributeByName('units').GetValue(), 'degC')
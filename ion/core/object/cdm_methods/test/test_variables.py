@@ -253,6 +253,51 @@ class CdmVariableTest(IonTestCase):
                             count += 1
     
 
+    @defer.inlineCallbacks
+    def test_GetValues_3D_multiple_BA(self):
+        num_dims = 3
+        num_arrs = 5
+        num_vals = 4
+        yield self.setup_nD_multiple_BA(num_dims, num_arrs, num_vals)
+
+        indices = []
+        for i in range(num_arrs):
+            for j in range(num_vals):
+                for k in range(num_vals):
+                    indices.append((i, j, k))
+
+        # Reverse the order to mix the bounded arrays
+        indices.reverse()
+        expected = [float((i * num_vals + j) * num_vals + k) for (i, j, k) in indices]
+        self.assertEquals(self.var.GetValues(indices), expected)
+
+        # Out of range indices have no value
+        self.assertEquals(self.var.GetValues([(num_arrs, 0, 0), (0, 0, 0), (-1, 0, 0)]), [None, 0.0, None])
+
+    @defer.inlineCallbacks
+    def test_GetValue_changed_bounded_arrays(self):
+        yield self.setup_1D_multiple_BA()
+        self.assertEquals(self.var.GetValue(89), 89)
+        self.assertEquals(self.var.GetValue(90), None)
+
+        # Adding a bounded array drops the index
+        ba4 = yield self.var.Repository.create_object(CDM_BOUNDED_ARRAY_TYPE)
+        arr4 = yield ba4.Repository.create_object(CDM_F64_ARRAY_TYPE)
+        ba4.bounds.add()
+        ba4.bounds[0].origin = 90
+        ba4.bounds[0].size = 10
+        arr4.value.extend([float(val) for val in range(90, 100)])
+        ba4.ndarray = arr4
+        self.var.content.bounded_arrays.add().SetLink(ba4)
+
+        self.assertEquals(self.var.GetValue(95), 95)
+        self.assertEquals(self.var.GetValue(15), 15)
+
+        # Bounds changed in place are found as well
+        self.var.content.bounded_arrays[3].bounds[0].origin = 100
+        self.assertEquals(self.var.GetValue(95), None)
+        self.assertEquals(self.var.GetValue(105), 95)
+
     def test_fail_flatten_index(self):
         self.assertRaises(AssertionError, _flatten_index, None, [])
         self.assertRaises(AssertionError, _flatten_index, [], None)
@@ -17,6 +17,7 @@ log = ion.util.ionlog.getLogger(__name__)
 
 from ion.core.object.cdm_methods import group
 
+import bisect
 from math import ceil
 
 #--------------------------------------#
@@ -78,40 +79,154 @@ def GetValue(self, *args):
     usage for a 3Dimensional variable:
     as.getValue(1,3,9)
     """
-    
-    # @todo: Need tests for multidim arrays
-    # @todo: Check the rank outside the for loop
+
     # @todo: Check to make sure args are integers!
 
-    value = None
-    
-    for ba in self.content.bounded_arrays:
-    
+    return GetValues(self, [args])[0]
 
-        for index, bounds in zip(args, ba.bounds):
-            if bounds.origin > index or index >= bounds.origin + bounds.size :
+
+@_gpb_source
+def GetValues(self, indices):
+    """
+    @Brief Get many values from an array structure at once
+    @param self - a cdm variable object
+    @param indices - a list of index tuples, one for each value to extract
+    @retval a list of values, None where no bounded array holds the indices
+
+    usage for a 2Dimensional variable:
+    as.GetValues([(0,1), (0,2), (5,7)])
+    """
+    bounded_arrays = self.content.bounded_arrays
+
+    # The index is dropped when bounded arrays are added or removed, but bounds
+    # can be changed in place: check each bounded array against its entry the
+    # first time it is used, and rebuild the index (once) on a mismatch or miss
+    ba_index = bounded_arrays.GetIndex('bounds', _BoundedArrayIndex)
+    rebuilt = False
+    ndarrays = {}
+
+    values = []
+    for args in indices:
+        while True:
+            entry = ba_index.find(args)
+            if entry is not None:
+                position = entry[0]
+                ndarray = ndarrays.get(position)
+                if ndarray is None:
+                    ba = bounded_arrays[position]
+                    if rebuilt or _bounds_match(ba, entry):
+                        ndarray = ba.ndarray.value
+                        ndarrays[position] = ndarray
+
+                if ndarray is not None:
+                    values.append(ndarray[_flatten_entry_index(args, entry)])
+                    break
+
+            if rebuilt:
+                values.append(None)
                 break
 
-        else:
-            # We now have the the ndarray of interest..  extract the value!
-
-            # Create a list of this bounded_array's sizes and use origin to determine
-            # the given indices position in the ndarray
-            indices = []
-            shape = []
-            for index, bounds in zip(args, ba.bounds):
-                  indices.append(index - bounds.origin)  
-                  shape.append(bounds.size)  
-            
-            # Find the flattened index (make sure to apply the origin values as an offset!)
-            flattened_index = _flatten_index(indices, shape)
-            
-            # Grab the value from the ndarray
-            value = ba.ndarray.value[flattened_index]
-            break
-
-
-    return value
+            ba_index = bounded_arrays.GetIndex('bounds', _BoundedArrayIndex, rebuild=True)
+            rebuilt = True
+            ndarrays.clear()
+
+    return values
+
+
+class _BoundedArrayIndex(object):
+    """
+    The origin and size of each bounded array of a variable's content, sorted
+    on the outermost dimension, with the strides of its ndarray. Entries are
+    tuples of (position in bounded_arrays, origins, sizes, strides).
+    """
+
+    def __init__(self, bounded_arrays):
+        sorted_entries = []
+        # Bounded arrays without bounds hold any index
+        self.unbounded = []
+        for position in xrange(len(bounded_arrays)):
+            bounds = bounded_arrays[position].bounds
+            origins = tuple([b.origin for b in bounds])
+            sizes = tuple([b.size for b in bounds])
+
+            strides = [1] * len(sizes)
+            for i in xrange(len(sizes) - 2, -1, -1):
+                strides[i] = strides[i + 1] * sizes[i + 1]
+
+            entry = (position, origins, sizes, tuple(strides))
+            if sizes:
+                sorted_entries.append((origins[0], position, entry))
+            else:
+                self.unbounded.append(entry)
+
+        sorted_entries.sort()
+        self.starts = [item[0] for item in sorted_entries]
+        self.entries = [item[2] for item in sorted_entries]
+
+        # The largest outer end of the entries up to each position, where the
+        # backward search for overlapping entries can stop
+        self.max_ends = []
+        max_end = None
+        for (position, origins, sizes, strides) in self.entries:
+            max_end = max(max_end, origins[0] + sizes[0])
+            self.max_ends.append(max_end)
+
+    def find(self, args):
+        """
+        Returns the entry of the first bounded array holding the indices, or None
+        """
+        if not args:
+            candidates = self.entries + self.unbounded
+            if candidates:
+                return min(candidates)
+            return None
+
+        found = None
+        outer = args[0]
+        i = bisect.bisect_right(self.starts, outer) - 1
+        while i >= 0 and self.max_ends[i] > outer:
+            entry = self.entries[i]
+            i -= 1
+            if found is not None and found[0] < entry[0]:
+                continue
+            for index, origin, size in zip(args, entry[1], entry[2]):
+                if origin > index or index >= origin + size:
+                    break
+            else:
+                found = entry
+
+        if self.unbounded and (found is None or self.unbounded[0][0] < found[0]):
+            found = self.unbounded[0]
+        return found
+
+
+def _bounds_match(ba, entry):
+    """
+    Checks that the bounds of a bounded array are still those of its index entry
+    """
+    bounds = ba.bounds
+    if len(bounds) != len(entry[2]):
+        return False
+    for b, origin, size in zip(bounds, entry[1], entry[2]):
+        if b.origin != origin or b.size != size:
+            return False
+    return True
+
+
+def _flatten_entry_index(args, entry):
+    """
+    Position of the indices in the ndarray of an index entry
+    """
+    (position, origins, sizes, strides) = entry
+    if len(args) < len(sizes):
+        # Only the leading dimensions are given
+        indices = [index - origin for index, origin in zip(args, origins)]
+        return _flatten_index(indices, list(sizes[:len(indices)]))
+
+    result = 0
+    for index, origin, stride in zip(args, origins, strides):
+        result += (index - origin) * stride
+    return result
 
 
 @_gpb_source
@@ -106,7 +106,7 @@ def pack_structure(content):
     # extract the excluded_object_types list if we have one!
     excluded_object_types = []
     if hasattr(content, 'excluded_object_types') and len(content.excluded_object_types) > 0:
-        log.debug("Codec pack_structure has %d excluded_object_types" % len(content.excluded_object_types))
+        log.debug("Codec pack_structure has %d excluded_object_types", len(content.excluded_object_types))
         excluded_object_types = [x.GPBMessage for x in content.excluded_object_types]
 
     # Recurse through the DAG and add the keys to a set - obj_set.
@@ -201,7 +201,7 @@ def unpack_structure(serialized_container):
     # attempt to extract a list of excluded objects, if the message contains the field 'excluded_object_types'
     excluded_types = []
     if hasattr(root_obj, 'message_object') and hasattr(root_obj.message_object, 'excluded_object_types'):
-        log.debug("Codec unpack_structure has %d excluded_object_types set in field" % len(root_obj.message_object.excluded_object_types))
+        log.debug("Codec unpack_structure has %d excluded_object_types set in field", len(root_obj.message_object.excluded_object_types))
         excluded_types = [x.GPBMessage for x in root_obj.message_object.excluded_object_types]
 
     # Now load the rest of the linked objects - down to the leaf nodes.
@@ -235,7 +235,7 @@ def _unpack_container(serialized_container):
     try:
         cs.ParseFromString(serialized_container)
     except decoder._DecodeError, de:
-        log.debug('Received invalid content - decode error: "%s"' % str(de))
+        log.debug('Received invalid content - decode error: "%s"', de)
         raise CodecError('Could not decode message content as a GPB container structure!')
 
     # Return arguments
@@ -250,6 +250,6 @@ def _unpack_container(serialized_container):
 
         obj_dict[wse.key] = wse
 
-    log.debug('_unpack_container: returning head and dictionary of %d objects' % len(obj_dict))
+    log.debug('_unpack_container: returning head and dictionary of %d objects', len(obj_dict))
 
     return head, obj_dict
\ No newline at end of file
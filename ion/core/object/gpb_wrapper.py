@@ -544,6 +544,7 @@ class WrapperType(type):
             clsDict['SetDimension'] = group._set_dimension
 
             clsDict['GetValue'] = variables.GetValue
+            clsDict['GetValues'] = variables.GetValues
 
             clsDict['MergeAttSrc'] = attribute_merge.MergeAttSrc
             clsDict['MergeAttDst'] = attribute_merge.MergeAttDst
@@ -749,7 +750,7 @@ class Wrapper(object):
                 raise OOIObjectError('Can not invalidate by passing a wrapper from another repository')
 
             if other.Invalid:
-                log.error('Error while invalidating self - other is invalid too!\nSelf: %s\nOther: %s'% (self.Debug(), other.Debug()))
+                log.error('Error while invalidating self - other is invalid too!\nSelf: %s\nOther: %s', self.Debug(), other.Debug())
                 raise OOIObjectError('Can not invalidate self with other when other is already invalid')
 
         else:
@@ -796,7 +797,7 @@ class Wrapper(object):
                     raise OOIObjectError('The back door property getter failed!')
 
 
-                log.debug('Invalidating message property: %s' % prop.name)
+                log.debug('Invalidating message property: %s', prop.name)
                 if isinstance(self_obj, ContainerWrapper):
                     # Make sure to get the derive object not what it links to!
                     for gpb_item_self, gpb_item_other in zip(self_obj._gpbcontainer, other_obj._gpbcontainer):
@@ -1005,12 +1006,12 @@ class Wrapper(object):
 
         self.recurse_count.count += 1
         local_cnt = self.recurse_count.count
-        log.debug('Entering Recurse Commit: recurse counter - %d, Object Type - %s, child links - %d, objects to commit - %d, Modified - %s' %
-              (local_cnt, type(self), len(self.ChildLinks), len(structure), self.Modified))
+        log.debug('Entering Recurse Commit: recurse counter - %d, Object Type - %s, child links - %d, objects to commit - %d, Modified - %s',
+              local_cnt, type(self), len(self.ChildLinks), len(structure), self.Modified)
 
         if not  self.Modified:
             # This object is already committed!
-            log.debug('Exiting Recurse Commit: recurse counter - %d' % local_cnt)
+            log.debug('Exiting Recurse Commit: recurse counter - %d', local_cnt)
 
             return
 
@@ -1022,8 +1023,8 @@ class Wrapper(object):
 
             if link.Invalid:
                 log.error('Link in child links is invalid!')
-                log.debug('Current Wrapper: %s' % self.Debug())
-                log.debug('Invalid Link %s' % link.Debug())
+                log.debug('Current Wrapper: %s', ion.util.ionlog.lazy(self.Debug))
+                log.debug('Invalid Link %s', ion.util.ionlog.lazy(link.Debug))
 
             # Test to see if it is already serialized!
             child_se = repo.index_hash.get(link.key, structure.get(link.key, None))
@@ -1037,7 +1038,7 @@ class Wrapper(object):
             else:
                 # if isleaf set, type set, and the key is an actual SHA1 - we don't need to recurse into it or do anything, really.
                 if link.IsFieldSet('isleaf') and link.IsFieldSet('type') and len(link.key) == 20:
-                    log.debug('Disregarding un-index-hashed link %s' % link.key)
+                    log.debug('Disregarding un-index-hashed link %s', link.key)
                     pass
                 else:
                     child = repo.get_linked_object(link)
@@ -1123,14 +1124,14 @@ class Wrapper(object):
         for link in self.ParentLinks:
             if link.Invalid:
                 log.error('Link in parent links is invalid!')
-                log.debug('Current Wrapper: %s' % self.Debug())
-                log.debug('Invalid Link %s' % link.Debug())
+                log.debug('Current Wrapper: %s', ion.util.ionlog.lazy(self.Debug))
+                log.debug('Invalid Link %s', ion.util.ionlog.lazy(link.Debug))
 
 
             if link.key != se.key:
                 link.key = se.key
 
-        log.debug('Exiting Recurse Commit: recurse counter - %d' % local_cnt)
+        log.debug('Exiting Recurse Commit: recurse counter - %d', local_cnt)
 
 
     @GPBSource
@@ -1492,7 +1493,7 @@ class Wrapper(object):
                 try:
                     field_val = field.__get__(self)
                 except KeyError, ke:
-                    log.debug('KeyError during get field: %s' % ke)
+                    log.debug('KeyError during get field: %s', ke)
 
                     fid.write('''%s{Field Name - "%s" : Field Type - %s : %s} \n''' % (
                     offset, name, field.field_type, 'KeyError - object not found in local workbench'))
@@ -1502,7 +1503,7 @@ class Wrapper(object):
                     try:
                         val = 'Field Value - \n%s \n%s' % (field_val.PPrint(offset=offset + '  '), offset)
                     except AttributeError, ae:
-                        log.debug('Unset CasRef Field Name: %s: Catching Attribute Error: %s ' % (name, ae))
+                        log.debug('Unset CasRef Field Name: %s: Catching Attribute Error: %s ', name, ae)
                         val = 'Field Value - None'
                     except Exception, ex:
                         log.exception('Unexpected state in a WrappedMessageProperty.')
@@ -1559,6 +1560,9 @@ class ContainerWrapper(object):
         self.Repository = wrapper.Repository
         self._source = self
 
+        # Lookup structures derived from the items, see IndexByName and GetIndex
+        self._indexes = {}
+
     def GPBSourceCW(func):
         def call_func(self, *args, **kwargs):
             func_name = func.__name__
@@ -1608,6 +1612,7 @@ class ContainerWrapper(object):
         self._gpbcontainer = None
         self._source = source
         self.Repository = None
+        self._indexes = {}
 
     @GPBSourceCW
     def __setitem__(self, key, value):
@@ -1618,6 +1623,8 @@ class ContainerWrapper(object):
         if not isinstance(value, Wrapper):
             raise OOIObjectError('To set an item in a repeated field container, the value must be a Wrapper')
 
+        self._indexes = {}
+
         item = self._gpbcontainer.__getitem__(key)
         item = self._wrapper._rewrap(item)
         if item.ObjectType == LINK_TYPE:
@@ -1634,6 +1641,8 @@ class ContainerWrapper(object):
         if not isinstance(value, Wrapper):
             raise OOIObjectError('To set an item in a repeated field container, the value must be a Wrapper')
 
+        self._indexes = {}
+
         item = self._gpbcontainer.__getitem__(key)
         item = self._wrapper._rewrap(item)
         if item.ObjectType == LINK_TYPE:
@@ -1701,9 +1710,48 @@ class ContainerWrapper(object):
         return self._gpbcontainer.__str__()
 
 
+    @GPBSourceCW
+    def IndexByName(self, name):
+        """
+        Returns the index of the first item with the given name, or -1 if there
+        is none. For containers of named objects like CDM variables and
+        attributes. The name to index map is built on first use and dropped
+        when items are added, set or deleted. A hit is checked against the item
+        and a miss rebuilds the map, so renamed items are still found.
+        """
+        name_index = self._indexes.get('name')
+        if name_index is not None:
+            i = name_index.get(name)
+            if i is not None and i < len(self._gpbcontainer) and self.__getitem__(i).name == name:
+                return i
+
+        name_index = {}
+        for i in xrange(len(self._gpbcontainer)):
+            item_name = self.__getitem__(i).name
+            if item_name not in name_index:
+                name_index[item_name] = i
+        self._indexes['name'] = name_index
+
+        return name_index.get(name, -1)
+
+    @GPBSourceCW
+    def GetIndex(self, key, build, rebuild=False):
+        """
+        Returns a lookup structure derived from the items of this container,
+        calling build(container) on first use or when rebuild is set. Like the
+        name index it is dropped when items are added, set or deleted, but not
+        when an item is changed in place - callers must check what they find.
+        """
+        index = self._indexes.get(key)
+        if index is None or rebuild:
+            index = build(self)
+            self._indexes[key] = index
+        return index
+
     # Composite specific methods:
     @GPBSourceCW
     def add(self):
+        self._indexes = {}
         new_element = self._gpbcontainer.add()
 
         self._wrapper._set_parents_modified()
@@ -1724,6 +1772,7 @@ class ContainerWrapper(object):
     def __delitem__(self, key):
         """Deletes the item at the specified position."""
 
+        self._indexes = {}
         self._wrapper._set_parents_modified()
 
         item = self._gpbcontainer.__getitem__(key)
@@ -1771,11 +1820,11 @@ class ContainerWrapper(object):
                     fid.write('''%s%s# %i - %s  \n''' % (offset, name, i, val))
 
                 except AttributeError, ae:
-                    log.debug('Attribute error while calling pprint on repeated composite: %s' % ae)
+                    log.debug('Attribute error while calling pprint on repeated composite: %s', ae)
                     fid.write('''%s%s# %i - %s  \n''' % (offset, name, i, 'Repeated Link Not Set!'))
 
                 except KeyError, ke:
-                    log.debug('KeyError while calling pprint on repeated composite: %s' % ke)
+                    log.debug('KeyError while calling pprint on repeated composite: %s', ke)
                     fid.write('''%s%s# %i - %s  \n''' % (offset, name, i, 'Repeated Link object not found!!'))
 
                 except Exception, ex:
@@ -204,6 +204,45 @@ def get_gpb_class_from_type_id(typeid):
     except KeyError, ex:
         raise ObjectUtilException('No Protocol Buffer Message class found for id "%s"' % (str(typeid)))
 
+LINK_OBJECT_ID = 3
+
+@memoize(0)
+def type_has_links(object_id):
+    """
+    Determine from the GPB descriptors whether an object of the given type can
+    hold a link (CASRef) to another object, either in one of its own fields or
+    in a composite field nested inside it. Objects of a type without links are
+    always leaves of the object graph.
+    @param object_id The integer object id of the type
+    @retval True if the type can link to other objects
+    @throws ObjectUtilException if there is no class for the type id
+    """
+    msg_class = get_gpb_class_from_type_id(object_id)
+    return _descriptor_has_links(msg_class.DESCRIPTOR, set())
+
+def _descriptor_has_links(descriptor, visited):
+
+    if descriptor.full_name in visited:
+        return False
+    visited.add(descriptor.full_name)
+
+    for field in descriptor.fields:
+        field_desc = field.message_type
+        if field_desc is None:
+            continue
+
+        try:
+            if get_enum_from_descriptor(field_desc).number == LINK_OBJECT_ID:
+                return True
+        except ObjectUtilException:
+            # Untyped nested message - look inside it
+            pass
+
+        if _descriptor_has_links(field_desc, visited):
+            return True
+
+    return False
+
 type_name_cache = None
 def find_type_ids(query):
     """
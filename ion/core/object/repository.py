@@ -14,6 +14,8 @@ Refactor Merge to use a proxy repository for the readonly objects - they must li
 from ion.core.object.object_utils import ARRAY_STRUCTURE_TYPE, sha1_to_hex
 
 import weakref
+import bisect
+import heapq
 from twisted.internet import threads, reactor, defer
 
 from ion.core.object import gpb_wrapper
@@ -179,6 +181,46 @@ class IndexHash(dict):
         dict.__delitem__(self,key)
 
 
+class CommitIndex(dict):
+    """
+    A dictionary class for the commit index of a repository. It counts the
+    changes made to it, so the structures derived from the commit history can
+    tell when commits were added or removed without them - including direct
+    writes from outside the repository.
+    """
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.changes = 0
+
+    def __setitem__(self, key, val):
+        dict.__setitem__(self, key, val)
+        self.changes += 1
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.changes += 1
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self.changes += 1
+
+    def setdefault(self, key, d=None):
+        self.changes += 1
+        return dict.setdefault(self, key, d)
+
+    def pop(self, *args):
+        self.changes += 1
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self.changes += 1
+        return dict.popitem(self)
+
+    def clear(self):
+        dict.clear(self)
+        self.changes += 1
+
+
 
 
 
@@ -211,11 +253,20 @@ class ObjectContainer(object):
         or sent in a message.
         """
 
-        self._commit_index = {}
+        self._commit_index = CommitIndex()
         """
         Required for get_linked_object
         """
 
+        self._commit_dates = []
+        self._commit_date_ids = []
+        self._commit_index_changes = self._commit_index.changes
+        """
+        The dates of the commits in the commit index in ascending order and
+        the commit ids in the same order - for bisecting by date - and the
+        change count of the commit index they are up to date with
+        """
+
         self._process=None
         """
         Need for access to sending messages!
@@ -337,7 +388,7 @@ class ObjectContainer(object):
 
         else:
 
-            log.debug('Linked object not found. Need non local object: %s' % str(link))
+            log.debug('Linked object not found. Need non local object: %s', link)
 
             raise KeyError('Object not found in the local work bench.')
 
@@ -355,7 +406,7 @@ class ObjectContainer(object):
         obj.AddParentLink(link)
 
         if obj.ObjectType == COMMIT_TYPE:
-            self._commit_index[obj.MyId]=obj
+            self._index_commit(obj)
             obj.ReadOnly = True
 
         elif link.Root.ObjectType == COMMIT_TYPE:
@@ -371,6 +422,43 @@ class ObjectContainer(object):
 
         return obj
 
+    def _index_commit(self, cref):
+        """
+        @brief Add a commit to the commit index and the date sorted commit arrays
+        """
+        self._sync_commit_dates()
+
+        if cref.MyId not in self._commit_index:
+            date = cref.date
+            # Commits are usually newer than all others - insert at the end
+            ind = bisect.bisect_right(self._commit_dates, date)
+            self._commit_dates.insert(ind, date)
+            self._commit_date_ids.insert(ind, cref.MyId)
+
+        self._commit_index[cref.MyId] = cref
+        self._commit_index_changes = self._commit_index.changes
+
+    def _sync_commit_dates(self):
+        """
+        @brief Rebuild the date sorted commit arrays if the commit index was
+        modified without them (truncation, loading commits from elsewhere)
+        """
+        if self._commit_index_changes == self._commit_index.changes:
+            return
+
+        dated = sorted([(cref.date, key) for key, cref in self._commit_index.iteritems()])
+        self._commit_dates = [date for date, key in dated]
+        self._commit_date_ids = [key for date, key in dated]
+        self._commit_index_changes = self._commit_index.changes
+
+        self._commit_history_changed()
+
+    def _commit_history_changed(self):
+        """
+        @brief Called when commits were added to or removed from the commit
+        index other than by committing locally
+        """
+
     def load_links(self, obj, excluded_types=None):
         """
         Load the child objects into the work space recursively
@@ -551,6 +639,16 @@ class Repository(ObjectContainer):
         
         self._detached_head = False
 
+        self._ancestor_ids = {}
+        """
+        Cache of the set of ancestor commit ids (including itself) by head commit id
+        """
+
+        self._commit_generations = {}
+        """
+        Generation numbers by commit id - one more than the largest generation of the parents
+        """
+
         
         self.merge=None
         """
@@ -767,6 +865,11 @@ class Repository(ObjectContainer):
         self._workspace.clear()
         self.index_hash.clear()
         self._commit_index.clear()
+        self._commit_dates = []
+        self._commit_date_ids = []
+        self._commit_index_changes = self._commit_index.changes
+        self._ancestor_ids.clear()
+        self._commit_generations.clear()
         self._current_branch = None
         self.branchnicknames.clear()
         self._stash.clear()
@@ -910,7 +1013,7 @@ class Repository(ObjectContainer):
                 del self.branches[idx]
                 break
         else:
-            log.info(str(self))
+            log.info('%s', self)
             raise KeyError('Branch Key not found in repository %s: Could not delete branch name "%s"' % (self.repository_key, name))
 
         # Clean up the branch nickname if any...
@@ -931,7 +1034,7 @@ class Repository(ObjectContainer):
                 branch = item
                 break
         else:
-            log.info('Branch %s not found!' % name)
+            log.info('Branch %s not found!', name)
             
         return branch
     
@@ -957,7 +1060,7 @@ class Repository(ObjectContainer):
         if older_than is not None:
             older_than = float(older_than)
 
-        log.info('checkout: branchname - "%s", commit id - "%s", older_than - "%s", excluded_types - %s' % (branchname, commit_id, older_than, excluded_types))
+        log.info('checkout: branchname - "%s", commit id - "%s", older_than - "%s", excluded_types - %s', branchname, commit_id, older_than, excluded_types)
         if self.status == self.MODIFIED:
             raise RepositoryError('Can not checkout while the workspace is dirty')
             #What to do for uninitialized? 
@@ -990,80 +1093,26 @@ class Repository(ObjectContainer):
             
             # IF you are checking out a specific commit ID it is always a detached head!
             detached = True
-            
-            # Use this set to make sure we only examine each commit once!
-            touched_refs = set()
-                
-            crefs = branch.commitrefs[:]
-            
-            while len(crefs) >0:
-                new_set = set()
-                    
-                for ref in crefs:
-                        
-                    if ref.MyId == commit_id:
-                        
-                        # Empty the crefs set to exit the while loop!
-                        crefs = set()
-                        # Save the CRef!
-                        cref = ref
-                        break # Break to ref in crefs
-                        
-                    # For each child reference...
-                    for pref in ref.parentrefs:
-                        # If we have not already looked at this one...
-                        p_commit = pref.commitref
-                        if not p_commit in touched_refs:                            
-                            new_set.add(p_commit)
-                            touched_refs.add(p_commit)    
-                    
-                else:
-                    crefs = new_set                    
-            else:
-                if not cref:
-                    raise RepositoryError('End of Ancestors: No matching reference \
-                                          found in commit history on branch name %s, \
-                                          commit_id: %s' % (branchname, commit_id))
+
+            if commit_id in self._branch_ancestor_ids(branch):
+                cref = self._commit_index.get(commit_id)
+
+            if not cref:
+                raise RepositoryError('End of Ancestors: No matching reference \
+                                      found in commit history on branch name %s, \
+                                      commit_id: %s' % (branchname, commit_id))
 
         elif older_than:
             
             # IF you are checking out a specific commit date it is always a detached head!
             detached = True
-            
-            # Need to make sure we get the closest commit to the older_than date!
-            younger_than = -9999.99
-            
-            # Use this set to make sure we only examine each commit once!
-            touched_refs = set()
-            
-            crefs = branch.commitrefs[:]
-            
-            while len(crefs) >0:
-                
-                new_set = set()
-                
-                for ref in crefs:
-                        
-                    if ref.date <= older_than & ref.date > younger_than:
-                        cref = ref
-                        younger_than = ref.date
-                        
-                    # Only keep looking at parent references if they are to young
-                    elif ref.date > older_than:
-                        # For each child reference...
-                        for pref in ref.parentrefs:
-                            # If we have not already looked at this one...
-                            if not pref in touched_refs:                            
-                                new_set.add(pref)
-                                touched_refs.add(pref)    
-                       
-                crefs = new_set
-                       
-            else:
-                if not cref:
-                    raise RepositoryError('End of Ancestors: No matching commit \
-                                          found in commit history on branch name %s, \
-                                          older_than: %s' % (branch_name, older_than))
+
+            cref = self._find_commit_older_than(older_than, self._branch_ancestor_ids(branch))
+
+            if not cref:
+                raise RepositoryError('End of Ancestors: No matching commit \
+                                      found in commit history on branch name %s, \
+                                      older_than: %s' % (branchname, older_than))
                 
         # Just checking out the current head - need to make sure it has not diverged! 
         else:
@@ -1115,6 +1164,94 @@ class Repository(ObjectContainer):
 
         
         
+    def _commit_history_changed(self):
+        """
+        @brief Commits came in from elsewhere or were truncated. A commit whose
+        parents were not loaded yet was given too small a generation and too
+        small a set of ancestors - drop them to be computed again.
+        """
+        self._ancestor_ids.clear()
+        self._commit_generations.clear()
+
+    def _branch_ancestor_ids(self, branch):
+        """
+        @brief The ids of all commits reachable from the head(s) of a branch.
+        Walking the history loads the commits into the commit index. The set
+        of a head is cached and reused by its descendants, so only the
+        commits since the last lookup are walked.
+        """
+        # Drop the cached sets if commits came in from elsewhere
+        self._sync_commit_dates()
+
+        heads = branch.commitrefs[:]
+
+        if len(heads) == 1:
+            ancestors = self._get_ancestor_ids(heads[0])
+        else:
+            ancestors = set()
+            for head in heads:
+                ancestors.update(self._get_ancestor_ids(head))
+
+        # Keep only the sets of the current heads
+        head_ids = set([cref.MyId for cref in self.current_heads()])
+        for key in self._ancestor_ids.keys():
+            if key not in head_ids:
+                del self._ancestor_ids[key]
+
+        return ancestors
+
+    def _get_ancestor_ids(self, head):
+
+        head_id = head.MyId
+        ancestors = self._ancestor_ids.get(head_id)
+        if ancestors is not None:
+            return ancestors
+
+        # Take over the cached set of the first cached ancestor we reach
+        base = None
+        found = set([head_id])
+        front = [head]
+        while front:
+            cref = front.pop()
+            for parent in self._commit_parents(cref):
+                parent_id = parent.MyId
+                if parent_id in found or (base is not None and parent_id in base):
+                    continue
+
+                cached = self._ancestor_ids.get(parent_id)
+                if cached is None:
+                    found.add(parent_id)
+                    front.append(parent)
+                elif base is None:
+                    base = self._ancestor_ids.pop(parent_id)
+                else:
+                    base.update(cached)
+
+        if base is None:
+            ancestors = found
+        else:
+            ancestors = base
+            ancestors.update(found)
+
+        self._ancestor_ids[head_id] = ancestors
+        return ancestors
+
+    def _find_commit_older_than(self, older_than, ancestor_ids):
+        """
+        @brief Find the newest commit in ancestor_ids which is not newer than older_than
+        @retval the commit ref or None
+        """
+        self._sync_commit_dates()
+
+        ind = bisect.bisect_right(self._commit_dates, older_than)
+        while ind > 0:
+            ind -= 1
+            key = self._commit_date_ids[ind]
+            if key in ancestor_ids and key in self._commit_index:
+                return self._commit_index[key]
+
+        return None
+
     def merge_by_date(self, branch):
         
         crefs=branch.commitrefs[:]
@@ -1138,9 +1275,9 @@ class Repository(ObjectContainer):
 
 
         if keys_are_the_same:
-            log.warn('BRANCH STATE HAS DIVERGED BUT CONTENT IS THE SAME - MERGING WITH NO INFORMATION LOST, REPO KEY %s' % self.repository_key)
+            log.warn('BRANCH STATE HAS DIVERGED BUT CONTENT IS THE SAME - MERGING WITH NO INFORMATION LOST, REPO KEY %s', self.repository_key)
         else:
-            log.warn('BRANCH STATE HAS DIVERGED - MERGING BY DATE WITH INFORMATION LOST, REPO KEY %s' % self.repository_key)
+            log.warn('BRANCH STATE HAS DIVERGED - MERGING BY DATE WITH INFORMATION LOST, REPO KEY %s', self.repository_key)
 
 
         # Deal with the newest ref seperately
@@ -1175,7 +1312,8 @@ class Repository(ObjectContainer):
         cref.ReadOnly = True
         
         # Add the cref to the active commit objects - for convienance
-        self._commit_index[cref.MyId] = cref
+        self._index_commit(cref)
+        self._commit_generation(cref)
 
         # update the hashed elements
         self.index_hash.update(structure)
@@ -1188,76 +1326,126 @@ class Repository(ObjectContainer):
 
 
     def get_common_ancestor(self,crefs):
+        """
+        @brief Find the nearest commit which is an ancestor of all the crefs (or is one of them)
+        Commits are visited in order of decreasing generation, so every path into
+        a commit has been followed when it is visited and the search stops at
+        the first commit reached from all the crefs.
+        """
+        # Drop the cached generations if commits came in from elsewhere
+        self._sync_commit_dates()
+
+        complete = (1 << len(crefs)) - 1
+
+        # The crefs each commit is reached from - as a bit mask
+        reached = {}
+        heap = []
+        for ind, cref in enumerate(crefs):
+            key = cref.MyId
+            if key not in reached:
+                reached[key] = 0
+                heapq.heappush(heap, (-self._commit_generation(cref), key, cref))
+            reached[key] |= 1 << ind
+
+        while heap:
+
+            neg_gen, key, ancestor = heapq.heappop(heap)
+            mask = reached[key]
+            if mask == complete:
+                return ancestor
+
+            for parent in self._commit_parents(ancestor):
+                parent_key = parent.MyId
+                if parent_key in reached:
+                    reached[parent_key] |= mask
+                else:
+                    reached[parent_key] = mask
+                    heapq.heappush(heap, (-self._commit_generation(parent), parent_key, parent))
 
-        ancestor = crefs[0]
-        found_common = False
-        tested = set()
-
-        # Now look for the common ancestor
-        while not found_common:
-
-            tested.add(ancestor.MyId)
-
-            for cref in crefs:
-
-                if not ancestor.InParents(cref):
-                    break
-            else:
-                found_common = True
-                break
+        log.error('No common ancestor found in Repository!\n%s', self)
+        raise RepositoryError('No common ancestor found for commit ref.')
 
+    def _commit_parents(self, cref):
+        """
+        @brief The loaded parent commits of a commit
+        """
+        parents = []
+        for pref in cref.parentrefs:
             try:
-                ancestor = ancestor.parentrefs[0].commitref
-            except IndexError, ex:
-                log.exception('No common ancestor found in Repository!\n%s' % str(self))
-                raise RepositoryError('No common ancestor found for commit ref.')
-
-        return ancestor
+                parents.append(pref.commitref)
+            except KeyError:
+                # The history has been truncated
+                pass
+        return parents
+
+    def _commit_generation(self, cref):
+        """
+        @brief Get the generation number of a commit. A root commit, or one where
+        the history has been truncated, is generation 1. Every other commit is one
+        more than the largest generation of its parents, so an ancestor always has
+        a smaller generation than its descendants. Generations are computed on
+        first use - for commits loaded from elsewhere that is the whole history.
+        They are dropped when commits come in from elsewhere, see
+        _commit_history_changed.
+        """
+        generations = self._commit_generations
+
+        gen = generations.get(cref.MyId)
+        if gen is not None:
+            return gen
+
+        # Depth first without recursion - the history may be deeper than the recursion limit
+        stack = [cref]
+        while stack:
+            ref = stack[-1]
+            if ref.MyId in generations:
+                stack.pop()
+                continue
+
+            gen = 0
+            pending = False
+            for parent in self._commit_parents(ref):
+                parent_gen = generations.get(parent.MyId)
+                if parent_gen is None:
+                    stack.append(parent)
+                    pending = True
+                elif parent_gen > gen:
+                    gen = parent_gen
+
+            if not pending:
+                stack.pop()
+                generations[ref.MyId] = gen + 1
+
+        return generations[cref.MyId]
 
     def truncate_commits(self, ncom=50):
 
-        log.info('Truncating Commits in repository -  %s' % self.repository_key)
-
-        # the set of all commits - from which we will remove the newest 50
-        old_commit_keys = set(self._commit_index.keys())
+        log.info('Truncating Commits in repository -  %s', self.repository_key)
 
         # bail early if there are less than 50 commits
-        if len(old_commit_keys) <= ncom:
+        if len(self._commit_index) <= ncom:
             return
 
-        # the front wave of commits - starting with head
-        commits_front = self.current_heads()
+        # the heads are always kept
+        heads = self.current_heads()
 
-        if len(commits_front) > 10:
+        if len(heads) > 10:
             raise RepositoryError('Unexpectedly high number of branches - something is wrong with this repo! \n%s' % str(self))
 
-        # Set the head
-        keep_commit_keys = set([cref.MyId for cref in commits_front])
-
-        # and remove them from the old list
-        for key in keep_commit_keys:
-            old_commit_keys.remove(key)
-
-        # Now iterate their parents keeping the newest generations...
-        new_front = set()
-        while len(keep_commit_keys) < ncom:
-
-            for cref in commits_front:
-
-                for pref in cref.parentrefs:
+        keep_commit_keys = set([cref.MyId for cref in heads])
 
-                    parent = pref.commitref
+        # Keep the newest generations - at least ncom commits
+        self._sync_commit_dates()
+        generations = [self._commit_generation(cref) for cref in self._commit_index.values()]
+        generations.sort(reverse=True)
+        cutoff = generations[ncom - 1]
 
-                    if parent.MyId not in keep_commit_keys:
-
-                        keep_commit_keys.add(parent.MyId)
-
-                        new_front.add(parent)
-
-                        old_commit_keys.remove(parent.MyId)
-
-            commits_front = new_front
-            new_front = set()
+        old_commit_keys = set()
+        for key in self._commit_index.keys():
+            if self._commit_generations[key] >= cutoff or key in keep_commit_keys:
+                keep_commit_keys.add(key)
+            else:
+                old_commit_keys.add(key)
 
         # Remove the old keys - truncating the local history
         for key in old_commit_keys:
@@ -1266,6 +1454,10 @@ class Repository(ObjectContainer):
             cref.Invalidate()
             del self._commit_index[key]
             del self.index_hash[key]
+            del self._commit_generations[key]
+
+        # Rebuilds the date arrays and drops the ancestor sets and generations
+        self._sync_commit_dates()
 
         # Clean up any parent refs left behind Bug OOIION-510
         for cref in self._commit_index.itervalues():
@@ -1380,12 +1572,13 @@ class Repository(ObjectContainer):
             cref.ReadOnly = True
             
             # Add the cref to the active commit objects - for convenience
-            self._commit_index[cref.MyId] = cref
+            self._index_commit(cref)
+            self._commit_generation(cref)
 
             # update the hashed elements
             self.index_hash.update(structure)
 
-            log.debug('Commited repository - Comment: "%s"' % cref.comment)
+            log.debug('Commited repository - Comment: "%s"', cref.comment)
                             
         else:
             raise RepositoryError('Repository in invalid state to commit')
@@ -1500,8 +1693,8 @@ class Repository(ObjectContainer):
                 crefs.extend( branch.commitrefs)
         
         else:
-            log.debug('''Arguments to Repository.merge - branchname: %s; commit_id: %s''' \
-                      % (branchname, commit_id))
+            log.debug('''Arguments to Repository.merge - branchname: %s; commit_id: %s''',
+                      branchname, commit_id)
             raise RepositoryError('merge takes either a branchname argument or a commit_id argument!')
         
         assert len(crefs) > 0, 'Illegal state reached in repository Merge With function!'
@@ -1550,19 +1743,19 @@ class Repository(ObjectContainer):
             branchname = self._current_branch.branchkey
         
         branch = self.get_branch(branchname)
-        log.info('$$ Logging commits on Branch %s $$' % branchname)
+        log.info('$$ Logging commits on Branch %s $$', branchname)
         cntr = 0
         for cref in branch.commitrefs:
             cntr+=1
-            log.info('$$ Branch Head Commit # %s $$' % cntr)
+            log.info('$$ Branch Head Commit # %s $$', cntr)
             
-            log.info('Commit: \n' + str(cref))
+            log.info('Commit: \n%s', cref)
         
             while len(cref.parentrefs) >0:
                 for pref in cref.parentrefs:
                     if pref.relationship == pref.Relationship.PARENT:
                             cref = pref.commitref
-                            log.info('Commit: \n' + str(cref))
+                            log.info('Commit: \n%s', cref)
                             break # There should be only one parent ancestor from a branch
 
     def list_parent_commits(self,branchname=None):
@@ -1644,7 +1837,7 @@ class Repository(ObjectContainer):
         try:
             obj = self.get_linked_object(link)
         except KeyError, ex:
-            log.info('"get_remote_linked_object": Caught object not found:'+str(ex))
+            log.info('"get_remote_linked_object": Caught object not found:%s', ex)
             res = yield self._fetch_remote_objects([link,])
             # Object is now in the hashed objects dictionary
             obj = self.get_linked_object(link)
@@ -1686,7 +1879,7 @@ class Repository(ObjectContainer):
                     child = self.get_linked_object(link)
                     local_objects.append(child)
                 except KeyError, ex:
-                    log.info('"load_remote_links": Caught object not found:'+str(ex))
+                    log.info('"load_remote_links": Caught object not found:%s', ex)
                     remote_objects.append(link)
             
         if remote_objects:
@@ -1749,7 +1942,7 @@ class Repository(ObjectContainer):
                     link.SetLink(new_child)
                 except KeyError, ke:
                     if ignore_copy_errors:
-                        log.debug("Copy Object: ignored unfound child link %s" % link)
+                        log.debug("Copy Object: ignored unfound child link %s", link)
                     else:
                         # reraise
                         raise ke
@@ -1767,8 +1960,8 @@ class Repository(ObjectContainer):
             raise RepositoryError('Can not set a composite field unless it is of type Link')
 
         if not isinstance(value, gpb_wrapper.Wrapper):
-            log.debug('Error Setting Link in Object - Root Object Containing the Link: \n %s' % link.Root.Debug())
-            log.error('Error Setting Link in Object - Attempting to set the link equal to a non GPBWrapper Value: "%s"' % str(value))
+            log.debug('Error Setting Link in Object - Root Object Containing the Link: \n %s', ion.util.ionlog.lazy(link.Root.Debug))
+            log.error('Error Setting Link in Object - Attempting to set the link equal to a non GPBWrapper Value: "%s"', value)
 
             raise RepositoryError('You can not assign an object link equal to a none GPB Wrapper value. Value type "%s", see log errors and log debug for more details' % type(value))
 
@@ -1856,7 +2049,7 @@ class Repository(ObjectContainer):
                     attribute).
         """
         origtreeish = treeish
-        log.debug("resolve_treeish: %s" % origtreeish)
+        log.debug("resolve_treeish: %s", origtreeish)
 
         branch = branch or "master"
 
@@ -1878,7 +2071,7 @@ class Repository(ObjectContainer):
             if numbuf.isdigit():
                 num = int(numbuf)
 
-            log.debug("treeish chunk: op %s, num %d, curcommit %s" % (op, num, sha1_to_hex(curcommit.MyId)))
+            log.debug("treeish chunk: op %s, num %d, curcommit %s", op, num, sha1_to_hex(curcommit.MyId))
 
             if op == "~":
                 # Tilde Spec:
@@ -1900,7 +2093,7 @@ class Repository(ObjectContainer):
             else:
                 raise RepositoryError("Unknown treeish char: %s (treeish: %s)" % (op, origtreeish))
 
-        log.debug("Treeish (%s) resolved to commit %s" % (origtreeish, sha1_to_hex(curcommit.MyId)))
+        log.debug("Treeish (%s) resolved to commit %s", origtreeish, sha1_to_hex(curcommit.MyId))
         return curcommit
 
 
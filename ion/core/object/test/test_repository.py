@@ -467,6 +467,59 @@ class RepositoryTest(unittest.TestCase):
 
         self.assertEqual(ancestor, common_cref.MyId)
 
+        # A commit is a common ancestor of itself and its descendants
+        common_cref = repo.get_common_ancestor([crefs[0], repo._commit_index.get(ancestor)])
+        self.assertEqual(ancestor, common_cref.MyId)
+
+    def test_commit_generation(self):
+
+        repo, ab = self.wb.init_repository(ADDRESSLINK_TYPE)
+        ref1 = repo.commit('1')
+        ref2 = repo.commit('2')
+        ref3 = repo.commit('3')
+
+        self.assertEqual(repo._commit_generation(repo._commit_index.get(ref1)), 1)
+        self.assertEqual(repo._commit_generation(repo._commit_index.get(ref2)), 2)
+        self.assertEqual(repo._commit_generation(repo._commit_index.get(ref3)), 3)
+
+        # Computed from the parents when not known
+        repo._commit_generations.clear()
+        self.assertEqual(repo._commit_generation(repo._commit_index.get(ref3)), 3)
+
+    def test_commit_index_written_directly(self):
+
+        repo, ab = self.wb.init_repository(ADDRESSLINK_TYPE)
+        ref1 = repo.commit('1')
+        ref2 = repo.commit('2')
+        cref1 = repo._commit_index.pop(ref1)
+
+        # Commit 2 was loaded before its parent - its generation is too small
+        cref2 = repo._commit_index.get(ref2)
+        repo._sync_commit_dates()
+        repo._commit_generations[ref2] = 1
+        self.assertEqual(repo._commit_date_ids, [ref2])
+
+        # Writing the missing parent drops the generations and rebuilds the dates
+        repo._commit_index[ref1] = cref1
+        self.assertEqual(repo.get_common_ancestor([cref1, cref2]).MyId, ref1)
+        self.assertEqual(repo._commit_generation(cref2), 2)
+        self.assertEqual(set(repo._commit_date_ids), set([ref1, ref2]))
+
+    def test_truncate_commits(self):
+
+        repo, ab = self.wb.init_repository(ADDRESSLINK_TYPE)
+        commit_ids = [repo.commit(str(i)) for i in range(20)]
+
+        repo.truncate_commits(ncom=5)
+
+        self.assertEqual(set(repo._commit_index.keys()), set(commit_ids[-5:]))
+        self.assertEqual(repo.current_heads()[0].MyId, commit_ids[-1])
+
+        # The oldest remaining commit is the root of the truncated history
+        cref = repo._commit_index.get(commit_ids[-5])
+        self.assertEqual(repo._commit_generation(cref), 16)
+        self.assertEqual(repo.get_common_ancestor([cref, repo.current_heads()[0]]).MyId, commit_ids[-5])
+
         
     def test_create_commit_ref(self):
         repo, ab = self.wb.init_repository(ADDRESSLINK_TYPE)
@@ -499,6 +552,72 @@ class RepositoryTest(unittest.TestCase):
         self.assertEqual(ab.person[0].id,1)
         self.assertEqual(ab.person[0].name,'alpha')
 
+        yield self.failUnlessFailure(repo.checkout(branchname='master', commit_id='not a commit'), RepositoryError)
+
+    @defer.inlineCallbacks
+    def test_checkout_older_than(self):
+        repo, ab = self.wb.init_repository(ADDRESSBOOK_TYPE)
+
+        commit_ref1 = repo.commit()
+        date1 = repo._commit_index[commit_ref1].date
+
+        p = ab.person.add()
+        p.id = 1
+        p.name = 'Uma'
+        commit_ref2 = repo.commit()
+        date2 = repo._commit_index[commit_ref2].date
+
+        yield self.failUnlessFailure(repo.checkout(branchname='master', older_than=date1 - 1.0), RepositoryError)
+
+        ab = yield repo.checkout(branchname='master', older_than=date2 + 1.0)
+        self.assertEqual(repo._current_branch.commitrefs[0].MyId, commit_ref2)
+        self.assertEqual(ab.person[0].name,'Uma')
+
+        if date1 < date2:
+            ab = yield repo.checkout(branchname='master', older_than=date1)
+            self.assertEqual(repo._current_branch.commitrefs[0].MyId, commit_ref1)
+            self.assertEqual(len(ab.person),0)
+
+    @defer.inlineCallbacks
+    def test_checkout_history_lookup_visits(self):
+        repo, ab = self.wb.init_repository(ADDRESSBOOK_TYPE)
+
+        commits = []
+        for i in range(100):
+            commit_id = repo.commit(comment=str(i))
+            commits.append((repo._commit_index[commit_id].date, commit_id))
+
+        def expected_older_than(older_than):
+            # The newest commit which is not newer than older_than
+            result = None
+            for date, commit_id in commits:
+                if date <= older_than:
+                    result = commit_id
+            return result
+
+        # Count the commits whose parents are looked up
+        visited = []
+        commit_parents = repo._commit_parents
+        def counting_commit_parents(cref):
+            visited.append(cref.MyId)
+            return commit_parents(cref)
+        self.patch(repo, '_commit_parents', counting_commit_parents)
+
+        # The first lookup walks the history once
+        yield repo.checkout(branchname='master', commit_id=commits[-1][1])
+        self.assertEqual(len(visited), len(commits))
+
+        # Looking up any commit after that - old or new - walks nothing
+        del visited[:]
+        for date, commit_id in commits[:5] + commits[-5:]:
+            yield repo.checkout(branchname='master', commit_id=commit_id)
+            self.assertEqual(repo._current_branch.commitrefs[0].MyId, commit_id)
+
+            yield repo.checkout(branchname='master', older_than=date)
+            self.assertEqual(repo._current_branch.commitrefs[0].MyId, expected_older_than(date))
+
+        self.assertEqual(visited, [])
+
 
     def test_error_on_set_linked_object(self):
 
@@ -245,7 +245,7 @@ class WorkBench(object):
     def _set_association(self,  association_repo, thing, partname):
 
         if not hasattr(thing, 'Repository'):
-            log.error('Association Error: type, value', type(thing),str(thing))
+            log.error('Association Error: type %s, value %s', type(thing),str(thing))
             raise WorkBenchError('Invalid object passed to Create Association. Only Object Repositories and Instance types can be passed as subject, predicate or object')
 
         thing_repo = thing.Repository
@@ -279,7 +279,7 @@ class WorkBench(object):
                 repo = self._repo_cache.pop(rkey)
                 self.put_repository(repo)
             except KeyError, ke:
-                log.debug('Repository key "%s" not found in cache' % rkey)
+                log.debug('Repository key "%s" not found in cache', rkey)
 
         return repo
         
@@ -296,7 +296,7 @@ class WorkBench(object):
 
     def clear_repository(self, repo):
 
-        log.info('Clearing Repository: %s ' % str(repo.repository_key))
+        log.info('Clearing Repository: %s ', repo.repository_key)
 
         key = repo.repository_key
         repo.clear()
@@ -312,7 +312,7 @@ class WorkBench(object):
 
     def cache_repository(self, repo):
 
-        log.info('Caching Repository: %s ' % str(repo.repository_key))
+        log.info('Caching Repository: %s ', repo.repository_key)
 
         key = repo.repository_key
         # Get rid of the nick name - this is a PITA
@@ -397,7 +397,7 @@ class WorkBench(object):
         try:
             repo.convid_context = self._process.context.get('progenitor_convid')
         except AttributeError, ae:
-            log.warn('Workbench Process (%s) does not have have a context object!' % self._process)
+            log.warn('Workbench Process (%s) does not have have a context object!', self._process)
        
     def reference_repository(self, repo_key, current_state=False):
 
@@ -518,7 +518,7 @@ class WorkBench(object):
         # Get the scoped name for the process to pull from
         targetname = self._process.get_scoped_name('system', origin)
 
-        log.info('Target Name "%s"' % str(targetname))
+        log.info('Target Name "%s"', targetname)
 
 
         if not isinstance(repo_name, (str, unicode)):
@@ -570,7 +570,7 @@ class WorkBench(object):
             ex_msg = re.msg_content
             msg_headers = re.msg_headers
 
-            log.info('ReceivedApplicationError:Response code - %s, Response Message - "%s"' % (ex_msg.MessageResponseCode, ex_msg.MessageResponseBody))
+            log.info('ReceivedApplicationError:Response code - %s, Response Message - "%s"', ex_msg.MessageResponseCode, ex_msg.MessageResponseBody)
 
             if cloning:
                 # Clear the repository that was created for the clone
@@ -645,7 +645,7 @@ class WorkBench(object):
         log.debug('Found repository to pull')
 
         if repo.status == repo.MODIFIED:
-            log.debug('Bad repo state for pulling - status: %s' % repo.status)
+            log.debug('Bad repo state for pulling - status: %s', repo.status)
             raise WorkBenchError('Invalid pull request. Requested Repository is in an invalid state.', request.ResponseCodes.BAD_REQUEST)
 
 
@@ -822,7 +822,7 @@ class WorkBench(object):
 
             commit_head = repo.commit_head
             if commit_head is None:
-                log.warning('No commits found in repository during push: \n' + str(repo))
+                log.warning('No commits found in repository during push: \n%s', repo)
                 raise WorkBenchError('Can not push a repository which has no commits!')
 
             repostate = pushmsg.repositories.add()
@@ -845,7 +845,7 @@ class WorkBench(object):
             # @TODO Return more info about the result - detect divergence?
         except ReceivedError, re:
             
-            log.debug('ReceivedError', str(re))
+            log.debug('ReceivedError: %s', re)
             raise WorkBenchError('Push returned an exception! "%s"' % re.msg_content)
 
 
@@ -907,7 +907,7 @@ class WorkBench(object):
                     blobs_msg = yield self.fetch_blobs(headers.get('reply-to'), blobs_request)
                 except ReceivedError, re:
 
-                   log.debug('ReceivedError', str(re))
+                   log.debug('ReceivedError: %s', re)
                    raise WorkBenchError('Fetch Objects returned an exception! "%s"' % re.msg_content)
 
 
@@ -1049,6 +1049,9 @@ class WorkBench(object):
             for link in branch.commitrefs.GetLinks():
                 self._load_commits(link,loaded=loaded)
 
+        # The new commits may be the missing history of commits already loaded
+        repo._commit_history_changed()
+
         if repo._dotgit == head:
 
             for i in reversed(range(len(head.branches))):
@@ -1086,11 +1089,11 @@ class WorkBench(object):
     def _merge_repo_heads(self, existing_head, new_head, existing_commits=None):
 
         log.debug('_merge_repo_heads: merging the state of repository heads!')
-        log.debug('existing repository head:\n' + existing_head.Debug())
-        log.debug('new head:\n' + new_head.Debug())
+        log.debug('existing repository head:\n%s', ion.util.ionlog.lazy(existing_head.Debug))
+        log.debug('new head:\n%s', ion.util.ionlog.lazy(new_head.Debug))
         repo = existing_head.Repository
-        log.debug('Number of commits: %d' % len(repo._commit_index))
-        log.debug('Number of hashed objects: %d' % len(repo.index_hash))
+        log.debug('Number of commits: %d', len(repo._commit_index))
+        log.debug('Number of hashed objects: %d', len(repo.index_hash))
 
 
         # examine all the branches in new and merge them into existing
@@ -1181,7 +1184,7 @@ class WorkBench(object):
                             log.debug('Commit history is truncated... found oldest commit')
                             break
 
-                    log.warn('REPO (%s) Branch Syncing: newest existing commit date - %s, oldest new commit date - %s, new commit ref count - %d ' % (repo.repository_key, existing_cref.date, pref.date, cref_count))
+                    log.warn('REPO (%s) Branch Syncing: newest existing commit date - %s, oldest new commit date - %s, new commit ref count - %d ', repo.repository_key, existing_cref.date, pref.date, cref_count)
 
                     if pref.date > existing_cref.date and cref_count > 10:
                         # If all these new commits - and there better be at least 10 of them... are newer than the newest
@@ -1235,7 +1238,7 @@ class WorkBench(object):
             loaded = {}
 
 
-        log.info('_load_commits - Key: %s' % sha1_to_hex(link.key))
+        log.info('_load_commits - Key: %s', sha1_to_hex(link.key))
         repo = link.Repository
 
         links_to_get = set()
@@ -1246,7 +1249,7 @@ class WorkBench(object):
             # grab an item from the set
             curlink = links_to_get.pop()
 
-            log.debug('_load_commits - Key: %s, links_to_get size: %d' % (sha1_to_hex(curlink.key), len(links_to_get)))
+            log.debug('_load_commits - Key: %s, links_to_get size: %d', sha1_to_hex(curlink.key), len(links_to_get))
 
             try:
                 cref = repo.get_linked_object(curlink)
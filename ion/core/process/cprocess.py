@@ -134,7 +134,7 @@ class ContainerProcess(BasicLifecycleObject):
 
     def on_error(self, cause= None, *args, **kwargs):
         if cause:
-            log.error("Process error: %s" % cause)
+            log.error("Process error: %s", cause)
             pass
         else:
             raise RuntimeError("Illegal container process state change")
@@ -9,11 +9,16 @@
 import types
 
 from twisted.internet import defer
+from twisted.python import failure
 
 import ion.util.ionlog
 log = ion.util.ionlog.getLogger(__name__)
 
 from ion.core import ioninit
+CONF = ioninit.config(__name__)
+
+# Max number of child processes spawned at the same time by spawn_processes
+CF_spawn_concurrency = CONF.getValue('spawn_concurrency', 1)
 from ion.core.process import process
 from ion.core.process.process import Process
 from ion.core.process.process import IProcess, ProcessDesc, ProcessInstantiator
@@ -64,17 +69,34 @@ class ProcessManager(BasicLifecycleObject):
     # API
 
     @defer.inlineCallbacks
-    def spawn_processes(self, procs, sup=None):
+    def spawn_processes(self, procs, sup=None, concurrency=None):
         """
         Spawns a list of processes.
-        @param procs  list of processes (as description dict) to start up
+        @param procs  list of processes (as description dict) to start up. A
+            description can list the names of earlier processes in the list
+            that must be spawned before it, as 'dependencies'
         @param sup  spawned Process instance acting as supervisor
+        @param concurrency  max number of processes spawned at the same time;
+            the default of 1 (config 'spawn_concurrency') spawns them in order
         @retval Deferred -> Process instance
         """
+        if concurrency is None:
+            concurrency = CF_spawn_concurrency
+
         children = []
+        # Names of the earlier processes each process depends on
+        dependencies = []
+        all_names = set([procDef.get('name') for procDef in procs])
+        names = set()
         for procDef in procs:
             child = ProcessDesc(**procDef)
+            deps = procDef.get('dependencies', [])
+            for dep in deps:
+                if dep in all_names and not dep in names:
+                    raise RuntimeError("Process %s depends on %s, which is spawned after it" % (child.proc_name, dep))
             children.append(child)
+            dependencies.append([dep for dep in deps if dep in names])
+            names.add(child.proc_name)
 
         if sup == None:
             sup = yield self.create_supervisor()
@@ -82,14 +104,61 @@ class ProcessManager(BasicLifecycleObject):
         assert IProcess.providedBy(sup), "Parent must provide IProcess"
         assert sup._get_state() in ("READY", "ACTIVE"), "Illegal parent process state"
 
-        log.info("Spawning %s child processes for sup=[%s]" % (len(children), sup.proc_name))
-        for child in children:
-            child_id = yield sup.spawn_child(child)
+        log.info("Spawning %s child processes for sup=[%s]", len(children), sup.proc_name)
+        if concurrency > 1 and len(children) > 1:
+            yield self._spawn_children_concurrently(sup, children, dependencies, concurrency)
+        else:
+            for child in children:
+                child_id = yield sup.spawn_child(child)
 
         #log.debug("process_ids: "+ str(process.procRegistry.kvs))
 
         defer.returnValue(sup)
 
+    def _spawn_children_concurrently(self, sup, children, dependencies, concurrency):
+        """
+        Spawns up to concurrency children at a time. Each child waits for
+        the children named in its dependencies to be spawned first.
+        @retval Deferred, fails with the first spawn failure
+        """
+        semaphore = defer.DeferredSemaphore(concurrency)
+        spawned = {}
+
+        def observe(d):
+            # A new Deferred with the result of d, leaving d unchanged
+            observer = defer.Deferred()
+            def fire(result):
+                if isinstance(result, failure.Failure):
+                    observer.errback(result)
+                else:
+                    observer.callback(result)
+                return result
+            d.addBoth(fire)
+            return observer
+
+        @defer.inlineCallbacks
+        def spawn_child(child, deps):
+            if deps:
+                try:
+                    yield defer.DeferredList([observe(spawned[dep]) for dep in deps],
+                                             fireOnOneErrback=True, consumeErrors=True)
+                except defer.FirstError, fe:
+                    log.error("Not spawning %s, a dependency failed to spawn", child.proc_name)
+                    fe.subFailure.raiseException()
+
+            child_id = yield semaphore.run(sup.spawn_child, child)
+            defer.returnValue(child_id)
+
+        dl = []
+        for child, deps in zip(children, dependencies):
+            d = spawn_child(child, deps)
+            spawned[child.proc_name] = d
+            dl.append(d)
+
+        d = defer.DeferredList(dl, fireOnOneErrback=True, consumeErrors=True)
+        d.addErrback(lambda f: f.value.subFailure)
+        return d
+
     @defer.inlineCallbacks
     def spawn_process(self, procdesc, parent, node=None, activate=True):
         """
@@ -112,7 +181,7 @@ class ProcessManager(BasicLifecycleObject):
         spawnargs['sup-id'] = parent.id.full
         spawnargs['sys-name'] = ioninit.sys_name
 
-        log.info('Spawning name=%s on node=%s' % (procdesc.proc_name, procdesc.proc_node))
+        log.info('Spawning name=%s on node=%s', procdesc.proc_name, procdesc.proc_node)
         if node:
             raise RuntimeError('Cannot spawn %s on node=%s (yet)' % (
                     procdesc.proc_class, procdesc.proc_node))
@@ -135,11 +204,9 @@ class ProcessManager(BasicLifecycleObject):
         if spawnargs == None:
             spawnargs = {}
 
-        # Importing process module
-        proc_mod = pu.get_module(module)
-
+        # The process module is imported once, see ProcessInstantiator
         process = yield ProcessInstantiator.spawn_from_module(
-                module=proc_mod,
+                module=module,
                 spawnargs=spawnargs,
                 container=self.container,
                 activate=activate)
@@ -148,6 +148,8 @@ class Process(BasicLifecycleObject):
         # Create a backend receiver for outgoing RPC process interactions.
         # Needed to avoid deadlock when processing incoming messages
         # because only one message can be consumed before ACK.
+        # Its queue and consumer are only created on the first send, see
+        # _attach_backend_receiver
         self.backend_id = Id(self.id.local+"b", self.id.container)
         self.backend_receiver = ProcessReceiver(
                                     label=self.proc_name,
@@ -161,6 +163,8 @@ class Process(BasicLifecycleObject):
         self.receivers = {}
         self.add_receiver(self.receiver)
         self.add_receiver(self.backend_receiver)
+        # Serializes concurrent first sends while the backend attaches
+        self._backend_lock = defer.DeferredLock()
 
         # Delegate class to manage all conversations of this process
         self.conv_manager = ProcessConversationManager(self)
@@ -200,8 +204,8 @@ class Process(BasicLifecycleObject):
 
         self.conversation_context = ConversationContext()
 
-        log.debug("NEW Process instance [%s]: id=%s, sup-id=%s, sys-name=%s" % (
-                self.proc_name, self.id, self.proc_supid, self.sys_name))
+        log.debug("NEW Process instance [%s]: id=%s, sup-id=%s, sys-name=%s",
+                self.proc_name, self.id, self.proc_supid, self.sys_name)
 
     def _sanitize_opname(self, opname):
         if opname.startswith('op_'): opname = opname[3:]
@@ -267,16 +271,13 @@ class Process(BasicLifecycleObject):
         LifeCycleObject callback for the initialization "spawn" of the process.
         @retval Deferred for the Id of the process (self.id)
         """
-        assert not self.backend_receiver.consumer, "Process already initialized"
-        log.debug('Process [%s] id=%s initialize()' % (self.proc_name, self.id))
+        assert not self.receiver.consumer, "Process already initialized"
+        log.debug('Process [%s] id=%s initialize()', self.proc_name, self.id)
 
-        # Create queue only for process receiver
+        # Create queue only for process receiver. The backend receiver is
+        # attached on the first outgoing send
         yield self.receiver.initialize()
 
-        # Create queue and consumer for backend receiver
-        yield self.backend_receiver.initialize()
-        yield self.backend_receiver.activate()
-
         # advance the registered objects as if this process has already transitioned to the READY state,
         # which it will do after this on_initialize method completes
         yield self._advance_life_cycle_objects(BasicStates.S_READY)
@@ -288,9 +289,9 @@ class Process(BasicLifecycleObject):
         try:
             #import pdb; pdb.set_trace()
             yield defer.maybeDeferred(self.plc_init)
-            log.info('Process [%s] id=%s: INIT OK' % (self.proc_name, self.id))
+            log.info('Process [%s] id=%s: INIT OK', self.proc_name, self.id)
         except Exception, ex:
-            log.exception('----- Process %s INIT ERROR -----' % (self.id))
+            log.exception('----- Process %s INIT ERROR -----', self.id)
             raise ex
 
         if len(self._registered_life_cycle_objects) > pre_init_lco_len:
@@ -327,7 +328,7 @@ class Process(BasicLifecycleObject):
         LifeCycleObject callback for activate
         @retval Deferred
         """
-        log.debug('Process [%s] id=%s activate()' % (self.proc_name, self.id))
+        log.debug('Process [%s] id=%s activate()', self.proc_name, self.id)
 
         # Create consumer for process receiver
         yield self.receiver.activate()
@@ -343,7 +344,7 @@ class Process(BasicLifecycleObject):
         try:
             yield defer.maybeDeferred(self.plc_activate)
         except Exception, ex:
-            log.exception('----- Process %s ACTIVATE ERROR -----' % (self.id))
+            log.exception('----- Process %s ACTIVATE ERROR -----', self.id)
             raise ex
 
         if len(self._registered_life_cycle_objects) > pre_active_lco_len:
@@ -354,7 +355,7 @@ class Process(BasicLifecycleObject):
         yield self._plcc_pub.create_and_publish_event(state=self._plcc_pub.State.ACTIVE)
 
         # last step in activation - cleanup!
-        log.debug('Process activation complete - clearing workbench:\n%s' % str(self.workbench))
+        log.debug('Process activation complete - clearing workbench:\n%s', self.workbench)
 
         self.workbench.manage_workbench_cache('Default Context')
 
@@ -365,7 +366,7 @@ class Process(BasicLifecycleObject):
         """
 
     def shutdown(self):
-        log.debug("[%s] shutdown()" % self.proc_name)
+        log.debug("[%s] shutdown()", self.proc_name)
         return self.terminate()
 
     @defer.inlineCallbacks
@@ -379,7 +380,7 @@ class Process(BasicLifecycleObject):
                 yield self.reply_ok(msg)
         except Exception, ex:
 
-            log.error('Error during op_terminate: ' + str(ex))
+            log.error('Error during op_terminate: %s', ex)
             raise ProcessError("Process %s TERMINATE ERROR" % (self.id))
             ### Let the mesg dispatcher catch the error
             #if msg != None:
@@ -400,8 +401,9 @@ class Process(BasicLifecycleObject):
         yield self.on_terminate(*args, **kwargs)
 
         # @todo There should be nothing after the terminate call
-        yield self.backend_receiver.deactivate()
-        yield self.backend_receiver._await_message_processing()
+        if self.backend_receiver._get_state() == BasicStates.S_ACTIVE:
+            yield self.backend_receiver.deactivate()
+            yield self.backend_receiver._await_message_processing()
 
     @defer.inlineCallbacks
     def on_terminate(self, msg=None, *args, **kwargs):
@@ -426,7 +428,7 @@ class Process(BasicLifecycleObject):
         yield self.shutdown_child_procs()
 
         yield defer.maybeDeferred(self.plc_terminate)
-        log.info('----- Process %s TERMINATED -----' % (self.proc_name))
+        log.info('----- Process %s TERMINATED -----', self.proc_name)
 
     def plc_terminate(self):
         """
@@ -448,7 +450,7 @@ class Process(BasicLifecycleObject):
                 log.debug("Error terminating registered LCOs, ignoring...")
 
         if cause:
-            log.error("Process error: %s" % cause)
+            log.error("Process error: %s", cause)
             pass
         else:
             raise RuntimeError("Illegal process state change")
@@ -547,7 +549,7 @@ class Process(BasicLifecycleObject):
         transitions = [BasicStates.E_INITIALIZE,    BasicStates.E_ACTIVATE,     BasicStates.E_TERMINATE]
 
         curidx = states.index(curstate)
-        log.debug("_advance_lco owning process (%s) is in state %s" % (self.id.full, curstate))
+        log.debug("_advance_lco owning process (%s) is in state %s", self.id.full, curstate)
 
         @defer.inlineCallbacks
         def helper(idx, lco):
@@ -558,12 +560,12 @@ class Process(BasicLifecycleObject):
             LCOs that happen to be later in the registered list.
             """
             lcoidx = states.index(lco._get_state())
-            log.debug("_advance_lco cur lco #%d is in state %s" % (idx, lco._get_state()))
+            log.debug("_advance_lco cur lco #%d is in state %s", idx, lco._get_state())
 
             for i in range(lcoidx, curidx):
                 input = transitions[i]
 
-                log.debug("_advance_lco cur lco #%d about to put transition %s to %s" % (idx, input, str(lco)))
+                log.debug("_advance_lco cur lco #%d about to put transition %s to %s", idx, input, lco)
                 try:
                     yield defer.maybeDeferred(lco._so_process, input)
 
@@ -571,10 +573,10 @@ class Process(BasicLifecycleObject):
                     # @TODO: should not be catching this exception.
                     # This should cause the deferred gen'd by inlineCallbacks to errback, which then gets wrapped
                     # nicely by the deferred list. It should not throw an exception in the state object?!?
-                    log.debug("Exception occured in transition! Leaving this LCO as is. Ex: %s" % str(ex))
+                    log.debug("Exception occured in transition! Leaving this LCO as is. Ex: %s", ex)
                     break
 
-                log.debug("lco #%d is now at %s" % (idx, lco._get_state()))
+                log.debug("lco #%d is now at %s", idx, lco._get_state())
 
             defer.returnValue(None)
 
@@ -607,7 +609,7 @@ class Process(BasicLifecycleObject):
                 self.context.user_id = payload.get('user-id')
                 _action = 'set user_id'
             else:
-                log.debug('[%s] receive(): payload anonymous request' % (self.proc_name))
+                log.debug('[%s] receive(): payload anonymous request', self.proc_name)
                 if self.context.get('user_id', 'Not set') == 'Not set':
                     self.context.user_id = 'ANONYMOUS'
                     _action = 'set ANONYMOUS user_id'
@@ -627,15 +629,15 @@ class Process(BasicLifecycleObject):
                     _action = _action + "/keep stashed expiry='%s'" % self.context.get('expiry')
             _post_exp = self.context.get('expiry')
 
-            log.debug("[%s] receive(): IN:user-id='%s',expiry='%s' ACTION:%s SET:user-id='%s',expiry='%s'" % (
-                self.proc_name, _pre_uid, _pre_exp, _action, _post_uid, _post_exp))
+            log.debug("[%s] receive(): IN:user-id='%s',expiry='%s' ACTION:%s SET:user-id='%s',expiry='%s'",
+                self.proc_name, _pre_uid, _pre_exp, _action, _post_uid, _post_exp)
 
             # Extract some headers and make log statement.
             fromname = payload['sender']
             if 'sender-name' in payload:
                 fromname = payload['sender-name']   # Legible sender alias
-            log.info('>>> [%s] receive(): Message from [%s] ... >>>' % (
-                     self.proc_name, fromname))
+            log.info('>>> [%s] receive(): Message from [%s] ... >>>',
+                     self.proc_name, fromname)
             convid = payload.get('conv-id', None)
             protocol = payload.get('protocol', None)
 
@@ -725,8 +727,8 @@ class Process(BasicLifecycleObject):
             # In case of an application error - do not terminate the process!
             if log.getEffectiveLevel() <= logging.INFO:    # only output all this stuff when debugging
                 log.exception("*****Non Conversation Application error in message processing*****")
-                log.error('*** Message Payload which cause the error: \n%s' % pu.pprint_to_string(payload))
-                log.error('*** Message Content: \n%s' % str(payload.get('content', '## No Content! ##')))
+                log.error('*** Message Payload which cause the error: \n%s', pu.pprint_to_string(payload))
+                log.error('*** Message Content: \n%s', payload.get('content', '## No Content! ##'))
                 log.error("*****End Non Conversation Application error in message processing*****")
 
             # @todo Should we send an err or rather reject the msg?
@@ -738,9 +740,9 @@ class Process(BasicLifecycleObject):
             # *** PROBLEM. Here the conversation is in ERROR state
 
             log.exception("*****Non Conversation Application error in message processing*****")
-            log.error('*** Message Payload which cause the error: \n%s' % pu.pprint_to_string(payload))
+            log.error('*** Message Payload which cause the error: \n%s', pu.pprint_to_string(payload))
             if log.getEffectiveLevel() <= logging.WARN:
-                log.error('*** Message Content: \n%s' % str(payload.get('content', '## No Content! ##')))
+                log.error('*** Message Content: \n%s', payload.get('content', '## No Content! ##'))
             log.error("*****End Non Conversation Application error in message processing*****")
 
             # @todo Should we send an err or rather reject the msg?
@@ -767,7 +769,7 @@ class Process(BasicLifecycleObject):
             opname = 'op_' + str(op)
             return self._dispatch_message_call(payload, msg, conv, opname)
         else:
-            log.error("Invalid message. No 'op' in header", payload)
+            log.error("Invalid message. No 'op' in header: %s", payload)
 
     @defer.inlineCallbacks
     def _dispatch_message_call(self, payload, msg, conv, opname):
@@ -799,7 +801,7 @@ class Process(BasicLifecycleObject):
         """
         The method called if operation callback handler is not existing
         """
-        log.error('Process does not define op=%s' % headers.get('op',None))
+        log.error('Process does not define op=%s', headers.get('op',None))
 
     # --- Standard conversation type support: RPC, Request
 
@@ -811,8 +813,8 @@ class Process(BasicLifecycleObject):
         rpc_conv.bind_role_local(RpcType.ROLE_INITIATOR.role_id, self)
         rpc_conv.bind_role(RpcType.ROLE_PARTICIPANT.role_id, recv)
 
-        log.debug("[%s] request(): NEW conversation type=%s as initiator -> participant=%s" % (
-                self.proc_name, rpc_conv.protocol, recv))
+        log.debug("[%s] request(): NEW conversation type=%s as initiator -> participant=%s",
+                self.proc_name, rpc_conv.protocol, recv)
 
         if headers is None:
             headers = {}
@@ -836,8 +838,8 @@ class Process(BasicLifecycleObject):
         req_conv.bind_role_local(RequestType.ROLE_INITIATOR.role_id, self)
         req_conv.bind_role(RequestType.ROLE_PARTICIPANT.role_id, receiver)
 
-        log.debug("[%s] request(): NEW conversation type=%s as initiator -> participant=%s" % (
-                self.proc_name, req_conv.protocol, receiver))
+        log.debug("[%s] request(): NEW conversation type=%s as initiator -> participant=%s",
+                self.proc_name, req_conv.protocol, receiver)
 
         if headers is None:
             headers = {}
@@ -855,6 +857,24 @@ class Process(BasicLifecycleObject):
 
     # --- Outgoing message handling
 
+    @defer.inlineCallbacks
+    def _attach_backend_receiver(self):
+        """
+        @brief Creates queue and consumer for the backend receiver, once.
+            Processes that never send out on their own do not declare it.
+        @retval Deferred
+        """
+        if self.backend_receiver.consumer is not None and not self._backend_lock.locked:
+            return
+
+        yield self._backend_lock.acquire()
+        try:
+            if self.backend_receiver.consumer is None:
+                log.debug('Process [%s] attaching backend receiver %s', self.proc_name, self.backend_id)
+                yield self.backend_receiver.attach()
+        finally:
+            self._backend_lock.release()
+
     def _blocking_send(self, recv, operation, content, headers=None, conv=None, **kwargs):
         """
         @brief Sends a message and waits for conversation message reply.
@@ -867,15 +887,15 @@ class Process(BasicLifecycleObject):
         # Timeout handling
         timeout = float(kwargs.get('timeout', CF_rpc_timeout))
         def _timeoutf():
-            log.info('Timeout on blocking send - headers: \n%s' % str(headers))
-            log.warn("Process %s RPC conv-id=%s timed out on operation - '%s' ! " % (self.proc_name,conv.conv_id, operation))
+            log.info('Timeout on blocking send - headers: \n%s', headers)
+            log.warn("Process %s RPC conv-id=%s timed out on operation - '%s' ! ", self.proc_name, conv.conv_id, operation)
             p_headers = pu.pprint_to_string(headers)
             p_content = pu.pprint_to_string(content)
 
-            log.info('Timedout Message Receive: %s' % recv)
-            log.info('Timedout Message Headers: %s' % p_headers)
-            log.info('Timedout Message Operation: %s' % operation)
-            log.info('Timedout Message Content: %s' % p_content)
+            log.info('Timedout Message Receive: %s', recv)
+            log.info('Timedout Message Headers: %s', p_headers)
+            log.info('Timedout Message Operation: %s', operation)
+            log.info('Timedout Message Content: %s', p_content)
 
             # Remove RPC. Delayed result will go to catch operation
             conv.timeout = str(pu.currenttime_ms())
@@ -924,14 +944,14 @@ class Process(BasicLifecycleObject):
 
         if not 'user-id' in msgheaders:
             msgheaders['user-id'] = self.context.get('user_id', 'ANONYMOUS')
-            log.debug('[%s] send(): set user id in msgheaders from stashed user_id [%s]' % (self.proc_name, msgheaders['user-id']))
+            log.debug('[%s] send(): set user id in msgheaders from stashed user_id [%s]', self.proc_name, msgheaders['user-id'])
         else:
-            log.debug('[%s] send(): using user id from msgheaders [%s]' % (self.proc_name, msgheaders['user-id']))
+            log.debug('[%s] send(): using user id from msgheaders [%s]', self.proc_name, msgheaders['user-id'])
         if not 'expiry' in msgheaders:
             msgheaders['expiry'] = self.context.get('expiry', '0')
-            log.debug('[%s] send(): set expiry in msgheaders from stashed expiry [%s]' % (self.proc_name, msgheaders['expiry']))
+            log.debug('[%s] send(): set expiry in msgheaders from stashed expiry [%s]', self.proc_name, msgheaders['expiry'])
         else:
-            log.debug('[%s] send(): using expiry from msgheaders [%s]' % (self.proc_name, msgheaders['expiry']))
+            log.debug('[%s] send(): using expiry from msgheaders [%s]', self.proc_name, msgheaders['expiry'])
 
         if quiet:
             msgheaders['quiet'] = True
@@ -963,6 +983,7 @@ class Process(BasicLifecycleObject):
             # FSM processed successfully
             if send_receiver is None:
                 # The default case is to send out via the backend receiver
+                yield self._attach_backend_receiver()
                 res2 = yield self.backend_receiver.send(**message)
             else:
                 # Use given receiver (e.g. primary receiver for RPC replies)
@@ -975,7 +996,7 @@ class Process(BasicLifecycleObject):
 
             res = res1
         except Exception, ex:
-            log.exception("ERROR [%s] send() in FSM - Message not sent" % self.proc_name)
+            log.exception("ERROR [%s] send() in FSM - Message not sent", self.proc_name)
             raise ex
 
         defer.returnValue(res)
@@ -996,7 +1017,7 @@ class Process(BasicLifecycleObject):
         msgheaders['protocol'] = req_msg['protocol']
 
         if recv is None:
-            log.error('No reply-to given for message '+str(msg))
+            log.error('No reply-to given for message %s', msg)
         else:
             msgheaders['conv-id'] = req_msg.get('conv-id','')
             msgheaders['conv-seq'] = int(req_msg.get('conv-seq',0)) + 1
@@ -1152,13 +1173,13 @@ class Process(BasicLifecycleObject):
     @defer.inlineCallbacks
     def shutdown_child_procs(self):
         if len(self.child_procs) > 0:
-            log.info("Shutting down %s child processes" % (len(self.child_procs)))
+            log.info("Shutting down %s child processes", len(self.child_procs))
         while len(self.child_procs) > 0:
             child = self.child_procs.pop()
             try:
                 res = yield self.shutdown_child(child)
             except Exception, ex:
-                log.exception("Error terminating child %s" % child.proc_id)
+                log.exception("Error terminating child %s", child.proc_id)
 
 
     def shutdown_child(self, childproc):
@@ -1327,7 +1348,7 @@ class ProcessDesc(BasicLifecycleObject):
                 node=self.proc_node,
                 activate=activate)
 
-        log.info("Process %s ID: %s" % (self.proc_class, self.proc_id))
+        log.info("Process %s ID: %s", self.proc_class, self.proc_id)
 
         defer.returnValue(self.proc_id)
 
@@ -1353,7 +1374,7 @@ class ProcessDesc(BasicLifecycleObject):
 
     def on_error(self, cause=None, *args, **kwargs):
         if cause:
-            log.error("ProcessDesc error: %s" % cause)
+            log.error("ProcessDesc error: %s", cause)
             pass
         else:
             raise RuntimeError("Illegal state change for ProcessDesc")
@@ -1421,6 +1442,10 @@ class ProcessInstantiator(object):
 
     idcount = 0
 
+    # Resolved process modules. Maps module name to tuple
+    # (module, process class, factory)
+    module_cache = {}
+
     @classmethod
     def create_process_id(cls, container=None):
         container = container or ioninit.container_instance
@@ -1432,13 +1457,57 @@ class ProcessInstantiator(object):
             containerid = "TEST-CONTAINER-ID"
         return Id(cls.idcount, containerid)
 
+    @classmethod
+    def get_module_entry(cls, module):
+        """
+        @brief Resolves a process module once and caches the result.
+        @param module A module name or module (<type 'module'>) with a
+                ProcessFactory factory
+        @retval tuple (module, process class, factory)
+        """
+        if isinstance(module, basestring):
+            module_name = module
+            module = None
+        else:
+            module_name = module.__name__
+
+        entry = cls.module_cache.get(module_name)
+        if entry is not None and (module is None or entry[0] is module):
+            return entry
+
+        if module is None:
+            module = pu.get_module(module_name)
+
+        if not hasattr(module, 'factory'):
+            raise RuntimeError("Must define factory in process module to spawn")
+
+        if not IProcessFactory.providedBy(module.factory):
+            raise RuntimeError("Process model factory must provide IProcessFactory")
+
+        entry = (module, getattr(module.factory, 'process_class', None), module.factory)
+        cls.module_cache[module_name] = entry
+        return entry
+
+    @classmethod
+    def invalidate_module(cls, module_name=None):
+        """
+        @brief Removes a resolved process module from the cache, or all of
+                them. Call after reloading process code.
+        @param module_name A module name, or None for all modules
+        """
+        if module_name is None:
+            cls.module_cache.clear()
+        else:
+            cls.module_cache.pop(module_name, None)
+
     @classmethod
     @defer.inlineCallbacks
     def spawn_from_module(cls, module, space=None, spawnargs=None, container=None, activate=True):
         """
         @brief Factory method to spawn a Process instance from a Python module.
                 By default, spawn includes an activate
-        @param module A module (<type 'module'>) with a ProcessFactory factory
+        @param module A module name or module (<type 'module'>) with a
+                ProcessFactory factory
         @param space MessageSpace instance
         @param spawnargs argument dict given to the factory on spawn
         @retval Deferred which fires with the IProcess instance
@@ -1446,16 +1515,12 @@ class ProcessInstantiator(object):
         spawnargs = spawnargs or {}
         container = container or ioninit.container_instance
 
-        if not hasattr(module, 'factory'):
-            raise RuntimeError("Must define factory in process module to spawn")
-
-        if not IProcessFactory.providedBy(module.factory):
-            raise RuntimeError("Process model factory must provide IProcessFactory")
+        (module, process_class, factory) = cls.get_module_entry(module)
 
         procid = ProcessInstantiator.create_process_id(container)
         spawnargs['proc-id'] = procid.full
 
-        process = yield defer.maybeDeferred(module.factory.build, spawnargs)
+        process = yield defer.maybeDeferred(factory.build, spawnargs)
         if not IProcess.providedBy(process):
             raise RuntimeError("ProcessFactory returned non-IProcess instance")
 
@@ -71,7 +71,7 @@ class ServiceProcess(Process):
         try:
             yield defer.maybeDeferred(self.slc_init)
         except Exception, ex:
-            log.exception('----- Service %s process %s INIT ERROR -----' % (self.svc_name, self.id))
+            log.exception('----- Service %s process %s INIT ERROR -----', self.svc_name, self.id)
             raise ex
 
         # Step 2: Init service name receiver (declare queue)
@@ -91,12 +91,12 @@ class ServiceProcess(Process):
         try:
             yield defer.maybeDeferred(self.slc_activate)
         except Exception, ex:
-            log.exception('----- Service %s process %s ACTIVATE ERROR -----' % (self.svc_name, self.id))
+            log.exception('----- Service %s process %s ACTIVATE ERROR -----', self.svc_name, self.id)
             raise ex
 
         # Step 2: Activate service name receiver (activate consumer)
         yield self.svc_receiver.activate()
-        log.info('Service process bound to name=%s' % (self.svc_receiver.xname))
+        log.info('Service process bound to name=%s', self.svc_receiver.xname)
 
     def slc_activate(self):
         """
@@ -110,13 +110,13 @@ class ServiceProcess(Process):
     def plc_deactivate(self):
         # Step 1: Activate service name receiver (deactivate consumer)
         yield self.svc_receiver.deactivate()
-        log.info('Service process detached from name=%s' % (self.svc_receiver.xname))
+        log.info('Service process detached from name=%s', self.svc_receiver.xname)
 
         # Step 2: Service deactivate callback
         try:
             yield defer.maybeDeferred(self.slc_deactivate)
         except Exception, ex:
-            log.exception('----- Service %s process %s DEACTIVATE ERROR -----' % (self.svc_name, self.id))
+            log.exception('----- Service %s process %s DEACTIVATE ERROR -----', self.svc_name, self.id)
             raise ex
 
     def slc_deactivate(self):
@@ -133,7 +133,7 @@ class ServiceProcess(Process):
             yield defer.maybeDeferred(self.slc_deactivate)
             yield defer.maybeDeferred(self.slc_terminate)
         except Exception, ex:
-            log.exception('----- Service %s process %s TERMINATE ERROR -----' % (self.svc_name, self.id))
+            log.exception('----- Service %s process %s TERMINATE ERROR -----', self.svc_name, self.id)
             raise ex
 
         # These appear to be left over from a previous verison of the code
@@ -156,7 +156,7 @@ class ServiceProcess(Process):
         @param kwargs keyword attributes for service. Common ones must be present.
         @retval a dict with service attributes
         """
-        log.debug("Service-declare: %s" % (kwargs))
+        log.debug("Service-declare: %s", kwargs)
         return kwargs
 
 factory = ProcessFactory(ServiceProcess)
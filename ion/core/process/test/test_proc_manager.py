@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""
+@file ion/core/process/test/test_proc_manager.py
+@brief Test cases for spawning process lists with the ProcessManager
+"""
+
+import ion.util.ionlog
+log = ion.util.ionlog.getLogger(__name__)
+
+from twisted.internet import defer
+
+from ion.core import bootstrap
+from ion.core.process.process import Process, ProcessFactory
+from ion.test.iontest import IonTestCase
+import ion.util.procutils as pu
+
+# Time each test process takes in plc_init
+SLEEP = 1.0
+
+
+class ProcessManagerTest(IonTestCase):
+    """
+    Tests serial and concurrent spawning of child processes
+    """
+
+    @defer.inlineCallbacks
+    def setUp(self):
+        self.timeout = 30
+        SleepProcess.events = []
+        yield self._start_container()
+
+    @defer.inlineCallbacks
+    def tearDown(self):
+        yield self._shutdown_processes()
+        yield self._stop_container()
+
+    def _procs(self):
+        # sleep_a -> sleep_b is the slowest dependency chain
+        procs = []
+        for name, deps in (('sleep_a', []), ('sleep_b', ['sleep_a']), ('sleep_c', []), ('sleep_d', [])):
+            procs.append({'name':name,
+                          'module':'ion.core.process.test.test_proc_manager',
+                          'class':'SleepProcess',
+                          'spawnargs':{'delay':SLEEP},
+                          'dependencies':deps})
+        return procs
+
+    def _event_index(self, name, event):
+        try:
+            return SleepProcess.events.index((name, event))
+        except ValueError:
+            self.fail('No %s event for %s' % (event, name))
+
+    def _max_running(self):
+        # The most processes initializing at the same time
+        running = max_running = 0
+        for (proc_name, proc_event) in SleepProcess.events:
+            if proc_event == 'start':
+                running += 1
+                max_running = max(running, max_running)
+            else:
+                running -= 1
+        return max_running
+
+    @defer.inlineCallbacks
+    def test_spawn_serial(self):
+        yield self._spawn_processes(self._procs())
+
+        self.assertEqual(len(self.test_sup.child_procs), 4)
+        self.assertEqual(SleepProcess.events,
+                         [('sleep_a', 'start'), ('sleep_a', 'done'),
+                          ('sleep_b', 'start'), ('sleep_b', 'done'),
+                          ('sleep_c', 'start'), ('sleep_c', 'done'),
+                          ('sleep_d', 'start'), ('sleep_d', 'done')])
+
+    @defer.inlineCallbacks
+    def test_spawn_concurrent(self):
+        yield bootstrap.spawn_processes(self._procs(), self.test_sup, concurrency=4)
+
+        self.assertEqual(len(self.test_sup.child_procs), 4)
+
+        # The processes without dependencies start together
+        a_done = self._event_index('sleep_a', 'done')
+        for name in ('sleep_c', 'sleep_d'):
+            self.assertTrue(self._event_index(name, 'start') < a_done, SleepProcess.events)
+        self.assertEqual(self._max_running(), 3, SleepProcess.events)
+
+        # Dependencies are spawned first
+        self.assertTrue(self._event_index('sleep_b', 'start') > a_done, SleepProcess.events)
+
+    @defer.inlineCallbacks
+    def test_spawn_concurrency_limit(self):
+        procs = self._procs()
+        for procDef in procs:
+            procDef['dependencies'] = []
+
+        yield bootstrap.spawn_processes(procs, self.test_sup, concurrency=2)
+
+        self.assertEqual(len(self.test_sup.child_procs), 4)
+        self.assertEqual(self._max_running(), 2, SleepProcess.events)
+
+    @defer.inlineCallbacks
+    def test_dependency_order(self):
+        procs = self._procs()
+        procs.reverse()
+        yield self.failUnlessFailure(bootstrap.spawn_processes(procs, self.test_sup, concurrency=4), RuntimeError)
+        self.assertEqual(len(self.test_sup.child_procs), 0)
+
+
+class SleepProcess(Process):
+    """
+    Test process which takes a while to initialize
+    """
+    events = []
+
+    @defer.inlineCallbacks
+    def plc_init(self):
+        SleepProcess.events.append((self.proc_name, 'start'))
+        yield pu.asleep(self.spawn_args.get('delay', SLEEP))
+        SleepProcess.events.append((self.proc_name, 'done'))
+
+factory = ProcessFactory(SleepProcess)
@@ -19,7 +19,7 @@ from twisted.internet import defer
 
 
 from ion.core.process import service_process
-from ion.core.process.process import Process, ProcessDesc, ProcessFactory, ProcessError
+from ion.core.process.process import Process, ProcessDesc, ProcessFactory, ProcessError, ProcessInstantiator
 from ion.core.cc.container import Container
 from ion.core.exception import ReceivedContainerError, ReceivedApplicationError, ApplicationError, ReceivedError
 from ion.core.messaging.receiver import Receiver, WorkerReceiver
@@ -274,6 +274,69 @@ class ProcessTest(IonTestCase):
         except defer.TimeoutError, te:
             log.info('Timeout received')
 
+    @defer.inlineCallbacks
+    def test_module_cache(self):
+        modname = 'ion.core.process.test.test_process'
+        ProcessInstantiator.invalidate_module(modname)
+        self.assertFalse(modname in ProcessInstantiator.module_cache)
+
+        child1 = ProcessDesc(name='echo', module=modname)
+        pid1 = yield self.test_sup.spawn_child(child1)
+        (module, process_class, factory) = ProcessInstantiator.module_cache[modname]
+        self.assertEqual(module.__name__, modname)
+        self.assertEqual(process_class, EchoProcess)
+
+        # Repeated spawns reuse the resolved module
+        child2 = ProcessDesc(name='echo', module=modname)
+        pid2 = yield self.test_sup.spawn_child(child2)
+        self.assertTrue(ProcessInstantiator.module_cache[modname][2] is factory)
+
+        ProcessInstantiator.invalidate_module(modname)
+        self.assertFalse(modname in ProcessInstantiator.module_cache)
+
+        (cont,hdrs,msg) = yield self.test_sup.rpc_send(pid2,'echo','content123')
+        self.assertEqual(cont, 'content123')
+
+    @defer.inlineCallbacks
+    def test_lazy_backend_receiver(self):
+        # Count the queues declared through the exchange manager
+        exchange_manager = ion.core.ioninit.container_instance.exchange_manager
+        new_consumer = exchange_manager.new_consumer
+        declared = []
+        def counting_new_consumer(name_config):
+            declared.append(name_config['queue'])
+            return new_consumer(name_config)
+        self.patch(exchange_manager, 'new_consumer', counting_new_consumer)
+
+        p1 = EchoProcess()
+        yield p1.spawn()
+        self.assertEqual(declared, [p1.receiver.xname])
+        self.assertEqual(p1.backend_receiver.consumer, None)
+
+        # Receiving and replying does not need the backend receiver
+        (cont,hdrs,msg) = yield self.test_sup.rpc_send(p1.id, 'echo', 'content123')
+        self.assertEqual(cont, 'content123')
+        self.assertEqual(declared.count(p1.backend_receiver.xname), 0)
+
+        # Concurrent first sends share one backend queue
+        res = yield defer.DeferredList([p1.rpc_send(p1.id, 'echo', 'content%d' % i) for i in range(3)],
+                                       fireOnOneErrback=True)
+        self.assertEqual([r[1][0] for r in res], ['content0', 'content1', 'content2'])
+        self.assertEqual(declared.count(p1.backend_receiver.xname), 1)
+
+        yield p1.rpc_send(p1.id, 'echo', 'content123')
+        self.assertEqual(declared.count(p1.backend_receiver.xname), 1)
+
+        yield p1.terminate()
+        self.assertEqual(p1._get_state(), "TERMINATED")
+
+        # A process that never sends terminates without a backend receiver
+        p2 = EchoProcess()
+        yield p2.spawn()
+        yield p2.terminate()
+        self.assertEqual(p2._get_state(), "TERMINATED")
+        self.assertEqual(declared.count(p2.backend_receiver.xname), 0)
+
     @defer.inlineCallbacks
     def test_register_lco(self):
         """
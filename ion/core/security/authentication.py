@@ -8,6 +8,7 @@
 """
 
 import binascii
+import hashlib
 import urllib
 import os
 import sys
@@ -21,9 +22,14 @@ from M2Crypto import EVP, X509, BIO, SMIME, RSA
 from twisted.internet import defer
 
 import ion.util.ionlog
+from ion.core import ioninit
+from ion.util.cache import LRUDict
 
 log = ion.util.ionlog.getLogger(__name__)
 
+CONF = ioninit.config(__name__)
+CF_certificate_cache_size = CONF.getValue('certificate_cache_size', 1000)
+
 #XXX @note What is this?
 sys.path.insert(0, "build/lib.linux-i686-2.4/")
 
@@ -31,6 +37,110 @@ sys.path.insert(0, "build/lib.linux-i686-2.4/")
 BASEPATH = os.path.realpath(".")
 CERTIFICATE_PATH = BASEPATH + '/res/certificates/'
 
+
+def _decode_x509(x509):
+    """
+    Return a Dict of all known attributes for a loaded certificate
+    """
+    attributes = {}
+
+    attributes['subject_items'] = {}
+    attributes['subject'] = str(x509.get_subject())
+    for item in attributes['subject'].split('/'):
+        try:
+            key,value = item.split('=')
+            attributes['subject_items'][key] = urllib.unquote(value)
+        except:
+            """
+            """
+
+    attributes['issuer_items'] = {}
+    attributes['issuer'] = str(x509.get_issuer())
+    for item in attributes['issuer'].split('/'):
+        try:
+            key,value = item.split('=')
+            attributes['issuer_items'][key] = urllib.unquote(value)
+        except:
+            """
+            """
+
+    attributes['not_valid_before'] = str(x509.get_not_before())
+    attributes['not_valid_after'] = str(x509.get_not_after())
+    attributes['ext_count'] = str(x509.get_ext_count())
+    attributes['fingerprint'] = str(x509.get_fingerprint())
+    attributes['text'] = str(x509.as_text())
+    attributes['serial_number'] = str(x509.get_serial_number())
+    attributes['version'] = str(x509.get_version())
+
+    return attributes
+
+
+def _certificate_time(value):
+    """
+    Seconds since the epoch for a certificate time like 'Nov 19 10:30:06 2010 GMT'
+    """
+    return calendar.timegm(time.strptime(value, "%b %d %H:%M:%S %Y %Z"))
+
+
+class CertificateCache(object):
+    """
+    Bounded cache of loaded and decoded x509 certificates, keyed by the SHA1
+    of the PEM text. An entry expires at the certificate's notAfter time, so
+    expired certificates are loaded again on every use. The least recently
+    used entry is dropped when the cache is full.
+    """
+
+    def __init__(self, max_size=CF_certificate_cache_size, clock=time.time):
+        self.max_size = max_size
+        self.clock = clock
+        # sha1 -> (not after seconds, x509, attributes)
+        self._entries = LRUDict(max_size)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _get_entry(self, certificate):
+        key = hashlib.sha1(certificate).digest()
+        now = self.clock()
+
+        # Getting an entry makes it the most recently used
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry[0]:
+                return entry
+            del self._entries[key]
+
+        x509 = X509.load_cert_string(certificate, format=1)
+        attributes = _decode_x509(x509)
+        entry = (_certificate_time(attributes['not_valid_after']), x509, attributes)
+
+        if now < entry[0]:
+            # The least recently used entry is dropped when the cache is full
+            self._entries[key] = entry
+        return entry
+
+    def get_x509(self, certificate):
+        """
+        Return the loaded X509 object for a PEM certificate
+        """
+        return self._get_entry(certificate)[1]
+
+    def decode(self, certificate):
+        """
+        Return a copy of the attributes of a PEM certificate, see decode_certificate
+        """
+        attributes = dict(self._get_entry(certificate)[2])
+        attributes['subject_items'] = dict(attributes['subject_items'])
+        attributes['issuer_items'] = dict(attributes['issuer_items'])
+        return attributes
+
+# Shared by all Authentication instances
+certificate_cache = CertificateCache()
+
+
 class Authentication(object):
     """
     routines for working with crypto (x509 certificates and private_keys)
@@ -63,7 +173,7 @@ class Authentication(object):
         """
         This verifies that the message and the signature are indeed signed by the certificate
         """
-        x509 = X509.load_cert_string(certificate)
+        x509 = certificate_cache.get_x509(certificate)
         pubkey = x509.get_pubkey()
         pubkey.verify_init()
         pubkey.verify_update(message)
@@ -142,38 +252,7 @@ class Authentication(object):
         """
         Return a Dict of all known attributes for the certificate
         """
-        attributes = {}
-        x509 = X509.load_cert_string(certificate, format=1)
-        
-        attributes['subject_items'] = {}
-        attributes['subject'] = str(x509.get_subject())
-        for item in attributes['subject'].split('/'):
-            try:
-                key,value = item.split('=')
-                attributes['subject_items'][key] = urllib.unquote(value)
-            except:
-                """
-                """
-        
-        attributes['issuer_items'] = {}
-        attributes['issuer'] = str(x509.get_issuer())
-        for item in attributes['issuer'].split('/'):
-            try:
-                key,value = item.split('=')
-                attributes['issuer_items'][key] = urllib.unquote(value)
-            except:
-                """
-                """
-        
-        attributes['not_valid_before'] = str(x509.get_not_before())
-        attributes['not_valid_after'] = str(x509.get_not_after())
-        attributes['ext_count'] = str(x509.get_ext_count())
-        attributes['fingerprint'] = str(x509.get_fingerprint())
-        attributes['text'] = str(x509.as_text())
-        attributes['serial_number'] = str(x509.get_serial_number())
-        attributes['version'] = str(x509.get_version())
-        
-        return attributes
+        return certificate_cache.decode(certificate)
 
     def is_certificate_descended_from(self, user_cert, ca_file_name):
         """
@@ -170,3 +170,54 @@ c2bPOQRAYZyD2o+/MHBDsz7RWZJoZiI+SJJuE4wphGUsEbI2Ger1QW9135jKp6BsY2qZ
         decrypted_message = auth.private_decrypt_hex(pub_enc, self.user.rsa_private_key)
         self.assertEqual(decrypted_message, message)
 
+
+    def test_decode_certificate(self):
+        auth = authentication.Authentication()
+        cert_info = auth.decode_certificate(self.user.certificate)
+        self.assertEqual(cert_info['subject'], self.user.subject)
+        self.assertEqual(cert_info['subject_items']['O'], 'ProtectNetwork')
+        self.assertEqual(cert_info['not_valid_after'], 'Nov 19 10:30:06 2010 GMT')
+
+    def test_certificate_cache(self):
+        # The test certificate is valid from Nov 18 22:25:06 2010 to Nov 19 10:30:06 2010
+        now = [authentication._certificate_time('Nov 19 00:00:00 2010 GMT')]
+        cache = authentication.CertificateCache(max_size=1, clock=lambda: now[0])
+
+        loaded = []
+        load_cert_string = authentication.X509.load_cert_string
+        def counting_load_cert_string(*args, **kwargs):
+            loaded.append(args[0])
+            return load_cert_string(*args, **kwargs)
+        self.patch(authentication.X509, 'load_cert_string', counting_load_cert_string)
+
+        cert_info = cache.decode(self.user.certificate)
+        self.assertEqual(cert_info['subject'], self.user.subject)
+        self.assertEqual(len(loaded), 1)
+
+        # Callers get their own copy
+        cert_info['subject_items']['O'] = 'changed'
+        self.assertEqual(cache.decode(self.user.certificate)['subject_items']['O'], 'ProtectNetwork')
+        self.assertEqual(cache.get_x509(self.user.certificate).get_serial_number(), 1280)
+        self.assertEqual(len(loaded), 1)
+
+        # Expired at notAfter
+        now[0] = authentication._certificate_time('Nov 19 10:30:06 2010 GMT')
+        self.assertEqual(cache.decode(self.user.certificate)['subject'], self.user.subject)
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(len(cache), 0)
+
+        cache.decode(self.user.certificate)
+        self.assertEqual(len(loaded), 3)
+
+    def test_certificate_cache_size(self):
+        now = [authentication._certificate_time('Nov 19 00:00:00 2010 GMT')]
+        cache = authentication.CertificateCache(max_size=1, clock=lambda: now[0])
+
+        # Equivalent PEM text with a trailing newline
+        other_certificate = self.user.certificate + '\n'
+        cache.decode(self.user.certificate)
+        cache.decode(other_certificate)
+        self.assertEqual(len(cache), 1)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
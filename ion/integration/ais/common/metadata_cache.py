@@ -7,17 +7,29 @@
 is just an in-memory cache (non-persistent); it uses a dictionary of
 dictionaries (multi-dimensional dictionary).  The rows are dictionaries of
 either data set metadata for data source metadata; they are indexed by the
-resourceID.
+resourceID.  The metadata can also be written to a snapshot file, keyed by
+the head commits of the resources, so that a restarted cache only needs to
+read the resources that changed.
 """
 
 import ion.util.ionlog
 log = ion.util.ionlog.getLogger(__name__)
 import logging
+import os
+import stat
+import tempfile
+try:
+    import json
+except:
+    import simplejson as json
 from twisted.internet import defer
 
 from decimal import Decimal
 
+from ion.core import ioninit
 from ion.core.object import object_utils
+from ion.core.object.object_utils import sha1_to_hex
+from ion.core.object.workbench import WorkBenchError
 from ion.core.messaging.message_client import MessageClient
 
 from ion.services.coi.resource_registry.resource_client import ResourceClient, ResourceClientError
@@ -31,6 +43,20 @@ from ion.services.coi.datastore_bootstrap.ion_preload_config import TYPE_OF_ID,
 
 from ion.integration.ais.common.ais_utils import AIS_Mixin
 
+CONF = ioninit.config(__name__)
+
+#
+# File for the metadata snapshot; None (the default) disables the snapshot.
+# The directory of the file must be owned by the user running the service
+# and must not be writable by others.
+#
+CF_snapshot_file = CONF.getValue('snapshot_file', None)
+
+#
+# Version of the snapshot format; a snapshot with a different version is
+# ignored.  Bump when the metadata dictionaries change.
+#
+SNAPSHOT_VERSION = 2
 
 #
 # Common Metadata Constants
@@ -77,6 +103,11 @@ UPDATE_INTERVAL_SECONDS = 'update_interval_seconds'
 VISUALIZATION_URL = 'visualization_url'
 VISIBILITY = 'visibility'
 
+#
+# Metadata kept as Decimal; written to the snapshot as strings
+#
+DECIMAL_KEYS = frozenset([LAT_MIN, LAT_MAX, LON_MIN, LON_MAX, VERT_MIN, VERT_MAX])
+
 
 class MetadataCache(AIS_Mixin):
     """
@@ -85,7 +116,7 @@ class MetadataCache(AIS_Mixin):
     Most of the other AIS workers use an instance of the AIS worker process which is a proper mixin
     """
     
-    def __init__(self, ais):
+    def __init__(self, ais, snapshotFile=None):
         log.info('MetadataCache.__init__()')
 
         self.mc = MessageClient(proc = ais)
@@ -98,6 +129,23 @@ class MetadataCache(AIS_Mixin):
 
         self.__metadata = {}
 
+        #
+        # The snapshot file, and the snapshot read from it: a dictionary
+        # of {resourceID: [head, metadata]} per resource type (DSET or
+        # DSOURCE).  metadata is None for resources that are not ACTIVE.
+        # snapshotFile None uses the configured file, False disables the
+        # snapshot.
+        #
+        if snapshotFile is None:
+            snapshotFile = CF_snapshot_file
+        self.snapshotFile = self.__checkSnapshotFile(snapshotFile)
+        self.__snapshot = None
+
+        #
+        # The heads of the resources loaded by this cache: a dictionary of
+        # {resourceID: head} per resource type
+        #
+        self.__heads = {}
 
         #
         # A lock to ensure exclusive access to cache when updating
@@ -131,7 +179,8 @@ class MetadataCache(AIS_Mixin):
         """
         Find all resources of type DATASET_RESOURCE_TYPE_ID and load their
         metadata.  The private __loadDSetMetadata method will only load
-        the metadata if the data set is in the Active.
+        the metadata if the data set is in the Active.  Data sets whose head
+        has not changed since the snapshot are restored from the snapshot.
         """
 
         log.debug('loadDataSets()')
@@ -147,12 +196,17 @@ class MetadataCache(AIS_Mixin):
 
         try:
             yield self.__lockCache()
-            
+
+            self.__readSnapshot()
+            self.__heads[DSET] = {}
+
             i = 0
             while (i < numDSets):
-                yield self.__putDSetMetadata(dSetResults.idrefs[i].key)
+                yield self.__putDSetMetadata(dSetResults.idrefs[i].key, useSnapshot=True)
                 i = i + 1
 
+            self.__writeSnapshot()
+
         finally:
             self.__unlockCache()
             
@@ -164,7 +218,8 @@ class MetadataCache(AIS_Mixin):
         """
         Find all resources of type DATASOURCE_RESOURCE_TYPE_ID and load their
         metadata.  The private __loadDSetMetadata method will only load
-        the metadata if the data source is in the Active.
+        the metadata if the data source is in the Active.  Data sources whose
+        head has not changed since the snapshot are restored from the snapshot.
         """
 
         log.debug('loadDataSources()')
@@ -180,12 +235,17 @@ class MetadataCache(AIS_Mixin):
 
         try:
             yield self.__lockCache()
-            
+
+            self.__readSnapshot()
+            self.__heads[DSOURCE] = {}
+
             i = 0
             while (i < numDSources):
-                yield self.__putDSourceMetadata(dSourceResults.idrefs[i].key)
+                yield self.__putDSourceMetadata(dSourceResults.idrefs[i].key, useSnapshot=True)
                 i = i + 1
 
+            self.__writeSnapshot()
+
         finally:
             self.__unlockCache()
             
@@ -211,6 +271,11 @@ class MetadataCache(AIS_Mixin):
                         
                 metadata = self.__metadata[dSetID]
                 log.debug('Metadata keys for ' + dSetID + ': ' + str(metadata.keys()))
+                if metadata[DSET] is None:
+                    #
+                    # Restored from the snapshot: get the data set now
+                    #
+                    metadata[DSET] = yield self.__getResource(dSetID)
                 returnValue = metadata[DSET]
             except KeyError:
                 log.info('Metadata not found for datasetID: %s'  %(dSetID))
@@ -293,8 +358,10 @@ class MetadataCache(AIS_Mixin):
                 # Set the persistent flag to False
                 #
                 dSetMetadata = self.__metadata.pop(dSetID)
+                self.__heads.get(DSET, {}).pop(dSetID, None)
                 dSet = dSetMetadata[DSET]
-                dSet.Repository.persistent = False
+                if dSet is not None:
+                    dSet.Repository.persistent = False
     
 
             except KeyError:
@@ -330,6 +397,11 @@ class MetadataCache(AIS_Mixin):
     
                 metadata = self.__metadata[dSourceID]
                 log.debug('Metadata keys for ' + dSourceID + ': ' + str(metadata.keys()))
+                if metadata[DSOURCE] is None:
+                    #
+                    # Restored from the snapshot: get the data source now
+                    #
+                    metadata[DSOURCE] = yield self.__getResource(dSourceID)
                 returnValue = metadata[DSOURCE]
             except KeyError:
                 log.info('Metadata not found for datasourceID: ' + dSourceID)
@@ -413,8 +485,10 @@ class MetadataCache(AIS_Mixin):
                 # Set the persistent flag to False
                 #
                 dSourceMetadata = self.__metadata.pop(dSourceID)
+                self.__heads.get(DSOURCE, {}).pop(dSourceID, None)
                 dSource = dSourceMetadata[DSOURCE]
-                dSource.Repository.persistent = False
+                if dSource is not None:
+                    dSource.Repository.persistent = False
     
 
             except KeyError:
@@ -453,15 +527,21 @@ class MetadataCache(AIS_Mixin):
 
 
     @defer.inlineCallbacks
-    def __putDSetMetadata(self, dSetID):
+    def __putDSetMetadata(self, dSetID, useSnapshot=False):
         """
         Get the instance of the data set represented by the given resource
         ID (dSetID) and call the private __loadDSetMetadata method with the
-        data set as an argument. 
+        data set as an argument.  With useSnapshot, first try to restore the
+        metadata from the snapshot.
         """
         
         log.debug('__putDSetMetadata')
 
+        if useSnapshot:
+            restored = yield self.__restoreFromSnapshot(dSetID, DSET)
+            if restored:
+                defer.returnValue(None)
+
         try:
             dSet = yield self.rc.get_instance(dSetID)
 
@@ -469,20 +549,27 @@ class MetadataCache(AIS_Mixin):
             dSet.Repository.purge_previous_states()
 
             yield self.__loadDSetMetadata(dSet)
+            self.__heads.setdefault(DSET, {})[dSetID] = self.__getHeadKey(dSet.Repository)
         except ResourceClientError:    
             log.error('get_instance failed for data set ID %s !' %(dSetID))
 
     
     @defer.inlineCallbacks
-    def __putDSourceMetadata(self, dSourceID):
+    def __putDSourceMetadata(self, dSourceID, useSnapshot=False):
         """
         Get the instance of the data source represented by the given resource
         ID (dSourceID) and call the private __loadDSourceMetadata method with the
-        data source as an argument. 
+        data source as an argument.  With useSnapshot, first try to restore the
+        metadata from the snapshot.
         """
         
         log.debug('__putDSourceMetadata')
 
+        if useSnapshot:
+            restored = yield self.__restoreFromSnapshot(dSourceID, DSOURCE)
+            if restored:
+                defer.returnValue(None)
+
         try:
             dSource = yield self.rc.get_instance(dSourceID)
 
@@ -490,10 +577,204 @@ class MetadataCache(AIS_Mixin):
             dSource.Repository.purge_previous_states()
 
             self.__loadDSourceMetadata(dSource)
+            self.__heads.setdefault(DSOURCE, {})[dSourceID] = self.__getHeadKey(dSource.Repository)
         except ResourceClientError:    
             log.error('get_instance failed for data source ID %s !' %(dSourceID))
 
 
+    @defer.inlineCallbacks
+    def __getResource(self, resID):
+        """
+        Get the instance of a resource whose metadata was restored from the
+        snapshot, and mark it persistent like the loaded resources.
+        """
+
+        try:
+            res = yield self.rc.get_instance(resID)
+        except ResourceClientError:
+            log.error('get_instance failed for resource ID %s !', resID)
+            defer.returnValue(None)
+
+        # Since the Resource is persistent, this must be done manually!
+        res.Repository.purge_previous_states()
+        res.Repository.persistent = True
+        defer.returnValue(res)
+
+
+    def __getHeadKey(self, repo):
+        """
+        The head commits of all branches of a repository, as a sorted list
+        of hex strings
+        """
+
+        return sorted([sha1_to_hex(commit.MyId) for commit in repo.current_heads()])
+
+
+    @defer.inlineCallbacks
+    def __restoreFromSnapshot(self, resID, resType):
+        """
+        Restore the metadata of a resource from the snapshot if the snapshot
+        was taken at the current head of the resource.  Only the commits of
+        the resource are pulled to find the head, not the content.  The
+        resource object itself is got when it is first asked for.
+        Association changes do not move the head of the data set, so the
+        owner and data source of a data set are always looked up again.
+        @retval True if restored
+        """
+
+        entry = self.__snapshot.get(resType, {}).get(resID)
+        if entry is None:
+            defer.returnValue(False)
+
+        try:
+            yield self.rc._check_init()
+            yield self.rc.workbench.pull(self.rc.datastore_service, resID, get_head_content=False)
+        except WorkBenchError:
+            log.info('pull of the commits failed for resource ID %s', resID)
+            defer.returnValue(False)
+
+        head = self.__getHeadKey(self.rc.workbench.get_repository(resID))
+        (snapshotHead, metadata) = entry
+        if head != snapshotHead:
+            log.debug('Resource %s changed since snapshot', resID)
+            defer.returnValue(False)
+
+        self.__heads.setdefault(resType, {})[resID] = head
+        if metadata is not None:
+            metadata = dict([(str(key), value) for (key, value) in metadata.iteritems()])
+            for key in DECIMAL_KEYS.intersection(metadata):
+                metadata[key] = Decimal(metadata[key])
+            # TYPE is compared by identity in getDatasets/getDataSources
+            metadata[TYPE] = resType
+            metadata[resType] = None
+            if resType is DSET:
+                metadata[DSOURCE_ID] = yield self.getAssociatedSource(resID)
+                metadata[OWNER_ID] = yield self.getAssociatedOwner(resID)
+            self.__metadata[resID] = metadata
+            if resType is DSET:
+                self.numDSets += 1
+            else:
+                self.numDSources += 1
+
+        defer.returnValue(True)
+
+
+    def __checkSnapshotFile(self, snapshotFile):
+        """
+        Return the absolute path of the snapshot file, or None if there is no
+        snapshot file or its directory is not private to this service.
+        """
+
+        if not snapshotFile:
+            return None
+
+        snapshotFile = os.path.abspath(snapshotFile)
+        snapshotDir = os.path.dirname(snapshotFile)
+        try:
+            dirStat = os.stat(snapshotDir)
+        except OSError, ex:
+            log.warn('Metadata snapshot disabled: %s', ex)
+            return None
+
+        if not stat.S_ISDIR(dirStat.st_mode) or dirStat.st_uid != os.getuid() or \
+                dirStat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            log.warn('Metadata snapshot disabled: %s is not a directory owned by and only writable by this user',
+                     snapshotDir)
+            return None
+
+        return snapshotFile
+
+
+    def __readSnapshot(self):
+        """
+        Read the snapshot file once; a missing or unreadable snapshot, or one
+        of another version, is treated as empty.
+        """
+
+        if self.__snapshot is not None:
+            return
+        self.__snapshot = {}
+
+        if not self.snapshotFile or not os.path.exists(self.snapshotFile):
+            return
+
+        try:
+            f = open(self.snapshotFile, 'rb')
+            try:
+                snapshot = json.load(f)
+            finally:
+                f.close()
+        except Exception, ex:
+            log.warn('Could not read metadata snapshot %s: %s', self.snapshotFile, ex)
+            return
+
+        if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+            log.info('Ignoring metadata snapshot %s of another version', self.snapshotFile)
+            return
+
+        for resType in (DSET, DSOURCE):
+            entries = snapshot.get(resType, {})
+            valid = isinstance(entries, dict)
+            if valid:
+                for entry in entries.itervalues():
+                    if not isinstance(entry, list) or len(entry) != 2 or \
+                            not isinstance(entry[0], list) or not isinstance(entry[1], (dict, type(None))):
+                        valid = False
+                        break
+            if not valid:
+                log.warn('Ignoring malformed metadata snapshot %s', self.snapshotFile)
+                return
+
+        self.__snapshot = snapshot
+        log.info('Read metadata snapshot %s', self.snapshotFile)
+
+
+    def __writeSnapshot(self):
+        """
+        Write the metadata of the resource types loaded by this cache to the
+        snapshot file, keeping the snapshot of the other types.  The file is
+        replaced atomically.
+        """
+
+        if not self.snapshotFile:
+            return
+
+        snapshot = {'version': SNAPSHOT_VERSION}
+        for resType in (DSET, DSOURCE):
+            if resType not in self.__heads:
+                snapshot[resType] = self.__snapshot.get(resType, {})
+                continue
+
+            entries = {}
+            for resID, head in self.__heads[resType].iteritems():
+                metadata = self.__metadata.get(resID)
+                if metadata is not None:
+                    # The resource objects are not part of the snapshot
+                    metadata = dict([(key, value) for (key, value) in metadata.iteritems()
+                                     if key != DSET and key != DSOURCE])
+                    for key in DECIMAL_KEYS.intersection(metadata):
+                        metadata[key] = str(metadata[key])
+                entries[resID] = [head, metadata]
+            snapshot[resType] = entries
+
+        tmpFile = None
+        try:
+            (fd, tmpFile) = tempfile.mkstemp(prefix='.ais_metadata_cache', dir=os.path.dirname(self.snapshotFile))
+            f = os.fdopen(fd, 'wb')
+            try:
+                json.dump(snapshot, f)
+            finally:
+                f.close()
+            os.rename(tmpFile, self.snapshotFile)
+        except (IOError, OSError, TypeError, ValueError), ex:
+            log.warn('Could not write metadata snapshot %s: %s', self.snapshotFile, ex)
+            if tmpFile is not None and os.path.exists(tmpFile):
+                os.remove(tmpFile)
+            return
+
+        self.__snapshot = snapshot
+
+
     @defer.inlineCallbacks
     def __loadDSetMetadata(self, dSet):
         """
@@ -41,7 +41,8 @@ from twisted.internet import reactor
 
 from ion.core.exception import ReceivedApplicationError, ApplicationError
 from ion.core.data.store import Query
-from ion.services.dm.distribution.events import DatasetSupplementAddedEventSubscriber, DatasourceUnavailableEventSubscriber
+from ion.services.dm.distribution.events import DatasetSupplementAddedEventSubscriber, DatasourceUnavailableEventSubscriber, \
+                                                BusinessStateModificationEventPublisher, BusinessStateChangeSubscriber
 
 from ion.core.data.storage_configuration_utility import STORAGE_PROVIDER, PERSISTENT_ARCHIVE, get_cassandra_configuration
 
@@ -87,6 +88,7 @@ class NotificationAlertService(ServiceProcess):
         index_store_class_name = self.spawn_args.get('index_store_class', CONF.getValue('index_store_class', default='ion.core.data.store.IndexStore'))
         
         self.MailServer = CONF.getValue('mail_server', default='mail.oceanobservatories.org')
+        self.MailPort = CONF.getValue('mail_port', default=25)
         self.update_event_queue_name = CONF.getValue('update_event_queue_name', default='nas_update_event')
         self.offline_event_queue_name = CONF.getValue('offline_event_queue_name', default='nas_offline_event')
         
@@ -97,6 +99,22 @@ class NotificationAlertService(ServiceProcess):
         self.username = self.spawn_args.get("cassandra_username", CONF.getValue("cassandra_username", default=None))
         self.password = self.spawn_args.get("cassandra_password", CONF.getValue("cassandra_password", default=None))
         self.column_family  = self.spawn_args.get("column_family", CONF.getValue("column_family", default=None))
+
+        # Seconds a user's email address from the identity registry is reused
+        self.user_email_ttl = CONF.getValue('user_email_ttl', default=60.0)
+        # Recipients of an alert share SMTP transactions of up to this many addresses
+        self.max_recipients_per_email = CONF.getValue('max_recipients_per_email', default=50)
+        # user_ooi_id -> (email, expiry time)
+        self.user_emails = {}
+        # Bounds the concurrent identity registry lookups and SMTP transactions
+        self.alert_semaphore = defer.DeferredSemaphore(CONF.getValue('max_concurrent_alerts', default=10))
+
+        # dataset id -> {subscription key: row}, every subscription in the index store
+        self.subscriptions = {}
+        # Instances of the service tell each other about subscription changes with this event origin
+        self.subscription_change_origin = CONF.getValue('subscription_change_origin', default='notification_alert_subscriptions')
+        self.subscription_change_pub = BusinessStateModificationEventPublisher(process=self, origin=self.subscription_change_origin)
+        self.add_life_cycle_object(self.subscription_change_pub)
         
 
 
@@ -123,6 +141,8 @@ class NotificationAlertService(ServiceProcess):
             log.info("Instantiating Memory Store")
             self.index_store = self.index_store_class(self, indices=SUBSCRIPTION_INDEXED_COLUMNS )
 
+        yield self._load_subscriptions()
+
         # Create the subscribers for the event handlers
 
         self.sub = DatasetSupplementAddedEventSubscriber(process=self, queue_name=self.update_event_queue_name)
@@ -138,6 +158,14 @@ class NotificationAlertService(ServiceProcess):
         yield self.sub.activate()
         log.info('NotificationAlertService.slc_init DatasourceUnavailableEventSubscriber activation complete')     
 
+        # No queue name - every instance of the service hears about every change
+        self.subscription_change_sub = BusinessStateChangeSubscriber(process=self, origin=self.subscription_change_origin)
+        self.subscription_change_sub.ondata = self.handle_subscription_change_event
+        yield self.subscription_change_sub.initialize()
+        yield self.subscription_change_sub.activate()
+        log.info('NotificationAlertService.slc_init BusinessStateChangeSubscriber activation complete')
+
+
         
     @defer.inlineCallbacks
     def handle_offline_event(self, content):
@@ -156,64 +184,18 @@ class NotificationAlertService(ServiceProcess):
                             "To modify or remove notifications about this data resource, please access My Notifications Settings in the ION Web UI."  ), "\r\n")
 
         # get the list of subscriptions for this datasource
-        query = Query()
         ### Hack - uses dataset id in the data_src_id field because that is what AIS/UI use.
-        #query.add_predicate_eq('data_src_id', msg.additional_data.datasource_id)
-        query.add_predicate_eq('data_src_id', msg.additional_data.dataset_id)
-
-        rows = yield self.index_store.query(query)
+        rows = self.subscriptions.get(msg.additional_data.dataset_id, {})
         log.info("NotificationAlertService.handle_offline_event  Rows returned %s " % (rows,))
 
         subscriptionInfo = yield self.mc.create_instance(SUBSCRIPTION_INFO_TYPE)
 
         # send notification email to each user that is monitoring this dataset
-        for key, row in rows.iteritems():
-            log.info("NotificationAlertService.handle_offline_event  First row data set id %s", rows[key]['data_src_id'] )
-            if rows[key]['dispatcher_script_path'] == "AutomaticallyCreatedInitialIngestionSubscription":
-                InitialIngestion = True
-                SUBJECT = "(SysName " + self.sys_name + ") ION Initial Ingestion Data Alert for data set " +  msg.additional_data.dataset_id
-            else:
-                InitialIngestion = False
-                SUBJECT = "(SysName " + self.sys_name + ") ION Data Alert for data set " +  msg.additional_data.dataset_id
-            log.info('NotificationAlertService.handle_update_event: ' + SUBJECT)
-
-            tempTbl = {}
-            # get the user information from the Identity Registry
-            yield self.GetUserInformation(rows[key]['user_ooi_id'], tempTbl)
-            log.info('NotificationAlertService.handle_offline_event user email: %s', tempTbl['user_email'] )
+        alerts_filters = (subscriptionInfo.AlertsFilter.DATASOURCEOFFLINE, subscriptionInfo.AlertsFilter.UPDATESANDDATASOURCEOFFLINE)
+        yield self._send_alerts(rows, msg.additional_data.dataset_id, BODY, subscriptionInfo, alerts_filters)
 
-            subscription_type = int(row['subscription_type'])
-            email_alerts_filter = int (row['email_alerts_filter'])
-            if (subscription_type in (subscriptionInfo.SubscriptionType.EMAIL, subscriptionInfo.SubscriptionType.EMAILANDDISPATCHER) 
-                and (email_alerts_filter in (subscriptionInfo.AlertsFilter.DATASOURCEOFFLINE,subscriptionInfo.AlertsFilter.UPDATESANDDATASOURCEOFFLINE))) :
-                # Send the message via our own SMTP server, but don't include the envelope header.
-                # Create the container (outer) email message.
-                log.info('NotificationAlertService.handle_offline_event CREATE EMAIL')
-                FROM = ION_DATA_ALERTS_EMAIL_ADDRESS
-                TO = tempTbl['user_email']
-
-                emsg = MIMEText(BODY)
-                emsg['Subject'] = SUBJECT
-                emsg['From'] = FROM
-                emsg['To'] = ', '.join([TO])
-                    
-                try:
-                    log.debug("NotificationAlertService.handle_offline_event sending email to %s using the mail server at %s" %(TO, self.MailServer))
-                    yield self._sendmail(self.MailServer, FROM, [TO], emsg)
-                    log.info('NotificationAlertService.handle_offline_event Successfully sent email' )
-                except SMTPClientError:
-                    log.info('NotificationAlertService.handle_offline_event Error: unable to send email')
-                except Exception, ex:
-                    log.warning('NotificationAlertService.handle_offline_event Error: unable to send email - %s' %str(ex))
-
-                ## Do not delete the initial notification for an unavailable!
-                # delete subscription if it was automatically created by the AIS for an initial ingestion at
-                # dataset creation
-                #if InitialIngestion == True:
-                #    yield self.index_store.remove(rows[key]['data_src_id'] + rows[key]['user_ooi_id'])
-                #    log.info('NotificationAlertService.handle_offline_event deleted InitialIngestionSubscription for ' + rows[key]['data_src_id'])
-
-                log.info('NotificationAlertService.handle_offline_event completed ')
+        ## Do not delete the initial notification for an unavailable!
+        log.info('NotificationAlertService.handle_offline_event completed ')
 
     
     @defer.inlineCallbacks
@@ -243,62 +225,202 @@ class NotificationAlertService(ServiceProcess):
                         "To modify or remove notifications about this data resource, please access My Notifications Settings in the ION Web UI."  ), "\r\n")
 
         # get the list of subscriptions for this datasource
-        query = Query()
         ### Hack - uses dataset id in the data_src_id field because that is what AIS/UI use.
-        #query.add_predicate_eq('data_src_id', msg.additional_data.datasource_id)
-        query.add_predicate_eq('data_src_id', msg.additional_data.dataset_id)
-
-        rows = yield self.index_store.query(query)
+        rows = self.subscriptions.get(msg.additional_data.dataset_id, {})
         log.info("NotificationAlertService.handle_update_event  Rows returned %s " % (rows,))
 
         subscriptionInfo = yield self.mc.create_instance(SUBSCRIPTION_INFO_TYPE)
         
         # send notification email to each user that is monitoring this dataset
+        alerts_filters = (subscriptionInfo.AlertsFilter.UPDATES, subscriptionInfo.AlertsFilter.UPDATESANDDATASOURCEOFFLINE)
+        alerted_rows = yield self._send_alerts(rows, msg.additional_data.dataset_id, BODY, subscriptionInfo, alerts_filters)
+
+        # delete subscription if it was automatically created by the AIS for an initial ingestion at
+        # dataset creation
+        for row in alerted_rows:
+            if row['dispatcher_script_path'] == "AutomaticallyCreatedInitialIngestionSubscription":
+                keyval = row['data_src_id'] + row['user_ooi_id']
+                yield self.index_store.remove(keyval)
+                self._uncache_subscription(row['data_src_id'], keyval)
+                yield self._publish_subscription_change(row['data_src_id'])
+                log.info('NotificationAlertService.handle_update_event deleted InitialIngestionSubscription for ' + row['data_src_id'])
+
+        log.info('NotificationAlertService.handle_update_event completed ')
+
+
+    @defer.inlineCallbacks
+    def handle_subscription_change_event(self, content):
+        """
+        @brief Reload the subscriptions of a dataset after an instance of the
+        service changed them. The event description is the dataset id.
+        """
+        msg = content['content']
+        dataset_id = msg.additional_data.description
+        log.info('NotificationAlertService.handle_subscription_change_event subscriptions changed for %s', dataset_id)
+        yield self._refresh_subscriptions(dataset_id)
+
+
+    @defer.inlineCallbacks
+    def _load_subscriptions(self):
+        """
+        @brief Fill the subscriptions map with every subscription in the index store
+        """
+        subscriptionInfo = yield self.mc.create_instance(SUBSCRIPTION_INFO_TYPE)
+
+        # The index store needs an equality predicate - every row has one of the subscription types
+        subscriptions = {}
+        for subscription_type in subscriptionInfo.SubscriptionType.lookup.keys():
+            query = Query()
+            query.add_predicate_eq('subscription_type', str(subscription_type))
+            rows = yield self.index_store.query(query)
+            for key, row in rows.iteritems():
+                subscriptions.setdefault(row['data_src_id'], {})[key] = row
+
+        self.subscriptions = subscriptions
+        log.info('NotificationAlertService._load_subscriptions loaded subscriptions for %d datasets', len(subscriptions))
+
+
+    @defer.inlineCallbacks
+    def _refresh_subscriptions(self, dataset_id):
+        """
+        @brief Reload the subscriptions of one dataset from the index store
+        """
+        query = Query()
+        query.add_predicate_eq('data_src_id', dataset_id)
+        rows = yield self.index_store.query(query)
+
+        if rows:
+            self.subscriptions[dataset_id] = dict(rows)
+        else:
+            self.subscriptions.pop(dataset_id, None)
+
+
+    def _cache_subscription(self, keyval, row):
+        self.subscriptions.setdefault(row['data_src_id'], {})[keyval] = row
+
+
+    def _uncache_subscription(self, dataset_id, keyval):
+        rows = self.subscriptions.get(dataset_id)
+        if rows is not None:
+            rows.pop(keyval, None)
+            if not rows:
+                del self.subscriptions[dataset_id]
+
+
+    @defer.inlineCallbacks
+    def _publish_subscription_change(self, dataset_id):
+        """
+        @brief Tell the other instances of the service to reload the subscriptions of a dataset
+        """
+        try:
+            yield self.subscription_change_pub.create_and_publish_event(description=dataset_id)
+        except Exception, ex:
+            log.warning('NotificationAlertService._publish_subscription_change Error: unable to publish change for %s - %s' % (dataset_id, str(ex)))
+
+
+    @defer.inlineCallbacks
+    def _send_alerts(self, rows, dataset_id, BODY, subscriptionInfo, alerts_filters):
+        """
+        @brief Email BODY to the users of the subscription rows which want email
+        alerts of one of the alerts_filters. Users with the same subject line share
+        an SMTP transaction; user lookups and transactions run concurrently, bounded
+        by alert_semaphore.
+        @retval the rows of the users which were sent an email
+        """
+        email_types = (subscriptionInfo.SubscriptionType.EMAIL, subscriptionInfo.SubscriptionType.EMAILANDDISPATCHER)
+
+        alerts = []
         for key, row in rows.iteritems():
-            log.info("NotificationAlertService.handle_update_event  First row data set id %s", rows[key]['data_src_id'] )
-            if rows[key]['dispatcher_script_path'] == "AutomaticallyCreatedInitialIngestionSubscription":
-                InitialIngestion = True
-                SUBJECT = "(SysName " + self.sys_name + ") ION Initial Ingestion Data Alert for data set " +  msg.additional_data.dataset_id
-            else:
-                InitialIngestion = False
-                SUBJECT = "(SysName " + self.sys_name + ") ION Data Alert for data set " +  msg.additional_data.dataset_id
-            log.info('NotificationAlertService.handle_update_event: ' + SUBJECT)
-
-            tempTbl = {}
-            # get the user information from the Identity Registry
-            yield self.GetUserInformation(rows[key]['user_ooi_id'], tempTbl)
-            log.info('NotificationAlertService.handle_update_event user email: %s', tempTbl['user_email'] )
             subscription_type = int(row['subscription_type'])
-            email_alerts_filter = int (row['email_alerts_filter'])
-            if (subscription_type in (subscriptionInfo.SubscriptionType.EMAIL, subscriptionInfo.SubscriptionType.EMAILANDDISPATCHER) 
-                and (email_alerts_filter in (subscriptionInfo.AlertsFilter.UPDATES, subscriptionInfo.AlertsFilter.UPDATESANDDATASOURCEOFFLINE))) :
-                # Send the message via our own SMTP server, but don't include the envelope header.
-                # Create the container (outer) email message.
-                log.info('NotificationAlertService.handle_update_event CREATE EMAIL')
-                FROM = ION_DATA_ALERTS_EMAIL_ADDRESS
-                TO = tempTbl['user_email']
-
-                emsg = MIMEText(BODY)
-                emsg['Subject'] = SUBJECT
-                emsg['From'] = FROM
-                emsg['To'] = ', '.join([TO])
-
-                try:
-                    log.debug("NotificationAlertService.handle_update_event: sending email to %s using the mail server at %s" %(TO, self.MailServer))
-                    yield self._sendmail(self.MailServer, FROM, [TO], emsg)
-                    log.info('NotificationAlertService.handle_update_event Successfully sent email' )
-                except SMTPClientError:
-                    log.info('NotificationAlertService.handle_update_event Error: unable to send email')
-                except Exception, ex:
-                    log.warning('NotificationAlertService.handle_update_event Error: unable to send email - %s'% str(ex))
-
-                # delete subscription if it was automatically created by the AIS for an initial ingestion at
-                # dataset creation
-                if InitialIngestion == True:
-                    yield self.index_store.remove(rows[key]['data_src_id'] + rows[key]['user_ooi_id'])
-                    log.info('NotificationAlertService.handle_update_event deleted InitialIngestionSubscription for ' + rows[key]['data_src_id'])
-
-                log.info('NotificationAlertService.handle_update_event completed ')
+            email_alerts_filter = int(row['email_alerts_filter'])
+            if subscription_type in email_types and email_alerts_filter in alerts_filters:
+                alerts.append(row)
+
+        # get the user information from the Identity Registry
+        user_ids = list(set([row['user_ooi_id'] for row in alerts]))
+        results = yield defer.DeferredList([self.alert_semaphore.run(self._get_user_email, user_id) for user_id in user_ids])
+        emails = dict(zip(user_ids, [email for (success, email) in results]))
+
+        # subject -> list of email addresses
+        recipients = {}
+        alerted_rows = []
+        for row in alerts:
+            TO = emails[row['user_ooi_id']]
+            if not TO:
+                log.warning('NotificationAlertService._send_alerts no email address for user %s' % row['user_ooi_id'])
+                continue
+
+            if row['dispatcher_script_path'] == "AutomaticallyCreatedInitialIngestionSubscription":
+                SUBJECT = "(SysName " + self.sys_name + ") ION Initial Ingestion Data Alert for data set " +  dataset_id
+            else:
+                SUBJECT = "(SysName " + self.sys_name + ") ION Data Alert for data set " +  dataset_id
+
+            addresses = recipients.setdefault(SUBJECT, [])
+            if TO not in addresses:
+                addresses.append(TO)
+            alerted_rows.append(row)
+
+        sends = []
+        for SUBJECT, addresses in recipients.iteritems():
+            for i in range(0, len(addresses), self.max_recipients_per_email):
+                sends.append(self.alert_semaphore.run(self._send_alert, SUBJECT, BODY, addresses[i:i + self.max_recipients_per_email]))
+        yield defer.DeferredList(sends)
+
+        defer.returnValue(alerted_rows)
+
+
+    @defer.inlineCallbacks
+    def _send_alert(self, SUBJECT, BODY, TO):
+        """
+        @brief Send one alert email to a list of addresses in a single SMTP transaction
+        """
+        # Send the message via our own SMTP server, but don't include the envelope header.
+        # Create the container (outer) email message.
+        FROM = ION_DATA_ALERTS_EMAIL_ADDRESS
+
+        emsg = MIMEText(BODY)
+        emsg['Subject'] = SUBJECT
+        emsg['From'] = FROM
+        if len(TO) == 1:
+            emsg['To'] = TO[0]
+        else:
+            # Recipients do not see each other's addresses
+            emsg['To'] = 'undisclosed-recipients:;'
+
+        try:
+            log.debug("NotificationAlertService._send_alert sending email to %s using the mail server at %s" %(TO, self.MailServer))
+            yield self._sendmail(self.MailServer, FROM, TO, emsg, port=self.MailPort)
+            log.info('NotificationAlertService._send_alert Successfully sent email to %d users' % len(TO))
+        except SMTPClientError:
+            log.info('NotificationAlertService._send_alert Error: unable to send email')
+        except Exception, ex:
+            log.warning('NotificationAlertService._send_alert Error: unable to send email - %s' % str(ex))
+
+
+    @defer.inlineCallbacks
+    def _get_user_email(self, user_ooi_id):
+        """
+        @brief Email address of a user, from the identity registry or the
+        user_emails cache. None if the lookup failed.
+        """
+        now = time.time()
+        cached = self.user_emails.get(user_ooi_id)
+        if cached is not None and now < cached[1]:
+            defer.returnValue(cached[0])
+
+        tempTbl = {}
+        try:
+            yield self.GetUserInformation(user_ooi_id, tempTbl)
+        except Exception, ex:
+            log.warning('NotificationAlertService._get_user_email Error: unable to get user %s - %s' % (user_ooi_id, str(ex)))
+            defer.returnValue(None)
+
+        if 'user_email' not in tempTbl:
+            defer.returnValue(None)
+
+        log.info('NotificationAlertService._get_user_email user email: %s', tempTbl['user_email'])
+        self.user_emails[user_ooi_id] = (tempTbl['user_email'], now + self.user_email_ttl)
+        defer.returnValue(tempTbl['user_email'])
 
 
     @defer.inlineCallbacks
@@ -392,6 +514,8 @@ class NotificationAlertService(ServiceProcess):
         self.keyval = content.message_parameters_reference.subscriptionInfo.data_src_id + content.message_parameters_reference.subscriptionInfo.user_ooi_id
         log.info('NotificationAlertService.op_addSubscription attributes keyval id: %s', self.keyval )
         yield self.index_store.put(self.keyval , self.keyval, self.attributes)
+        self._cache_subscription(self.keyval, dict(self.attributes, value=self.keyval))
+        yield self._publish_subscription_change(self.attributes['data_src_id'])
 
         # create the AIS response GPBs
         log.info('NotificationAlertService.op_addSubscription construct response message')
@@ -438,6 +562,8 @@ class NotificationAlertService(ServiceProcess):
             raise NotificationAlertError('Invalid request, subscription does not exist, ignoring',
                                             content.ResponseCodes.BAD_REQUEST)
         yield self.index_store.remove(self.keyval)
+        self._uncache_subscription(content.message_parameters_reference.subscriptionInfo.data_src_id, self.keyval)
+        yield self._publish_subscription_change(content.message_parameters_reference.subscriptionInfo.data_src_id)
 
         # create the AIS response GPB
         respMsg = yield self.mc.create_instance(AIS_RESPONSE_MSG_TYPE)
@@ -11,6 +11,7 @@ log = ion.util.ionlog.getLogger(__name__)
 import ion.util.procutils as pu
 
 from twisted.internet import defer
+import os
 import time
 
 
@@ -113,7 +114,9 @@ class MetadataCacheTest(IonTestCase, AIS_Mixin):
         subproc = Process(**{'proc-name':'Test Metadata Cache Subscriber Proc'})
         yield subproc.spawn()
 
-        self.cache = MetadataCache(subproc)
+        # A fresh snapshot for each test
+        self.snapshotFile = self.mktemp()
+        self.cache = MetadataCache(subproc, snapshotFile=self.snapshotFile)
         log.debug('Instantiated AIS Metadata Cache Object')
         subproc.metadataCache = self.cache
         subproc.rc = ResourceClient(subproc)
@@ -225,6 +228,61 @@ class MetadataCacheTest(IonTestCase, AIS_Mixin):
         self.assertEqual(numDatasources, self.cache.numDSources)
 
 
+    @defer.inlineCallbacks
+    def test_snapshotWarmStart(self):
+        """
+        A second cache with the same snapshot restores the metadata of the
+        unchanged resources without getting the resources.
+        """
+
+        cache = MetadataCache(self.subproc, snapshotFile=self.snapshotFile)
+
+        get_instance = cache.rc.get_instance
+        calls = []
+        def counting_get_instance(*args, **kwargs):
+            calls.append(args)
+            return get_instance(*args, **kwargs)
+        cache.rc.get_instance = counting_get_instance
+
+        yield cache.loadDataSets()
+        yield cache.loadDataSources()
+
+        self.assertEqual(calls, [])
+        self.assertEqual(cache.getNumDatasets(), self.cache.getNumDatasets())
+        self.assertEqual(cache.getNumDatasources(), self.cache.getNumDatasources())
+
+        for ds in self.cache.getDatasets():
+            dSetResID = ds['ResourceIdentity']
+            restored = yield cache.getDSetMetadata(dSetResID)
+            for key in ds:
+                if key != 'dset':
+                    self.assertEqual(restored[key], ds[key])
+
+            # The data set itself is got on demand
+            dSet = yield cache.getDSet(dSetResID)
+            self.assertEqual(dSet.ResourceIdentity, dSetResID)
+
+        self.assertEqual(len(calls), self.cache.getNumDatasets())
+
+
+    def test_snapshotDisabled(self):
+        """
+        The snapshot can be disabled per instance, and is refused in a
+        directory that others can write to.
+        """
+
+        self.assertNotEqual(self.cache.snapshotFile, None)
+
+        cache = MetadataCache(self.subproc, snapshotFile=False)
+        self.assertEqual(cache.snapshotFile, None)
+
+        sharedDir = self.mktemp()
+        os.mkdir(sharedDir)
+        os.chmod(sharedDir, 0777)
+        cache = MetadataCache(self.subproc, snapshotFile=os.path.join(sharedDir, 'snapshot'))
+        self.assertEqual(cache.snapshotFile, None)
+
+
     @defer.inlineCallbacks
     def test_updateMetadataCache(self):
         log.debug('Testing updateMetadataCache.')
@@ -5,7 +5,9 @@
 @test ion.integration.notification_alert_service
 @author Maurice Manning
 """
-from twisted.internet import defer
+from twisted.internet import defer, reactor
+from twisted.mail import smtp
+from zope.interface import implements
 
 import ion.util.ionlog
 log = ion.util.ionlog.getLogger(__name__)
@@ -22,7 +24,8 @@ from ion.services.coi.datastore_bootstrap.ion_preload_config import MYOOICI_USER
 from ion.integration.ais.ais_object_identifiers import AIS_REQUEST_MSG_TYPE, \
                                                        AIS_RESPONSE_MSG_TYPE, \
                                                        GET_SUBSCRIPTION_LIST_REQ_TYPE, \
-                                                       SUBSCRIBE_DATA_RESOURCE_REQ_TYPE
+                                                       SUBSCRIBE_DATA_RESOURCE_REQ_TYPE, \
+                                                       SUBSCRIPTION_INFO_TYPE
 
 
 
@@ -164,6 +167,9 @@ class NotificationAlertTest(IonTestCase):
         if reply.MessageType != AIS_RESPONSE_MSG_TYPE:
             self.fail('response is not an AIS_RESPONSE_MSG_TYPE GPB')
 
+        nas = self._get_service_by_name('notification_alert')
+        self.assertEqual(nas.subscriptions['dataset123'].keys(), ['dataset123' + MYOOICI_USER_ID])
+
         # Call the Alert service to remove this specific subscription based on user id and resource id
         reqMsg = yield mc.create_instance(AIS_REQUEST_MSG_TYPE)
         reqMsg.message_parameters_reference = reqMsg.CreateObject(SUBSCRIBE_DATA_RESOURCE_REQ_TYPE)
@@ -191,6 +197,8 @@ class NotificationAlertTest(IonTestCase):
         if numResReturned != 0:
             self.fail('NotificationAlertTest: test_removeSubscription returned incorrect subscription count.')
 
+        self.assertFalse('dataset123' in nas.subscriptions)
+
 
     @defer.inlineCallbacks
     def test_getSubscriptionList(self):
@@ -328,3 +336,169 @@ class NotificationAlertTest(IonTestCase):
             self.fail('NotificationAlertTest: test_getSubscription returned incorrect subscription count.')
         log.info('getSubscription returned:\n %s'%reply.message_parameters_reference[0].subscriptionListResults[0])
 
+
+    @defer.inlineCallbacks
+    def test_update_event_fan_out(self):
+        nas = self._get_service_by_name('notification_alert')
+
+        # Send the alerts to a local SMTP server
+        server = CountingSMTPFactory()
+        port = reactor.listenTCP(0, server, interface='127.0.0.1')
+        self.addCleanup(port.stopListening)
+        nas.MailServer = '127.0.0.1'
+        nas.MailPort = port.getHost().port
+        nas.max_recipients_per_email = 5
+
+        lookups = []
+        def get_user_information(user_ooi_id, tempTbl):
+            lookups.append(user_ooi_id)
+            tempTbl['user_email'] = '%s@example.com' % user_ooi_id
+            return defer.succeed(None)
+        self.patch(nas, 'GetUserInformation', get_user_information)
+
+        mc = MessageClient(proc=self.test_sup)
+        info = yield mc.create_instance(SUBSCRIPTION_INFO_TYPE)
+        user_ids = ['fan_out_user%d' % i for i in range(12)]
+        for i, user_id in enumerate(user_ids):
+            script = ''
+            if i < 2:
+                script = 'AutomaticallyCreatedInitialIngestionSubscription'
+            yield nas.index_store.put('dataset_fan_out' + user_id, 'dataset_fan_out' + user_id,
+                                      {'user_ooi_id':user_id,
+                                       'data_src_id':'dataset_fan_out',
+                                       'subscription_type':str(info.SubscriptionType.EMAIL),
+                                       'email_alerts_filter':str(info.AlertsFilter.UPDATESANDDATASOURCEOFFLINE),
+                                       'dispatcher_script_path':script})
+
+        # Subscriptions added behind the service's back are picked up on a change event
+        yield nas.handle_subscription_change_event({'content':SubscriptionChangeContent('dataset_fan_out')})
+        self.assertEqual(len(nas.subscriptions['dataset_fan_out']), 12)
+
+        event = {'content':UpdateEventContent('dataset_fan_out')}
+        yield nas.handle_update_event(event)
+
+        self.assertEqual(sorted(lookups), sorted(user_ids))
+        self.assertEqual(sorted(server.recipients), sorted(['%s@example.com' % user_id for user_id in user_ids]))
+        # The two initial ingestion users share one transaction, the others share two
+        self.assertEqual(server.transactions, 3)
+        self.assertEqual(server.connections, 3)
+
+        # The initial ingestion subscriptions are gone and the email addresses are cached
+        del lookups[:]
+        yield nas.handle_update_event(event)
+        self.assertEqual(lookups, [])
+        self.assertEqual(len(server.recipients), 22)
+        self.assertEqual(server.transactions, 5)
+        self.assertEqual(len(nas.subscriptions['dataset_fan_out']), 10)
+
+    @defer.inlineCallbacks
+    def test_update_event_burst(self):
+        nas = self._get_service_by_name('notification_alert')
+
+        sends = []
+        def send_alert(SUBJECT, BODY, TO):
+            sends.append(TO)
+            return defer.succeed(None)
+        self.patch(nas, '_send_alert', send_alert)
+
+        def get_user_information(user_ooi_id, tempTbl):
+            tempTbl['user_email'] = '%s@example.com' % user_ooi_id
+            return defer.succeed(None)
+        self.patch(nas, 'GetUserInformation', get_user_information)
+
+        mc = MessageClient(proc=self.test_sup)
+        info = yield mc.create_instance(SUBSCRIPTION_INFO_TYPE)
+        yield nas.index_store.put('dataset_burst' + 'burst_user', 'dataset_burst' + 'burst_user',
+                                  {'user_ooi_id':'burst_user',
+                                   'data_src_id':'dataset_burst',
+                                   'subscription_type':str(info.SubscriptionType.EMAIL),
+                                   'email_alerts_filter':str(info.AlertsFilter.UPDATES),
+                                   'dispatcher_script_path':''})
+        yield nas.handle_subscription_change_event({'content':SubscriptionChangeContent('dataset_burst')})
+
+        queries = []
+        query = nas.index_store.query
+        def counting_query(query_predicates):
+            queries.append(query_predicates)
+            return query(query_predicates)
+        self.patch(nas.index_store, 'query', counting_query)
+
+        event = {'content':UpdateEventContent('dataset_burst')}
+        for i in range(1000):
+            yield nas.handle_update_event(event)
+        yield nas.handle_update_event({'content':UpdateEventContent('dataset_without_subscriptions')})
+
+        self.assertEqual(queries, [])
+        self.assertEqual(sends, [['burst_user@example.com']] * 1000)
+
+
+class UpdateEventContent(object):
+    """
+    The parts of a DatasetSupplementAdded event used by the notification alert service
+    """
+    def __init__(self, dataset_id):
+        self.additional_data = self
+        self.dataset_id = dataset_id
+        self.datasource_id = 'datasource_' + dataset_id
+        self.title = 'Test data set'
+        self.url = 'http://localhost/' + dataset_id
+        self.start_datetime_millis = 0
+        self.end_datetime_millis = 3600000
+        self.number_of_timesteps = 10
+
+
+class SubscriptionChangeContent(object):
+    """
+    The parts of a subscription change event used by the notification alert service
+    """
+    def __init__(self, dataset_id):
+        self.additional_data = self
+        self.description = dataset_id
+
+
+class CountingMessage(object):
+    implements(smtp.IMessage)
+
+    def lineReceived(self, line):
+        pass
+
+    def eomReceived(self):
+        return defer.succeed(None)
+
+    def connectionLost(self):
+        pass
+
+
+class CountingMessageDelivery(object):
+    implements(smtp.IMessageDelivery)
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    def receivedHeader(self, helo, origin, recipients):
+        return 'Received: by the test server'
+
+    def validateFrom(self, helo, origin):
+        self.factory.transactions += 1
+        return origin
+
+    def validateTo(self, user):
+        self.factory.recipients.append(str(user.dest))
+        return CountingMessage
+
+
+class CountingSMTPFactory(smtp.SMTPFactory):
+    """
+    SMTP server which accepts all mail, counting connections, transactions and recipients
+    """
+    def __init__(self):
+        smtp.SMTPFactory.__init__(self)
+        self.connections = 0
+        self.transactions = 0
+        self.recipients = []
+
+    def buildProtocol(self, addr):
+        self.connections += 1
+        p = smtp.SMTPFactory.buildProtocol(self, addr)
+        p.delivery = CountingMessageDelivery(self)
+        return p
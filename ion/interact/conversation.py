@@ -21,6 +21,8 @@ import ion.util.procutils as pu
 
 CONF = ioninit.config(__name__)
 CF_basic_conv_types = CONF['basic_conv_types']
+# If True, every sent and received message is recorded in Conversation.conv_log
+CF_conv_log = CONF.getValue('conv_log', False)
 
 # Conversation type id for no conversation use.
 CONV_TYPE_NONE = "none"
@@ -71,6 +73,10 @@ class Conversation(object):
     """
     implements(IConversation)
 
+    __slots__ = ('conv_id', 'conv_type', 'protocol', 'role_bindings',
+                 'local_role', 'local_process', 'local_fsm',
+                 'blocking_deferred', 'timeout', 'conv_log')
+
     def __init__(self, conv_type, conv_id):
         """
         Creates a new conversation instance.
@@ -89,7 +95,8 @@ class Conversation(object):
         self.blocking_deferred = None
         # Marks a timeout in the conversation processing
         self.timeout = None
-        self.conv_log = []
+        # List of message records, None if message recording is disabled
+        self.conv_log = [] if CF_conv_log else None
 
     def bind_role_local(self, role_id, process):
         self.bind_role(role_id, process.id)
@@ -111,9 +118,10 @@ class Conversation(object):
         self.role_bindings[role_id] = process_id
 
     def get_conv_log_str(self):
+        conv_log = self.conv_log or []
         res = "CONV_LOG[type=%s, id=%s, state=%s, @process=%s, #messages=%s:\n" % (
-            self.protocol, self.conv_id, self.local_fsm._get_state(), self.local_process.proc_name, len(self.conv_log))
-        for msg_rec in self.conv_log:
+            self.protocol, self.conv_id, self.local_fsm._get_state(), self.local_process.proc_name, len(conv_log))
+        for msg_rec in conv_log:
             (ts, mtype, cstate, mhdrs) = msg_rec
             hstr = "%s -> %s %s:%s:%s; uid=%s, status=%s" % (mhdrs.get('sender',None),
                     mhdrs.get('receiver',None), mhdrs.get('protocol',None),
@@ -125,7 +133,8 @@ class Conversation(object):
         return res
 
     def __str__(self):
-        return "Conversation(%s)" % self.__dict__
+        return "Conversation(%s)" % dict((attr, getattr(self, attr, None))
+                                         for attr in Conversation.__slots__)
 
 class RoleSpec(object):
     """
@@ -347,7 +356,7 @@ class ProcessConversationManager(object):
 
     def log_conv_message(self, conv, message, msgtype):
         # Tuple of Timestamp (MS), type, message
-        if conv is None:
+        if conv is None or conv.conv_log is None:
             return
         hdrs = message.get('headers',{})
         if hdrs and type(hdrs) is dict:
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+"""
+@file ion/interact/fast_rpc.py
+@brief RPC conversation type without a per conversation FSM. The RPC state
+    model of RpcFSMFactory is compiled once into a transition table that is
+    shared by all conversations of a role. Conversation instances are slot
+    based records. Interoperates with RpcType; both use the 'rpc' protocol.
+"""
+
+from twisted.internet import defer
+
+import ion.util.ionlog
+log = ion.util.ionlog.getLogger(__name__)
+
+from ion.interact.conversation import Conversation, RoleSpec
+from ion.interact.rpc import RpcFSMFactory, RpcType, RpcInitiator, RpcParticipant
+
+
+# RPC state model, see RpcFSMFactory.create_fsm
+# Map (input_symbol, current_state) --> (action, next_state)
+RPC_TRANSITIONS = {
+    (RpcFSMFactory.E_REQUEST, RpcFSMFactory.S_INIT): (RpcFSMFactory.E_REQUEST, RpcFSMFactory.S_REQUESTED),
+    (RpcFSMFactory.E_FAILURE, RpcFSMFactory.S_REQUESTED): (RpcFSMFactory.E_FAILURE, RpcFSMFactory.S_FAILED),
+    (RpcFSMFactory.E_RESULT, RpcFSMFactory.S_REQUESTED): (RpcFSMFactory.E_RESULT, RpcFSMFactory.S_DONE),
+    (RpcFSMFactory.E_TIMEOUT, RpcFSMFactory.S_REQUESTED): (RpcFSMFactory.E_TIMEOUT, RpcFSMFactory.S_TIMEOUT),
+}
+# Map (input_symbol) --> (action, next_state) for ANY state
+RPC_TRANSITIONS_CATCH = {
+    RpcFSMFactory.E_ERROR: (RpcFSMFactory.E_ERROR, RpcFSMFactory.S_ERROR),
+}
+# (action, next_state) for any undefined input
+RPC_DEFAULT_TRANSITION = (RpcFSMFactory.A_UNEXPECTED, RpcFSMFactory.S_UNEXPECTED)
+
+RPC_STATES = (RpcFSMFactory.S_INIT, RpcFSMFactory.S_REQUESTED, RpcFSMFactory.S_FAILED,
+              RpcFSMFactory.S_DONE, RpcFSMFactory.S_ERROR, RpcFSMFactory.S_UNEXPECTED,
+              RpcFSMFactory.S_TIMEOUT)
+
+
+def compile_transitions(role_class, transitions, transitions_catch, default_transition, states):
+    """
+    @brief Resolves a state model against the action functions of a role class.
+        Applies the lookup order of FSM.get_transition to every known
+        (input_symbol, state) pair, so that processing an input is a single
+        dict lookup.
+    @retval tuple of dict (input_symbol, state) -> (function, next_state) and
+        the default (function, next_state)
+    """
+    def resolve(entry):
+        (action, next_state) = entry
+        return (getattr(role_class, action).im_func, next_state)
+
+    table = {}
+    events = set([event for (event, state) in transitions.keys()])
+    events.update(transitions_catch.keys())
+    for event in events:
+        for state in states:
+            if (event, state) in transitions:
+                table[(event, state)] = resolve(transitions[(event, state)])
+            elif event in transitions_catch:
+                table[(event, state)] = resolve(transitions_catch[event])
+    return (table, resolve(default_transition))
+
+
+class FastConversationRole(object):
+    """
+    @brief Mixin for a ConversationRole that replaces the FSM instance with a
+        current state and a class level transition table. Mirrors the
+        post-action and error handling of StateObject._so_process: the state
+        changes before the action is called, and an action that raises or
+        fails its Deferred puts the conversation into the error state.
+        Subclasses set _transitions and _default_transition, see
+        compile_transitions.
+    """
+    _transitions = None
+    _default_transition = None
+
+    def __init__(self):
+        self.state = RpcFSMFactory.S_INIT
+
+    def _so_process(self, event, *args, **kwargs):
+        (func, self.state) = self._transitions.get((event, self.state), self._default_transition)
+        log.debug("Processing Conversation event='%s', new state='%s'", event, self.state)
+        try:
+            res = func(self, *args, **kwargs)
+        except StandardError, ex:
+            log.exception("ERROR in conversation process(event=%s)", event)
+            self._so_error(ex, *args, **kwargs)
+            raise
+
+        if isinstance(res, defer.Deferred):
+            res.addErrback(self._so_failed, event)
+        return res
+
+    def _so_failed(self, reason, event):
+        log.error("ERROR in conversation process(event=%s), D:\n%s", event, reason)
+        self._so_error(reason)
+        return reason
+
+    def _so_error(self, *args, **kwargs):
+        """
+        @brief Brings the conversation into the error state, because of some
+            action error. Errors of the error action are logged only.
+        """
+        (func, self.state) = self._transitions.get((RpcFSMFactory.E_ERROR, self.state), self._default_transition)
+        try:
+            func(self, *args, **kwargs)
+        except Exception:
+            log.exception("Subsequent ERROR in conversation error()")
+
+    def _get_state(self):
+        return self.state
+
+
+class FastRpcInitiator(FastConversationRole, RpcInitiator):
+    """
+    RPC Conversation Type. INITIATOR >>>> role, without FSM instance.
+    """
+
+(FastRpcInitiator._transitions, FastRpcInitiator._default_transition) = compile_transitions(
+    FastRpcInitiator, RPC_TRANSITIONS, RPC_TRANSITIONS_CATCH, RPC_DEFAULT_TRANSITION, RPC_STATES)
+
+
+class FastRpcParticipant(FastConversationRole, RpcParticipant):
+    """
+    RPC Conversation Type. >>>> PARTICIPANT role, without FSM instance.
+    """
+
+(FastRpcParticipant._transitions, FastRpcParticipant._default_transition) = compile_transitions(
+    FastRpcParticipant, RPC_TRANSITIONS, RPC_TRANSITIONS_CATCH, RPC_DEFAULT_TRANSITION, RPC_STATES)
+
+
+class FastRpc(Conversation):
+    """
+    @brief Conversation instance for a RPC, without instance dict
+    """
+    __slots__ = ()
+
+
+class FastRpcType(RpcType):
+    """
+    @brief Conversation type rpc using FastRpcInitiator and FastRpcParticipant.
+        Same roles, ids and final states as RpcType.
+    """
+
+    ROLE_INITIATOR = RoleSpec(
+                        role_id=RpcType.ROLE_INITIATOR.role_id,
+                        role_class=FastRpcInitiator)
+    ROLE_PARTICIPANT = RoleSpec(
+                        role_id=RpcType.ROLE_PARTICIPANT.role_id,
+                        role_class=FastRpcParticipant)
+
+    roles = {ROLE_INITIATOR.role_id:ROLE_INITIATOR,
+             ROLE_PARTICIPANT.role_id:ROLE_PARTICIPANT}
+
+    def new_conversation(self, **kwargs):
+        conv = FastRpc(**kwargs)
+        return conv
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+"""
+@file ion/interact/test/test_fast_rpc.py
+@brief test case for the RPC conversation type with shared transition table
+"""
+
+from twisted.internet import defer
+from twisted.trial import unittest
+
+from ion.interact.conversation import Conversation
+from ion.interact.rpc import RpcFSMFactory, RpcInitiator, RpcParticipant, RpcType
+from ion.interact.fast_rpc import FastRpcType, FastRpc, FastRpcInitiator, FastRpcParticipant, RPC_STATES
+
+
+class FastRpcTest(unittest.TestCase):
+
+    def test_same_state_model(self):
+        # Every input in every state leads to the same next state as the
+        # FSM built by RpcFSMFactory
+        events = (RpcFSMFactory.E_REQUEST, RpcFSMFactory.E_FAILURE, RpcFSMFactory.E_RESULT,
+                  RpcFSMFactory.E_ERROR, RpcFSMFactory.E_TIMEOUT, 'undefined')
+        for (role_class, fast_class) in ((RpcInitiator, FastRpcInitiator),
+                                         (RpcParticipant, FastRpcParticipant)):
+            fsm = RpcFSMFactory().create_fsm(role_class())
+            for state in RPC_STATES:
+                for event in events:
+                    (func, next_state) = fast_class._transitions.get((event, state),
+                                                                     fast_class._default_transition)
+                    (action, fsm_next_state) = fsm.get_transition(event, state)
+                    self.assertEqual(next_state, fsm_next_state)
+
+    def test_conversation_record(self):
+        conv = FastRpcType(id=RpcType.CONV_TYPE_RPC).new_conversation(
+            conv_type=FastRpcType(id=RpcType.CONV_TYPE_RPC), conv_id='conv#1')
+        self.assertIsInstance(conv, FastRpc)
+        self.assertIsInstance(conv, Conversation)
+        self.assertFalse(hasattr(conv, '__dict__'))
+        self.assertEqual(conv.protocol, RpcType.CONV_TYPE_RPC)
+        self.assertEqual(conv.conv_log, None)
+
+    def test_process(self):
+        role = FastRpcInitiator()
+        self.assertEqual(role._get_state(), RpcFSMFactory.S_INIT)
+        role._so_process(RpcFSMFactory.E_REQUEST, {})
+        self.assertEqual(role._get_state(), RpcFSMFactory.S_REQUESTED)
+        role._so_process(RpcFSMFactory.E_REQUEST, {})
+        self.assertEqual(role._get_state(), RpcFSMFactory.S_UNEXPECTED)
+
+    def test_action_failure(self):
+        def request(self, message):
+            raise RuntimeError("action failed")
+        role = FastRpcParticipant()
+        role._transitions = dict(FastRpcParticipant._transitions)
+        role._transitions[(RpcFSMFactory.E_REQUEST, RpcFSMFactory.S_INIT)] = (
+            request, RpcFSMFactory.S_REQUESTED)
+        self.assertRaises(RuntimeError, role._so_process, RpcFSMFactory.E_REQUEST, {})
+        self.assertEqual(role._get_state(), RpcFSMFactory.S_ERROR)
+
+    def test_deferred_action_failure(self):
+        role = FastRpcParticipant()
+        role._transitions = dict(FastRpcParticipant._transitions)
+        role._transitions[(RpcFSMFactory.E_REQUEST, RpcFSMFactory.S_INIT)] = (
+            lambda self, message: defer.fail(RuntimeError("action failed")),
+            RpcFSMFactory.S_REQUESTED)
+        d = role._so_process(RpcFSMFactory.E_REQUEST, {})
+        self.assertEqual(role._get_state(), RpcFSMFactory.S_ERROR)
+        return self.assertFailure(d, RuntimeError)
@@ -155,7 +155,7 @@ class NDArrayLRUDict(LRUDict):
         if not self.has_key(key):
             ndarray = NDArrayWrap(key, self._repo, bounds, itembytes, getblobs)
             self[key] = ndarray
-            log.debug("LRUDict loading, item size %d, lru now %d items %d bytes total" % (ndarray._size, len(self.keys()), self.total_size))
+            log.debug("LRUDict loading, item size %d, lru now %d items %d bytes total", ndarray._size, len(self.keys()), self.total_size)
         else:
             ndarray = self.get(key)
 
@@ -302,7 +302,7 @@ class DataStoreWorkbench(WorkBench):
         new_head.repositorykey = repository_key
 
 
-        log.debug('Found %d commits in the store' % len(rows))
+        log.debug('Found %d commits in the store', len(rows))
 
         # Make a copy of the commit_index to keep track of the cref objects that are already loaded.
         all_crefs = repo._commit_index.copy()
@@ -592,7 +592,7 @@ class DataStoreWorkbench(WorkBench):
                     blobs_msg = yield self.fetch_blobs(headers.get('reply-to'), blobs_request)
                 except ReceivedError, re:
 
-                   log.debug('ReceivedError', str(re))
+                   log.debug('ReceivedError: %s', re)
 
                    # no local modifications at this point - don't need to clear
                    raise DataStoreWorkBenchError('Fetch Objects returned an exception! "%s"' % re.msg_content)
@@ -793,7 +793,7 @@ class DataStoreWorkbench(WorkBench):
             key_lcs_pair.lcs = int(rows.values()[0][RESOURCE_LIFE_CYCLE_STATE])
 
             if log.getEffectiveLevel() <= logging.DEBUG:
-                log.debug("repo_key: %s, LCS: %s" % (repo_key, str(key_lcs_pair.lcs)))
+                log.debug("repo_key: %s, LCS: %s", repo_key, key_lcs_pair.lcs)
 
         yield self._process.reply_ok(msg, response)
         log.info("/op_get_lcs")
@@ -826,7 +826,7 @@ class DataStoreWorkbench(WorkBench):
         if not hasattr(request, 'MessageType') or request.MessageType != BLOBS_REQUSET_MESSAGE_TYPE:
             raise DataStoreWorkBenchError('Invalid fetch objects request. Bad Message Type!', request.ResponseCodes.BAD_REQUEST)
 
-        log.info('op_fetch_blobs: %d Keys' % len(request.blob_keys))
+        log.info('op_fetch_blobs: %d Keys', len(request.blob_keys))
 
         response = yield self._process.message_client.create_instance(BLOBS_MESSAGE_TYPE)
 
@@ -888,11 +888,11 @@ class DataStoreWorkbench(WorkBench):
         #import pprint
         #print 'After update to heads'
         #pprint.pprint(self._commit_store.kvs)
-        log.info("Number of repositories:  %s" % len(self._repos))
-        log.info("Number of blobs: %s " % len(self._workbench_cache))
+        log.info("Number of repositories:  %s", len(self._repos))
+        log.info("Number of blobs: %s ", len(self._workbench_cache))
         
         num_commit_keys = map(lambda repo: len(repo._commit_index.keys()), self._repos.values())
-        log.info("Number of commits: %s " % sum(num_commit_keys))
+        log.info("Number of commits: %s ", sum(num_commit_keys))
 
         # Now clear the in memory workbench
         self.clear()
@@ -1030,7 +1030,8 @@ class DataStoreWorkbench(WorkBench):
 
         response = yield self._process.message_client.create_instance(DATA_REPLY_MESSAGE_TYPE)
 
-        log.debug("Extract data request bounds: %s", ["%d+%d,%d" % (x.origin, x.size, x.stride) for x in request.request_bounds])
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Extract data request bounds: %s", ["%d+%d,%d" % (x.origin, x.size, x.stride) for x in request.request_bounds])
 
         # create an anonymous repo to load things into
         repo = self.create_repository(root_type=ARRAY_STRUCTURE_TYPE)
@@ -1062,7 +1063,7 @@ class DataStoreWorkbench(WorkBench):
 
         # now onto the fun.  let's traverse all the bounded arrays we find!
 
-        log.debug("op_extract_data: obj has %d bounded arrays" % len(obj.bounded_arrays))
+        log.debug("op_extract_data: obj has %d bounded arrays", len(obj.bounded_arrays))
 
         # get the type of bounded array we have here
         assert len(obj.bounded_arrays) > 0
@@ -1157,7 +1158,7 @@ class DataStoreWorkbench(WorkBench):
         if ITEM_SIZE < 8:
             CHUNK_FACTOR = 16000
 
-        log.debug("LRU Cache Limit set at %d bytes, CHUNK_FACTOR is %d elements" % (LRU_DICT_LIMIT, CHUNK_FACTOR))
+        log.debug("LRU Cache Limit set at %d bytes, CHUNK_FACTOR is %d elements", LRU_DICT_LIMIT, CHUNK_FACTOR)
 
         # ===================================================================
         # STEP 2: Compress/Optimize bounded_includes_list for overlap
@@ -1186,14 +1187,14 @@ class DataStoreWorkbench(WorkBench):
                     targetslicelen = targetslice[1] - targetslice[0]
                     srcslicelen = srcslice[1] - srcslice[0]
                     if targetslicelen > CHUNK_FACTOR:
-                        log.debug("target slice len (%d) exceeds CHUNK_FACTOR, splitting" % targetslicelen)
+                        log.debug("target slice len (%d) exceeds CHUNK_FACTOR, splitting", targetslicelen)
 
                         upperbound = targetslicelen / CHUNK_FACTOR      # this is int division, we want to know about whole chunks only here, we'll catch leftovers below
 
                         # figure out our chunk factor for the source as we may have striding applied
                         src_chunk_factor = (srcslicelen * CHUNK_FACTOR) / targetslicelen
 
-                        log.debug("upperbound: %d, src chunk factor: %d" % (upperbound, src_chunk_factor))
+                        log.debug("upperbound: %d, src chunk factor: %d", upperbound, src_chunk_factor)
 
                         for i in xrange(upperbound):
                             offset = i * CHUNK_FACTOR
@@ -1202,7 +1203,7 @@ class DataStoreWorkbench(WorkBench):
                             src_offset = i * src_chunk_factor
                             src_len = min(srcslicelen - src_offset, src_chunk_factor)
 
-                            log.debug("Taking: # %d, offset %d, len %d (src: %d+%d)" % (i, offset, thislen, src_offset, src_len))
+                            log.debug("Taking: # %d, offset %d, len %d (src: %d+%d)", i, offset, thislen, src_offset, src_len)
 
                             # compute new src and target slices
                             newtslice = (targetslice[0] + offset, targetslice[0] + offset + thislen)
@@ -1214,7 +1215,7 @@ class DataStoreWorkbench(WorkBench):
                         # get any remnants
                         left = targetslicelen % CHUNK_FACTOR
                         if left > 0:
-                            log.debug("Adding remainder of %d items" % left)
+                            log.debug("Adding remainder of %d items", left)
 
                             src_left = srcslicelen % src_chunk_factor
                             newtslice = (targetslice[1] - left, targetslice[1])
@@ -1227,7 +1228,7 @@ class DataStoreWorkbench(WorkBench):
                     else:
                         striplist.append((ba, targetslice, srcslice, targetslicelen, laststridelen))
 
-        log.debug("Number of uncompressed strips: %d" % len(striplist))
+        log.debug("Number of uncompressed strips: %d", len(striplist))
 
         # ===================================================================
         # STEP 4: Sort that list of matching strips by start index in target array to start index + length
@@ -1272,7 +1273,7 @@ class DataStoreWorkbench(WorkBench):
         if accumstrip is not None:
             compressed_striplist.append(accumstrip)
 
-        log.debug("Number of compressed strips: %d" % len(compressed_striplist))
+        log.debug("Number of compressed strips: %d", len(compressed_striplist))
 
         # ===================================================================
         # STEP 5b: find overlapping strips and omit them.
@@ -1295,7 +1296,7 @@ class DataStoreWorkbench(WorkBench):
                 if targetslice[0] >= ntargetslice[0] and targetslice[0] < ntargetslice[1]:
                     # we have an intersection, figure out length of intersection
                     intlen = ntargetslice[1] - targetslice[0]
-                    log.debug("intersection: %d, %d in %d, %d, len of %d" % (targetslice[0], targetslice[1], ntargetslice[0], ntargetslice[1], intlen))
+                    log.debug("intersection: %d, %d in %d, %d, len of %d", targetslice[0], targetslice[1], ntargetslice[0], ntargetslice[1], intlen)
 
                     # decision point: if the whole intersection is covered already, throw it out
                     if targetslice[0] + intlen >= targetslice[1]:
@@ -1310,7 +1311,7 @@ class DataStoreWorkbench(WorkBench):
                                                                                         # coordinates, we need to shave off intlen * stride in source.
                         leng = targetslice[1] - targetslice[0]
 
-                        log.debug("split slice into %d,%d -> %d,%d length %d" % (targetslice[0], targetslice[1], srcslice[0], srcslice[1], leng))
+                        log.debug("split slice into %d,%d -> %d,%d length %d", targetslice[0], targetslice[1], srcslice[0], srcslice[1], leng)
             else:
                 # no break, means we either don't intersect at all, or we split up to not intersect
                 #log.debug("adding slice")
@@ -1320,7 +1321,7 @@ class DataStoreWorkbench(WorkBench):
         if log.getEffectiveLevel() <= logging.DEBUG:
             lennonoverlap = len(non_overlap_striplist)
             lencstriplist = len(compressed_striplist)
-            log.debug("Number of non-overlapping strips: %d (%d eliminated)" % (lennonoverlap, lencstriplist - lennonoverlap))
+            log.debug("Number of non-overlapping strips: %d (%d eliminated)", lennonoverlap, lencstriplist - lennonoverlap)
 
         # replace compressed striplist to work below
         compressed_striplist = non_overlap_striplist
@@ -1378,7 +1379,7 @@ class DataStoreWorkbench(WorkBench):
                 elemcount = reduce(lambda x, y: x+y, [x[3] for x in curstrips])
                 targetndarray = [None] * elemcount
 
-                log.debug("Extraction step %d, # strips: %d, element count: %d, start index: %d" % (exidx, len(curstrips), elemcount, targetstartidx))
+                log.debug("Extraction step %d, # strips: %d, element count: %d, start index: %d", exidx, len(curstrips), elemcount, targetstartidx)
 
                 # ok, now we can perform the extractions on this step
                 targetoffset = 0
@@ -1403,7 +1404,7 @@ class DataStoreWorkbench(WorkBench):
                 # ensure we filled this chunk
                 nonelist = [i for i,d in enumerate(targetndarray) if d is None]
                 if len(nonelist) > 0:
-                    log.error("extract_data: Nones found in targetndarray prior to send: %s" % str(nonelist))
+                    log.error("extract_data: Nones found in targetndarray prior to send: %s", nonelist)
                     raise DataStoreWorkBenchError("Data extraction did not properly fill in all members of response ndarray!")
 
                 # SEND THIS CHUNK
@@ -1445,7 +1446,7 @@ class DataStoreWorkbench(WorkBench):
         Sends a data chunk message (from op_extract_data).  This is split out to facilitate
         testing via monkeypatching this method.
         """
-        log.debug("_send_data_chunk to %s" % data_routing_key)
+        log.debug("_send_data_chunk to %s", data_routing_key)
         yield self._process.send(data_routing_key, 'noop', chunkmsg)
 
 
@@ -1552,7 +1553,7 @@ class DataStoreWorkbench(WorkBench):
                                            rc+1):
                             yield xx
                     else:
-                        log.debug("IGNOREING STRIDED OUT DIM tv/sv %d,%d len dims %d" % (tv, sv, len(trs)))
+                        log.debug("IGNOREING STRIDED OUT DIM tv/sv %d,%d len dims %d", tv, sv, len(trs))
 
         # iterate through all recslice generated slicepairs
         for x in recslice(targetranges[:-1],
@@ -1610,7 +1611,7 @@ class DataStoreWorkbench(WorkBench):
         if commit is None:
             commit = repo.current_heads()[0]
 
-        log.debug("GetObject: using commit %s" % sha1_to_hex(commit.MyId))
+        log.debug("GetObject: using commit %s", sha1_to_hex(commit.MyId))
 
         link = commit.GetLink('objectroot')
 
@@ -1681,7 +1682,7 @@ class DataStoreService(ServiceProcess):
 
         self._backend_classes={}
 
-        log.info('conf username:%s' % CONF.getValue("username"))
+        log.info('conf username:%s', CONF.getValue("username"))
         self._username = self.spawn_args.get("username", CONF.getValue("username", None))
         self._password = self.spawn_args.get("password", CONF.getValue("password",None))
 
@@ -1721,7 +1722,7 @@ class DataStoreService(ServiceProcess):
         # Service life cycle state. Initialize service here. Can use yields.
         if issubclass(self._backend_classes[COMMIT_CACHE], cassandra.CassandraStore):
             #raise NotImplementedError('Startup for cassandra store is not yet complete')
-            log.info("Instantiating Cassandra Index Store: %s" % self._backend_classes[COMMIT_CACHE])
+            log.info("Instantiating Cassandra Index Store: %s", self._backend_classes[COMMIT_CACHE])
 
             storage_provider = self._storage_conf[STORAGE_PROVIDER]
             keyspace = self._storage_conf[PERSISTENT_ARCHIVE]['name']
@@ -1750,7 +1751,7 @@ class DataStoreService(ServiceProcess):
 
         if issubclass(self._backend_classes[BLOB_CACHE], cassandra.CassandraStore):
             #raise NotImplementedError('Startup for cassandra store is not yet complete')
-            log.info("Instantiating Cassandra Store: %s" % self._backend_classes[BLOB_CACHE])
+            log.info("Instantiating Cassandra Store: %s", self._backend_classes[BLOB_CACHE])
 
             storage_provider = self._storage_conf[STORAGE_PROVIDER]
             keyspace = self._storage_conf[PERSISTENT_ARCHIVE]['name']
@@ -1812,7 +1813,7 @@ class DataStoreService(ServiceProcess):
 
                 exists = yield self.workbench.test_existence(value[ID_CFG])
                 if not exists:
-                    log.info('Preloading Predicate:' + str(value.get(PREDICATE_CFG)))
+                    log.info('Preloading Predicate:%s', value.get(PREDICATE_CFG))
                     predicate_repo = self._create_predicate(value)
                     if predicate_repo is None:
                         raise DataStoreError('Failed to create predicate: %s' % str(value))
@@ -1842,7 +1843,7 @@ class DataStoreService(ServiceProcess):
             for key, value in ION_ROLES.items():
                 exists = yield self.workbench.test_existence(value[ID_CFG])
                 if not exists:
-                    log.info('Preloading Role Resources:' + str(value.get(NAME_CFG)))
+                    log.info('Preloading Role Resources:%s', value.get(NAME_CFG))
 
                     resource_instance = self._create_resource(value)
                     if resource_instance is None:
@@ -1861,7 +1862,7 @@ class DataStoreService(ServiceProcess):
 
                 exists = yield self.workbench.test_existence(value[ID_CFG])
                 if not exists:
-                    log.info('Preloading Resource Type:' + str(value.get(NAME_CFG)))
+                    log.info('Preloading Resource Type:%s', value.get(NAME_CFG))
 
                     resource_instance = self._create_resource(value)
                     if resource_instance is None:
@@ -1879,7 +1880,7 @@ class DataStoreService(ServiceProcess):
 
                 exists = yield self.workbench.test_existence(value[ID_CFG])
                 if not exists:
-                    log.info('Preloading Identity:' + str(value.get(NAME_CFG)))
+                    log.info('Preloading Identity:%s', value.get(NAME_CFG))
 
                     resource_instance = self._create_resource(value)
                     if resource_instance is None:
@@ -1891,19 +1892,19 @@ class DataStoreService(ServiceProcess):
 
                     
         if self.preload[ION_DATASETS_CFG]:
-            log.info('Preloading Data Sets: %d' % len(ION_DATASETS))
+            log.info('Preloading Data Sets: %d', len(ION_DATASETS))
 
             for key, value in ION_DATASETS.items():
                 exists = yield self.workbench.test_existence(value[ID_CFG])
                 if not exists:
-                    log.info('Preloading DataSet:' + str(value.get(NAME_CFG)))
+                    log.info('Preloading DataSet:%s', value.get(NAME_CFG))
 
                     resource_instance = self._create_resource(value)
                     # Do not fail if returning none - may or may not load data from disk
                     if resource_instance is not None:
 
                         owner = value.get(OWNER_ID) or ANONYMOUS_USER_ID
-                        log.info('Dataset Owner ID: %s' % owner)
+                        log.info('Dataset Owner ID: %s', owner)
 
                         self._create_ownership_association(resource_instance.Repository, owner)
 
@@ -1912,18 +1913,18 @@ class DataStoreService(ServiceProcess):
                         del ION_DATASETS[key]
 
 
-            log.info('Preloading Data Sources: %d' % len(ION_DATA_SOURCES))
+            log.info('Preloading Data Sources: %d', len(ION_DATA_SOURCES))
             for key, value in ION_DATA_SOURCES.items():
                 exists = yield self.workbench.test_existence(value[ID_CFG])
                 if not exists:
-                    log.info('Preloading DataSource:' + str(value.get(NAME_CFG)))
+                    log.info('Preloading DataSource:%s', value.get(NAME_CFG))
 
                     resource_instance = self._create_resource(value)
                     # Do not fail if returning none - may or may not load data from disk
                     if resource_instance is not None:
 
                         owner = value.get(OWNER_ID) or ANONYMOUS_USER_ID
-                        log.info('Datasource Owner ID: %s' % owner)
+                        log.info('Datasource Owner ID: %s', owner)
 
                         self._create_ownership_association(resource_instance.Repository, owner)
                     else:
@@ -1936,7 +1937,7 @@ class DataStoreService(ServiceProcess):
             for key, value in ION_AIS_RESOURCES.items():
                 exists = yield self.workbench.test_existence(value[ID_CFG])
                 if not exists:
-                    log.info('Preloading AIS Resource:' + str(value.get(NAME_CFG)))
+                    log.info('Preloading AIS Resource:%s', value.get(NAME_CFG))
 
                     resource_instance = self._create_resource(value)
                     if resource_instance is None:
@@ -2064,7 +2065,7 @@ class DataStoreService(ServiceProcess):
 
         else:
             self.workbench.clear_repository_key(resource_key)
-            log.info('Retrieving content for resource "%s" failed.  This resource instance will not be added to the repository!' % resource_name)
+            log.info('Retrieving content for resource "%s" failed.  This resource instance will not be added to the repository!', resource_name)
             return None
 
 
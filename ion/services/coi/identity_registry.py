@@ -14,6 +14,10 @@ from ion.core import ioninit
 
 CONF = ioninit.config(__name__)
 
+# Seconds to wait for the role table of a running identity registry at start;
+# without an answer (or with 0) the role associations are read instead
+CF_role_table_timeout = CONF.getValue('role_table_timeout', 2)
+
 from ion.core.messaging.receiver import FanoutReceiver
 from ion.core.process.process import ProcessFactory
 from ion.core.process.service_process import ServiceProcess, ServiceClient
@@ -34,7 +38,7 @@ from ion.core.intercept.policy import subject_has_admin_role, \
                                       subject_has_marine_operator_role, \
                                       map_ooi_id_to_subject_marine_operator_role, \
                                       map_ooi_id_to_role, unmap_ooi_id_from_role, \
-                                      get_current_roles, all_roles, load_roles_from_associations
+                                      get_current_roles, all_roles, load_roles_from_associations, role_table
 
 from ion.services.coi.datastore_bootstrap.ion_preload_config \
     import IDENTITY_RESOURCE_TYPE_ID, TYPE_OF_ID, HAS_ROLE_ID, ROLE_NAMES_BY_ID, ROLE_IDS_BY_NAME
@@ -213,6 +217,16 @@ class IdentityRegistryClient(ServiceClient):
         (content, headers, msg) = yield self.rpc_send('get_role', {'user-id': user_id})
         defer.returnValue(content)
 
+    @defer.inlineCallbacks
+    def get_role_table(self, **kwargs):
+        """
+        Get a snapshot of the role table of an identity registry
+        """
+        log.debug("in get_role_table client")
+        yield self._check_init()
+        (content, headers, msg) = yield self.rpc_send('get_role_table', {}, **kwargs)
+        defer.returnValue(content)
+
 class IdentityRegistryException(ApplicationError):
     """
     IdentityRegistryService exception class
@@ -227,6 +241,13 @@ class IdentityRegistryService(ServiceProcess):
         super(IdentityRegistryService, self).__init__(*args, **kwargs)
 
         self.broadcast_count = 0
+        # Role broadcasts received while the role table is loaded
+        self.role_broadcasts = None
+
+        # Maps certificate subjects to identity resource ids, see _findUser
+        self.subject_index = {}
+        # Identity resource ids already read into the subject index
+        self.indexed_ids = set()
 
     def slc_init(self):
         """
@@ -243,10 +264,38 @@ class IdentityRegistryService(ServiceProcess):
     @defer.inlineCallbacks
     def slc_activate(self):
         # Setup broadcast channel (for policy reloading)
+        self.role_broadcasts = []
         self.bc_receiver = yield get_broadcast_receiver(self.receive, self.receive_error)
 
-        # Load current role associations
-        yield load_roles_from_associations(self.asc)
+        # Load current roles
+        yield self._load_role_table()
+
+        # Read the subjects of the registered users
+        yield self._update_subject_index()
+
+    @defer.inlineCallbacks
+    def _load_role_table(self):
+        """
+        Restore the role table from a snapshot of a running identity registry,
+        or read all the role associations if none answers. Then apply the role
+        broadcasts received meanwhile: they set or unset a role of a user, so
+        applying one the snapshot already contains changes nothing.
+        """
+        restored = False
+        if CF_role_table_timeout:
+            try:
+                content = yield self.irc.get_role_table(timeout=CF_role_table_timeout)
+                role_table.restore(content['snapshot'])
+                restored = True
+            except Exception, ex:
+                log.info('No role table from a running identity registry (%s), reading the role associations' % (ex))
+
+        if not restored:
+            yield load_roles_from_associations(self.asc)
+
+        role_broadcasts, self.role_broadcasts = self.role_broadcasts, None
+        for content in role_broadcasts:
+            self._apply_role_broadcast(content)
 
     @defer.inlineCallbacks
     def op_register_user_credentials(self, request, headers, msg):
@@ -293,6 +342,9 @@ class IdentityRegistryService(ServiceProcess):
        
         yield self.rc.put_instance(identity, 'Adding identity %s' % identity.subject)
         log.debug('Commit completed, %s' % identity.ResourceIdentity)
+
+        self.indexed_ids.add(identity.ResourceIdentity)
+        self.subject_index.setdefault(identity.subject, identity.ResourceIdentity)
         
         # Optionally map OOI ID to subject in admin role dictionary
         if subject_has_admin_role(identity.subject):
@@ -448,11 +500,11 @@ class IdentityRegistryService(ServiceProcess):
 
         identity, ooi_id = yield self._findUser(request.configuration.subject)
         if ooi_id != None:
-           log.debug('get_ooiid_for_user: ooi_id = '+ooi_id.key)
+           log.debug('get_ooiid_for_user: ooi_id = '+ooi_id)
            # Create the response object...
            Response = yield self.message_client.create_instance(RESOURCE_CFG_RESPONSE_TYPE, MessageName='IR response')
            Response.resource_reference = Response.CreateObject(USER_OOIID_TYPE)
-           Response.resource_reference.ooi_id = ooi_id.key
+           Response.resource_reference.ooi_id = ooi_id
            Response.result = "OK"
            defer.returnValue(Response)
         else:
@@ -613,6 +665,17 @@ class IdentityRegistryService(ServiceProcess):
         response = {'roles': roles}
         yield self.reply_ok(msg, response)
 
+    @defer.inlineCallbacks
+    def op_get_role_table(self, content, headers, msg):
+        """
+        Service operation: {'snapshot'} of the whole role table. Lets a starting
+        identity registry restore the roles without reading all the role
+        associations. The version of the snapshot is only meaningful to the
+        role table it was taken from.
+        """
+        response = {'snapshot': role_table.snapshot()}
+        yield self.reply_ok(msg, response)
+
     def op_broadcast(self, content, headers, msg):
         """
         Service operation: communication amongst identity registry containers
@@ -621,20 +684,56 @@ class IdentityRegistryService(ServiceProcess):
         log.info('op_broadcast(): Received identity registry broadcast #%d' % (self.broadcast_count))
 
         if 'op' in content:
-            op = content['op']
-            log.info('doing op_broadcast operation %s' % (op))
-            if op == 'set_user_role':
-                map_ooi_id_to_role(content['user-id'], content['role'])
-            elif op == 'unset_user_role':
-                unmap_ooi_id_from_role(content['user-id'], content['role'])
+            if self.role_broadcasts is not None:
+                log.info('queueing op_broadcast operation %s until the role table is loaded' % (content['op']))
+                self.role_broadcasts.append(content)
+            else:
+                self._apply_role_broadcast(content)
+
+    def _apply_role_broadcast(self, content):
+        op = content['op']
+        log.info('doing op_broadcast operation %s' % (op))
+        if op == 'set_user_role':
+            map_ooi_id_to_role(content['user-id'], content['role'])
+        elif op == 'unset_user_role':
+            unmap_ooi_id_from_role(content['user-id'], content['role'])
 
     @defer.inlineCallbacks
     def _findUser(self, Subject):
         """
-        Implementation of User find that uses the registry and associations.
+        Implementation of User find that uses the subject index, returns the
+        identity resource and its ooi_id or [None, None].
         """
         log.debug('_findUser searching for "%s"' %Subject)
-        
+
+        for attempt in range(2):
+            ooi_id = self.subject_index.get(Subject)
+            if ooi_id is None:
+                # The user may have been registered by another identity registry
+                yield self._update_subject_index()
+                ooi_id = self.subject_index.get(Subject)
+                if ooi_id is None:
+                    break
+
+            Resource = yield self.rc.get_instance(ooi_id)
+            if Subject == getattr(Resource, 'subject'):
+                log.debug('subject %s found'%Subject)
+                defer.returnValue([Resource, ooi_id])
+
+            # The identity no longer has this subject, read it again
+            log.info('subject index entry for %s is stale' % Subject)
+            del self.subject_index[Subject]
+            self.indexed_ids.discard(ooi_id)
+
+        log.debug('subject %s not found'%Subject)
+        defer.returnValue([None, None])
+
+    @defer.inlineCallbacks
+    def _update_subject_index(self):
+        """
+        Adds the subjects of identity resources which are not in the subject
+        index yet. Only new identities are pulled from the datastore.
+        """
         # get all the identity resources out of the Association Service
         request = yield self.message_client.create_instance(PREDICATE_OBJECT_QUERY_TYPE)
         pair = request.pairs.add()
@@ -651,15 +750,16 @@ class IdentityRegistryService(ServiceProcess):
    
         ooi_id_list = yield self.asc.get_subjects(request)     
 
-        # Now we have a list of ooi_ids. Gotta pull and search them individually.
-        for ooi_id in ooi_id_list.idrefs:
+        for idref in ooi_id_list.idrefs:
+            ooi_id = str(idref.key)
+            if ooi_id in self.indexed_ids:
+                continue
             Resource = yield self.rc.get_instance(ooi_id)
-            if Subject == getattr(Resource, 'subject'):
-                log.debug('subject %s found'%Subject)
-                defer.returnValue([Resource, ooi_id])
+            self.indexed_ids.add(ooi_id)
+            # Keep the first identity found for a subject
+            self.subject_index.setdefault(Resource.subject, ooi_id)
 
-        log.debug('subject %s not found'%Subject)
-        defer.returnValue([None, None])
+        log.debug('subject index holds %d identities' % len(self.indexed_ids))
 
 
     def _CheckRequest(self, request):
@@ -13,6 +13,7 @@ log = ion.util.ionlog.getLogger(__name__)
 from twisted.internet import defer
 
 from ion.test.iontest import IonTestCase
+from ion.services.coi import identity_registry
 from ion.services.coi.identity_registry import IdentityRegistryClient
 from ion.core.exception import ReceivedApplicationError
 from ion.core.data.storage_configuration_utility import COMMIT_INDEXED_COLUMNS, COMMIT_CACHE
@@ -20,7 +21,7 @@ from ion.services.coi.datastore import ION_DATASETS_CFG, PRELOAD_CFG, ION_AIS_RE
 
 from ion.core.object import object_utils
 from ion.core.messaging.message_client import MessageClient
-from ion.core.intercept.policy import user_has_role
+from ion.core.intercept.policy import user_has_role, role_table, RoleTable
 from ion.core.security.authentication import Authentication
 
 CONF = ioninit.config(__name__)
@@ -409,6 +410,49 @@ xN/XW/CKTL9f05RpuHULaoNHcOqi56m+Cs6jUaOuVwPxn5T0YoN/Tp24hbRfxFvMG34V
         self.assertEqual(authentication.get_certificate_level(self.user1_certificate),'Invalid')
         self.assertFalse(authentication.is_certificate_within_date_range(self.user1_certificate))
 
+    @defer.inlineCallbacks
+    def test_find_user_subject_index(self):
+        irs = self._get_service_by_name('identity_registry')
+        self.assertTrue(len(irs.subject_index) > 1)
+        self.assertEqual(irs.subject_index[self.user2_subject], self.user2_ooi_id)
+
+        # Count the identities pulled from the datastore
+        pulled = []
+        get_instance = irs.rc.get_instance
+        def counting_get_instance(resource_id, *args, **kwargs):
+            pulled.append(resource_id)
+            return get_instance(resource_id, *args, **kwargs)
+        self.patch(irs.rc, 'get_instance', counting_get_instance)
+
+        IdentityRequest = yield self.mc.create_instance(RESOURCE_CFG_REQUEST_TYPE, MessageName='IR request')
+        IdentityRequest.configuration = IdentityRequest.CreateObject(IDENTITY_TYPE)
+        IdentityRequest.configuration.subject = self.user2_subject
+        Response = yield self.irc.get_ooiid_for_user(IdentityRequest)
+        self.assertEqual(Response.resource_reference.ooi_id, self.user2_ooi_id)
+        self.assertEqual(pulled, [self.user2_ooi_id])
+
+        # Unknown subjects only pull identities which are not indexed yet
+        del pulled[:]
+        IdentityRequest.configuration.subject = self.user1_subject
+        try:
+            yield self.irc.get_ooiid_for_user(IdentityRequest)
+            self.fail("get_ooiid_for_user found an unregistered user")
+        except ReceivedApplicationError, ex:
+            self.assertEqual(ex.msg_content.MessageResponseCode, IdentityRequest.ResponseCodes.NOT_FOUND)
+        self.assertEqual(pulled, [])
+
+        # A registered user is indexed
+        IdentityRequest.configuration.certificate = self.user1_certificate
+        IdentityRequest.configuration.rsa_private_key = self.user1_rsa_private_key
+        Response = yield self.irc.register_user(IdentityRequest)
+        ooi_id1 = Response.resource_reference.ooi_id
+        self.assertEqual(irs.subject_index[self.user1_subject], ooi_id1)
+
+        del pulled[:]
+        Response = yield self.irc.authenticate_user(IdentityRequest)
+        self.assertEqual(Response.resource_reference.ooi_id, ooi_id1)
+        self.assertEqual(pulled, [ooi_id1])
+
     @defer.inlineCallbacks
     def test_broadcast(self):
         irs = self._get_service_by_name('identity_registry')
@@ -465,3 +509,74 @@ xN/XW/CKTL9f05RpuHULaoNHcOqi56m+Cs6jUaOuVwPxn5T0YoN/Tp24hbRfxFvMG34V
         yield self.irc.unset_role(user_id, role)
         self.failIf(user_has_role(user_id, 'EARLY_ADOPTER'))
         self.failIf(user_has_role(user_id, 'MARINE_OPERATOR'))
+
+    @defer.inlineCallbacks
+    def test_get_role_table(self):
+        # Prevent broadcasts from interfering
+        irs = self._get_service_by_name('identity_registry')
+        self.patch(irs, 'op_broadcast', lambda *args: None)
+
+        user_id = self.user2_ooi_id
+        table = yield self.irc.get_role_table()
+        self.failIf('EARLY_ADOPTER' in table['snapshot']['users'].get(user_id, []))
+
+        yield self.irc.set_role(user_id, 'EARLY_ADOPTER')
+        table = yield self.irc.get_role_table()
+        self.failUnless('EARLY_ADOPTER' in table['snapshot']['users'][user_id])
+
+        # A replica restores the snapshot
+        replica = RoleTable()
+        replica.restore(table['snapshot'])
+        self.failUnless(replica.has_role(user_id, 'EARLY_ADOPTER'))
+        self.assertEqual(replica.snapshot(), role_table.snapshot())
+
+        yield self.irc.unset_role(user_id, 'EARLY_ADOPTER')
+
+    @defer.inlineCallbacks
+    def test_role_table_warm_start(self):
+        # Record how a second identity registry loads the roles
+        scans = []
+        self.patch(identity_registry, 'load_roles_from_associations', lambda asc: scans.append(asc))
+        snapshots = []
+        restore = role_table.restore
+        def recording_restore(snapshot):
+            snapshots.append(snapshot)
+            restore(snapshot)
+        self.patch(role_table, 'restore', recording_restore)
+
+        user_id = self.user2_ooi_id
+        yield self.irc.set_role(user_id, 'EARLY_ADOPTER')
+        snapshot = role_table.snapshot()
+
+        services = [
+            {'name':'identity_registry2','module':'ion.services.coi.identity_registry','class':'IdentityRegistryService'}
+        ]
+        yield self._spawn_processes(services)
+
+        # Restored from the running identity registry, not from the associations
+        self.assertEqual(scans, [])
+        self.assertEqual(snapshots, [snapshot])
+        self.failUnless(user_has_role(user_id, 'EARLY_ADOPTER'))
+
+        yield self.irc.unset_role(user_id, 'EARLY_ADOPTER')
+
+    def test_role_broadcasts_while_loading(self):
+        irs = self._get_service_by_name('identity_registry')
+        user_id = self.user2_ooi_id
+        self.failIf(user_has_role(user_id, 'EARLY_ADOPTER'))
+
+        # Queued while the role table loads, applied after it
+        self.patch(irs, 'role_broadcasts', [])
+        irs.op_broadcast({'op': 'set_user_role', 'user-id': user_id, 'role': 'EARLY_ADOPTER'}, {}, None)
+        self.failIf(user_has_role(user_id, 'EARLY_ADOPTER'))
+
+        self.patch(identity_registry, 'CF_role_table_timeout', 0)
+        self.patch(identity_registry, 'load_roles_from_associations', lambda asc: None)
+        d = irs._load_role_table()
+        def check(result):
+            self.failUnless(user_has_role(user_id, 'EARLY_ADOPTER'))
+            self.assertEqual(irs.role_broadcasts, None)
+            irs.op_broadcast({'op': 'unset_user_role', 'user-id': user_id, 'role': 'EARLY_ADOPTER'}, {}, None)
+            self.failIf(user_has_role(user_id, 'EARLY_ADOPTER'))
+        d.addCallback(check)
+        return d
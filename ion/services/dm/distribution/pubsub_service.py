@@ -12,7 +12,6 @@ and defining subscriptions. See the PubSubClient for API documentation.
 """
 
 import time
-import re
 from twisted.internet import defer
 
 from ion.core.exception import ApplicationError
@@ -108,6 +107,11 @@ class PubSubService(ServiceProcess):
         self.mc = MessageClient(proc=self)
         self.asc = AssociationServiceClient(proc=self)
 
+        # Reverse find index, (resource type, field name, value) -> resource id
+        self._rev_index = {}
+        # Resource ids read into the reverse find index, by (resource type, field name)
+        self._rev_indexed = {}
+
     def _check_msg_type(self, request, expected_type):
         """
         @brief Simple helper routine to validate the GPB that arrives against what's expected.
@@ -180,18 +184,12 @@ class PubSubService(ServiceProcess):
         pair.object = type_ref
 
         log.debug('sending off the query')
-        result = yield self.asc.get_subjects(query)
-
-        # @todo Filtering here and not in the registry performs more slowly. Move to registry.
-        log.debug('regex filtering %d registry entries' % len(result.idrefs))
-        idlist = []
-        p = re.compile(regex)
-        for cur_ref in result.idrefs:
-            if p.search(cur_ref.key):
-                idlist.append(cur_ref.key)
-
-        log.debug('Registry query and filter done, %d results from %d records' %
-                  (len(idlist), len(result.idrefs)))
+        # The association service applies the regex to the subject keys
+        result = yield self.asc.get_subjects(query, key_regex=regex)
+
+        idlist = [cur_ref.key for cur_ref in result.idrefs]
+
+        log.debug('Registry query and filter done, %d results', len(idlist))
         defer.returnValue(idlist)
 
     @defer.inlineCallbacks
@@ -217,22 +215,51 @@ class PubSubService(ServiceProcess):
     def _rev_find(self, search_value, resource_type, field_name):
         """
         Prototyping an implementation of reverse find that uses the registry and
-        associations.
+        associations. Field values are kept in an index, so only resources that
+        are new to the index are pulled from the registry.
         @note To emulate the python dictionary, it raises KeyError if not found.
         """
-        log.debug('Reverse searching for "%s" in "%s"' % (search_value, field_name))
+        log.debug('Reverse searching for "%s" in "%s"', search_value, field_name)
+
+        key = self._rev_index.get((resource_type, field_name, search_value))
+        if key is not None:
+            defer.returnValue(key)
 
         log.debug('Querying association service for list of references')
         idref_list = yield self._do_registry_query('.+', resource_type)
 
-        # Now we have a list of topic IDREFS. Gotta pull and search same individually.
+        # Now we have a list of topic IDREFS. Gotta pull and search the ones we have not seen.
+        indexed = self._rev_indexed.get((resource_type, field_name), ())
         for cur_ref in idref_list:
+            if cur_ref in indexed:
+                continue
             cur_resource = yield self.rclient.get_instance(cur_ref)
-            if search_value == getattr(cur_resource, field_name):
+            value = getattr(cur_resource, field_name)
+            self._rev_index_add(resource_type, field_name, value, cur_ref)
+            if search_value == value:
                 defer.returnValue(cur_resource.ResourceIdentity)
 
         raise KeyError('%s not in registry', search_value)
 
+    def _rev_index_add(self, resource_type, field_name, value, resource_id):
+        """
+        Add a resource to the reverse find index. The first resource found for
+        a value is kept, as the registry search would return it.
+        """
+        self._rev_index.setdefault((resource_type, field_name, value), resource_id)
+        self._rev_indexed.setdefault((resource_type, field_name), set()).add(resource_id)
+
+    def _rev_index_invalidate(self, resource_type):
+        """
+        Drop the reverse find index of a resource type, it is rebuilt on the next miss.
+        """
+        for key in self._rev_index.keys():
+            if key[0] == resource_type:
+                del self._rev_index[key]
+        for key in self._rev_indexed.keys():
+            if key[0] == resource_type:
+                del self._rev_indexed[key]
+
     @defer.inlineCallbacks
     def op_declare_exchange_space(self, request, headers, msg):
         """
@@ -276,6 +303,8 @@ class PubSubService(ServiceProcess):
         yield self.rclient.put_instance(registry_entry)
         log.debug('Getting resource ID')
         xs_resource_id = self._obj_to_ref(registry_entry)
+        self._rev_index_add(EXCHANGE_SPACE_RES_TYPE_ID, 'exchange_space_name',
+                            request.exchange_space_name, registry_entry.ResourceIdentity)
 
         log.debug('Operation completed, creating response message')
 
@@ -300,6 +329,7 @@ class PubSubService(ServiceProcess):
         # @todo Call EMS to remove the XS
         # @todo Remove resource record too
         log.warn('Here is where we ask EMS to remove the XS')
+        self._rev_index_invalidate(EXCHANGE_SPACE_RES_TYPE_ID)
 
         yield self.reply_ok(msg)
 
@@ -360,6 +390,8 @@ class PubSubService(ServiceProcess):
         log.debug('Saving XP to registry')
         yield self.rclient.put_instance(xp_resource)
         xp_resource_id = self._obj_to_ref(xp_resource)
+        self._rev_index_add(EXCHANGE_POINT_RES_TYPE_ID, 'exchange_point_name',
+                            request.exchange_point_name, xp_resource.ResourceIdentity)
 
         log.debug('Creating reply')
         reply = yield self.mc.create_instance(IDLIST_TYPE)
@@ -380,6 +412,7 @@ class PubSubService(ServiceProcess):
 
         # @todo Look up XS via XPID, call EMS to remove same...
         log.warn('This is where the Actual Work Goes...')
+        self._rev_index_invalidate(EXCHANGE_POINT_RES_TYPE_ID)
         yield self.reply_ok(msg)
 
     @defer.inlineCallbacks
@@ -427,6 +460,8 @@ class PubSubService(ServiceProcess):
 
         log.debug('Saving resource...')
         yield self.rclient.put_instance(topic_resource)
+        self._rev_index_add(TOPIC_RESOURCE_TYPE_ID, 'topic_name',
+                            request.topic_name, topic_resource.ResourceIdentity)
 
         log.debug('Creating reply')
         reply = yield self.mc.create_instance(IDLIST_TYPE)
@@ -450,6 +485,7 @@ class PubSubService(ServiceProcess):
         self._check_msg_type(request, REQUEST_TYPE)
 
         # @todo Remove instance from resource registry
+        self._rev_index_invalidate(TOPIC_RESOURCE_TYPE_ID)
         yield self.reply_ok(msg)
 
     @defer.inlineCallbacks
@@ -509,6 +545,8 @@ class PubSubService(ServiceProcess):
 
         log.debug('Saving publisher resource....')
         yield self.rclient.put_instance(publ_resource)
+        self._rev_index_add(PUBLISHER_RES_TYPE_ID, 'publisher_name',
+                            request.publisher_name, publ_resource.ResourceIdentity)
 
         # Need a reference return value
         pub_ref = self._obj_to_ref(publ_resource)
@@ -529,6 +567,7 @@ class PubSubService(ServiceProcess):
         self._check_msg_type(request, REQUEST_TYPE)
         # @todo Delete from registry
         log.warn('This is where the Actual Work Goes...')
+        self._rev_index_invalidate(PUBLISHER_RES_TYPE_ID)
         yield self.reply_ok(msg)
 
     @defer.inlineCallbacks
@@ -627,6 +666,8 @@ class PubSubService(ServiceProcess):
 
         log.debug('Saving q into registry')
         yield self.rclient.put_instance(q_resource)
+        self._rev_index_add(QUEUE_RES_TYPE_ID, 'queue_name',
+                            request.queue_name, q_resource.ResourceIdentity)
         log.debug('Creating reference')
         q_ref = self._obj_to_ref(q_resource)
 
@@ -647,6 +688,7 @@ class PubSubService(ServiceProcess):
 
         # @todo Delete from registry
         log.warn('This is where the Actual Work Goes...')
+        self._rev_index_invalidate(QUEUE_RES_TYPE_ID)
         yield self.reply_ok(msg)
 
     @defer.inlineCallbacks
@@ -192,6 +192,49 @@ class PST(IonTestCase):
         self.failUnless(len(topic_id.id_list) > 0)
 
 
+    @defer.inlineCallbacks
+    def test_rev_find_index(self):
+        pubsub_id = yield self.sup.get_child_id('pubsub_service')
+        pubsub = self._get_procinstance(pubsub_id)
+
+        # Count the registry reads of the service
+        calls = []
+        get_instance = pubsub.rclient.get_instance
+        def counting_get_instance(*args, **kwargs):
+            calls.append(args)
+            return get_instance(*args, **kwargs)
+        pubsub.rclient.get_instance = counting_get_instance
+
+        xs = yield self._create_xs()
+        xp = yield self._create_xp(xs)
+
+        topic_ids = []
+        counts = []
+        for i in range(10):
+            msg = yield self.create_message(TOPIC_TYPE)
+            msg.exchange_space_id = xs.id_list[0]
+            msg.exchange_point_id = xp.id_list[0]
+            msg.topic_name = 'topic %d' % i
+
+            del calls[:]
+            topic_id = yield self.psc.declare_topic(msg)
+            topic_ids.append(topic_id.id_list[0].key)
+            counts.append(len(calls))
+
+        # Declaring a new topic does not read the existing ones
+        self.assertEqual(counts[1:], [counts[1]] * 9)
+
+        # Declaring an existing topic is found in the index
+        msg = yield self.create_message(TOPIC_TYPE)
+        msg.exchange_space_id = xs.id_list[0]
+        msg.exchange_point_id = xp.id_list[0]
+        msg.topic_name = 'topic 3'
+
+        del calls[:]
+        topic_id = yield self.psc.declare_topic(msg)
+        self.assertEqual(topic_id.id_list[0].key, topic_ids[3])
+        self.assertEqual(len(calls), 0)
+
     @defer.inlineCallbacks
     def test_undeclare_topic(self):
         #raise unittest.SkipTest('Blocked on EMS')
@@ -48,6 +48,11 @@ import logging
 CONF = ioninit.config(__name__)
 log = ion.util.ionlog.getLogger(__name__)
 
+# Chunk processing events are coalesced: at most one is published per this
+# many chunks or seconds, whichever comes first
+CF_processing_event_chunks = CONF.getValue('processing_event_chunks', 50)
+CF_processing_event_interval = CONF.getValue('processing_event_interval', 5.0)
+
 
 CDM_DATASET_TYPE = object_utils.create_type_identifier(object_id=10001, version=1)
 
@@ -146,6 +151,11 @@ class IngestionService(ServiceProcess):
         self._ingestion_processing_publisher = IngestionProcessingEventPublisher(process=self)
         self.add_life_cycle_object(self._ingestion_processing_publisher)        # will move through lifecycle states as appropriate
 
+        # IReactorTime for the ingest timeout and the processing event window
+        self._clock = reactor
+        self._processing_event_chunks = 0
+        self._processing_event_time = 0
+
         log.info('IngestionService.__init__()')
 
     @defer.inlineCallbacks
@@ -355,8 +365,10 @@ class IngestionService(ServiceProcess):
             self._defer_ingest.errback(IngestionError('Time out in communication between the JAW and the Ingestion service', content.ResponseCodes.TIMEOUT))
 
         log.info('Setting up ingest timeout with value: %i' % content.ingest_service_timeout)
-        self.timeoutcb = reactor.callLater(content.ingest_service_timeout, _timeout)
+        self.timeoutcb = self._clock.callLater(content.ingest_service_timeout, _timeout)
         self.timeoutcb.ingest_service_timeout = content.ingest_service_timeout
+        self._processing_event_chunks = 0
+        self._processing_event_time = self._clock.seconds()
 
         log.info(
             'Notifying caller that ingest is ready by invoking op_ingest_ready() using routing key: "%s"' % content.reply_to)
@@ -554,6 +566,36 @@ class IngestionService(ServiceProcess):
         log.debug('_notify_ingest - Complete')
 
 
+    def _reset_timeout(self):
+        """
+        Moves the ingest timeout to ingest_service_timeout seconds from now
+        """
+        log.info('Setting timeout to %d seconds from now' % self.timeoutcb.ingest_service_timeout)
+        self.timeoutcb.reset(self.timeoutcb.ingest_service_timeout)
+
+    def _publish_processing_event(self, convid, processing_step):
+        """
+        Publishes an ingestion processing event. Chunk events are coalesced,
+        one is published per CF_processing_event_chunks chunks or
+        CF_processing_event_interval seconds.
+        @retval Deferred
+        """
+        now = self._clock.seconds()
+        if processing_step == "chunk":
+            self._processing_event_chunks += 1
+            if self._processing_event_chunks < CF_processing_event_chunks and \
+                    now - self._processing_event_time < CF_processing_event_interval:
+                return defer.succeed(None)
+
+        self._processing_event_chunks = 0
+        self._processing_event_time = now
+
+        return self._ingestion_processing_publisher.create_and_publish_event(origin=self.dataset.ResourceIdentity,
+                                                                             dataset_id=self.dataset.ResourceIdentity,
+                                                                             ingestion_process_id=self.id.full,
+                                                                             conv_id=convid,
+                                                                             processing_step=processing_step)
+
     @defer.inlineCallbacks
     def _ingest_op_recv_dataset(self, content, headers, msg, convid="unknown"):
 
@@ -565,21 +607,10 @@ class IngestionService(ServiceProcess):
             msg._state = "ACKED"
             defer.returnValue(None)
 
-        # reset timeout
-        cbtimeout = self.timeoutcb.ingest_service_timeout
-        cbfunc = self.timeoutcb.func
-
-        log.info('Setting timeout to %d seconds from now' % cbtimeout)
-        self.timeoutcb.cancel()
-        self.timeoutcb = reactor.callLater(cbtimeout, cbfunc)
-        self.timeoutcb.ingest_service_timeout = cbtimeout
+        self._reset_timeout()
 
         # notify JAW and others via event that we are still processing
-        yield self._ingestion_processing_publisher.create_and_publish_event(origin=self.dataset.ResourceIdentity,
-                                                                            dataset_id=self.dataset.ResourceIdentity,
-                                                                            ingestion_process_id=self.id.full,
-                                                                            conv_id=convid,
-                                                                            processing_step="dataset")
+        yield self._publish_processing_event(convid, "dataset")
 
         if content.MessageType != CDM_DATASET_TYPE:
             raise IngestionError('Expected message type CDM Dataset Type, received %s'
@@ -631,14 +662,7 @@ class IngestionService(ServiceProcess):
             msg._state = "ACKED"
             defer.returnValue(None)
 
-        # reset timeout
-        cbtimeout = self.timeoutcb.ingest_service_timeout
-        cbfunc = self.timeoutcb.func
-
-        log.info('Setting timeout to %d seconds from now' % cbtimeout)
-        self.timeoutcb.cancel()
-        self.timeoutcb = reactor.callLater(cbtimeout, cbfunc)
-        self.timeoutcb.ingest_service_timeout = cbtimeout
+        self._reset_timeout()
 
         # this is NOT rpc
         if content.MessageType != SUPPLEMENT_MSG_TYPE:
@@ -656,11 +680,7 @@ class IngestionService(ServiceProcess):
         #    raise IngestionError('Calling recv_chunk with a dataset that does not match the received chunk!.')
 
         # notify JAW and others via event that we are still processing
-        yield self._ingestion_processing_publisher.create_and_publish_event(origin=self.dataset.ResourceIdentity,
-                                                                            dataset_id=self.dataset.ResourceIdentity,
-                                                                            ingestion_process_id=self.id.full,
-                                                                            conv_id=convid,
-                                                                            processing_step="chunk")
+        yield self._publish_processing_event(convid, "chunk")
 
         # Get the group out of the datset
         group = self.dataset.root_group
@@ -716,11 +736,7 @@ class IngestionService(ServiceProcess):
             defer.returnValue(None)
 
         # notify JAW and others via event that we are still processing
-        yield self._ingestion_processing_publisher.create_and_publish_event(origin=self.dataset.ResourceIdentity,
-                                                                            dataset_id=self.dataset.ResourceIdentity,
-                                                                            ingestion_process_id=self.id.full,
-                                                                            conv_id=convid,
-                                                                            processing_step="done")
+        yield self._publish_processing_event(convid, "done")
 
         log.info('Cancelling timeout!')
         self.timeoutcb.cancel()
@@ -1920,7 +1936,7 @@ class IngestionService(ServiceProcess):
             try:
                 blobs_msg = yield self.dsc.fetch_blobs(blobs_request)
             except ReceivedError, re:
-               log.debug('ReceivedError', str(re))
+               log.debug('ReceivedError: %s', str(re))
                raise IngestionError('Could not fetch ndarray blobs from the datastore during merge!  Cause: "%s"' % re.msg_content)
 
 
@@ -14,7 +14,7 @@ import ion.util.ionlog
 from ion.util.iontime import IonTime
 
 log = ion.util.ionlog.getLogger(__name__)
-from twisted.internet import defer, reactor
+from twisted.internet import defer, reactor, task
 from twisted.trial import unittest
 import random
 
@@ -25,6 +25,7 @@ from ion.services.coi.datastore_bootstrap.ion_preload_config import PRELOAD_CFG,
 from ion.services.dm.distribution.events import DatasourceUnavailableEventSubscriber, DatasetSupplementAddedEventSubscriber, DATASET_STREAMING_EVENT_ID, get_events_exchange_point
 
 from ion.core.process import process
+from ion.services.dm.ingestion.ingestion import CF_processing_event_chunks, CF_processing_event_interval
 from ion.services.dm.ingestion.ingestion import IngestionClient, IngestionError, SUPPLEMENT_MSG_TYPE, CDM_DATASET_TYPE, DAQ_COMPLETE_MSG_TYPE, PERFORM_INGEST_MSG_TYPE, CREATE_DATASET_TOPICS_MSG_TYPE, EM_URL, EM_ERROR, EM_TITLE, EM_DATASET, EM_END_DATE, EM_START_DATE, EM_TIMESTEPS, EM_DATA_SOURCE, CDM_BOUNDED_ARRAY_TYPE 
 from ion.test.iontest import IonTestCase
 
@@ -464,6 +465,61 @@ class IngestionTest(IonTestCase):
 
 
 
+    @defer.inlineCallbacks
+    def test_processing_event_coalescing(self):
+        """
+        Chunk processing events are coalesced and the timeout timer is reused
+        """
+        content = yield self.ingest.mc.create_instance(PERFORM_INGEST_MSG_TYPE)
+        content.dataset_id = SAMPLE_PROFILE_DATASET_ID
+        content.datasource_id = SAMPLE_PROFILE_DATA_SOURCE_ID
+
+        yield self.ingest._prepare_ingest(content)
+
+        events = []
+        def create_and_publish_event(**kwargs):
+            events.append(kwargs['processing_step'])
+            return defer.succeed(None)
+        self.patch(self.ingest._ingestion_processing_publisher, 'create_and_publish_event', create_and_publish_event)
+
+        clock = task.Clock()
+        self.ingest._clock = clock
+        timeouts = []
+        timeoutcb = clock.callLater(30, timeouts.append, True)
+        timeoutcb.ingest_service_timeout = 30
+        self.ingest.timeoutcb = timeoutcb
+
+        yield self.ingest._publish_processing_event('conv', 'dataset')
+        self.assertEqual(events, ['dataset'])
+
+        # 1000 chunks within one second
+        nchunks = 1000
+        for i in range(nchunks):
+            clock.advance(0.001)
+            self.ingest._reset_timeout()
+            yield self.ingest._publish_processing_event('conv', 'chunk')
+
+        self.assertTrue(CF_processing_event_interval > 1)
+        self.assertEqual(events.count('chunk'), nchunks / CF_processing_event_chunks)
+
+        # One timer for the whole ingest
+        self.assertTrue(self.ingest.timeoutcb is timeoutcb)
+        self.assertEqual(clock.getDelayedCalls(), [timeoutcb])
+
+        # A slow chunk gets its own event
+        del events[:]
+        clock.advance(CF_processing_event_interval)
+        self.ingest._reset_timeout()
+        yield self.ingest._publish_processing_event('conv', 'chunk')
+        self.assertEqual(events, ['chunk'])
+
+        # The timeout still fires ingest_service_timeout after the last chunk
+        clock.advance(29.9)
+        self.assertEqual(timeouts, [])
+        clock.advance(0.2)
+        self.assertEqual(timeouts, [True])
+        self.assertFalse(timeoutcb.active())
+
     @defer.inlineCallbacks
     def test_recv_error(self):
         """
@@ -12,6 +12,7 @@ import ion.util.ionlog
 from net.ooici.core.message.ion_message_pb2 import BAD_REQUEST
 
 log = ion.util.ionlog.getLogger(__name__)
+import re
 from twisted.internet import defer
 
 from ion.core.exception import ApplicationError
@@ -52,6 +53,15 @@ PREDICATE_REFERENCE_TYPE = object_utils.create_type_identifier(object_id=25, ver
 
 LifeCycleStateObject = object_utils.create_type_identifier(object_id=26, version=1)
 
+# Message header of a get_subjects request - a regex the subject keys must match
+SUBJECT_KEY_REGEX = 'subject-key-regex'
+MATCH_ALL_REGEXES = ('', '.*', '.+')
+
+# association_exists_many checks up to this many distinct subjects with a
+# subject, predicate and object query each; more subjects are matched against
+# the rows of a single predicate and object query
+EXISTS_MANY_SUBJECT_QUERIES = 4
+
 class AssociationServiceError(ApplicationError):
     """
     An exception class for the Association Service
@@ -109,10 +119,18 @@ class AssociationService(ServiceProcess):
         log.info('SLC_INIT Association Service: index store class - %s' % self.index_store_class)
 
     @defer.inlineCallbacks
-    def _get_subjects(self, predicate_pairs):
+    def _get_subjects(self, predicate_pairs, key_regex=None):
         life_cycle_pair = None
         type_of_pair = None
 
+        # Filter the subject keys as they come from the index store
+        key_filter = None
+        if key_regex is not None and key_regex not in MATCH_ALL_REGEXES:
+            try:
+                key_filter = re.compile(key_regex).search
+            except re.error, ex:
+                raise AssociationServiceError('Invalid subject key regex "%s" in _get_subjects: %s' % (key_regex, ex), BAD_REQUEST)
+
         subjects = set()
 
         # subject_keys is the set of keys for the associated subjects - to reject quickly any that are not present
@@ -173,6 +191,9 @@ class AssociationService(ServiceProcess):
                 if not first_pair and row[SUBJECT_KEY] not in subject_keys:
                     # The result we are looking for is an intersection operation. If this key is not here escape!
                     continue
+
+                if key_filter is not None and not key_filter(row[SUBJECT_KEY]):
+                    continue
                 current_keys.add(row[SUBJECT_KEY])
 
                 # Get the latest commits for the Subject_Key
@@ -257,6 +278,9 @@ class AssociationService(ServiceProcess):
             # This is a simple search - just add the results!
             for key, row in rows.items():
 
+                if key_filter is not None and not key_filter(row[REPOSITORY_KEY]):
+                    continue
+
                 totalkey = (row[REPOSITORY_KEY] , row[BRANCH_NAME])
 
                 subjects.add(totalkey)
@@ -313,7 +337,7 @@ class AssociationService(ServiceProcess):
         if len(predicate_object_query.pairs) == 0:
             raise AssociationServiceError('Invalid Predicate Object Query received - zero length pairs!', predicate_object_query.ResponseCodes.BAD_REQUEST)
 
-        subjects = yield self._get_subjects(predicate_object_query.pairs)
+        subjects = yield self._get_subjects(predicate_object_query.pairs, headers.get(SUBJECT_KEY_REGEX))
         list_of_subjects = yield self.message_client.create_instance(QUERY_RESULT_TYPE)
 
         for subject in subjects:
@@ -653,6 +677,45 @@ class AssociationService(ServiceProcess):
         yield self.reply_ok(msg, response)
 
 
+    @defer.inlineCallbacks
+    def op_association_exists_many(self, content, headers, msg):
+        """
+        @see AssociationServiceClient.association_exists_many
+        """
+        log.info('op_association_exists_many: ')
+
+        subjects = content['subjects']
+        predicate = content['predicate']
+        obj = content['object']
+
+        counts = {}
+        distinct_subjects = set(subjects)
+        if len(distinct_subjects) <= EXISTS_MANY_SUBJECT_QUERIES:
+            # A few subjects: look up each triple like association_exists
+            for subject in distinct_subjects:
+                rows = yield self._query_association(subject, predicate, obj)
+                counts[subject] = len(rows)
+        else:
+            # One query for the predicate and object, matched against all the subjects
+            q = store.Query()
+            # Get only the latest version of the association!
+            q.add_predicate_gt(BRANCH_NAME,'')
+            q.add_predicate_eq(PREDICATE_KEY, predicate)
+            q.add_predicate_eq(OBJECT_KEY, obj)
+
+            rows = yield self.index_store.query(q)
+
+            for key, row in rows.iteritems():
+                counts[row[SUBJECT_KEY]] = counts.get(row[SUBJECT_KEY], 0) + 1
+
+        response = []
+        for subject in subjects:
+            count = counts.get(subject, 0)
+            if count > 1:
+                raise AssociationServiceError('More than one association found for the specified triple!', BAD_REQUEST)
+            response.append(count == 1)
+
+        yield self.reply_ok(msg, response)
 
 
     def _get_association(self, association_query):
@@ -660,15 +723,20 @@ class AssociationService(ServiceProcess):
         if association_query.MessageType != ASSOCIATION_QUERY_MSG_TYPE:
             raise AssociationServiceError('Unexpected type received \n %s' % str(association_query), association_query.ResponseCodes.BAD_REQUEST)
 
+        return self._query_association(association_query.subject.key, association_query.predicate.key, association_query.object.key)
+
+
+    def _query_association(self, subject, predicate, obj):
+
         q = store.Query()
         # Get only the latest version of the association!
         q.add_predicate_gt(BRANCH_NAME,'')
 
-        q.add_predicate_eq(SUBJECT_KEY, association_query.subject.key)
+        q.add_predicate_eq(SUBJECT_KEY, subject)
 
-        q.add_predicate_eq(PREDICATE_KEY, association_query.predicate.key)
+        q.add_predicate_eq(PREDICATE_KEY, predicate)
 
-        q.add_predicate_eq(OBJECT_KEY, association_query.object.key)
+        q.add_predicate_eq(OBJECT_KEY, obj)
 
         return self.index_store.query(q)
 
@@ -760,19 +828,24 @@ class AssociationServiceClient(ServiceClient):
         ServiceClient.__init__(self, proc, **kwargs)
 
     @defer.inlineCallbacks
-    def get_subjects(self, msg):
+    def get_subjects(self, msg, key_regex=None):
         """
         @brief Find the subjects which have associations including the given predicate object pairs.
         Example Pairs: TypeOf - Dataset, LifeCycleState - Active, Owner - John Doe
             Would return all active dataset resources owned by John Doe
         @param params msg, GPB 15/1, a Predicate Object query message
+        @param key_regex optional regex, only subjects with a matching key are returned
         @retval Query Results GPB 22/1
         @GPB{Input,15,1}
         @GPB{Returns,22,1}
         """
         yield self._check_init()
-        
-        (content, headers, msg) = yield self.rpc_send('get_subjects', msg)
+
+        headers = None
+        if key_regex is not None:
+            headers = {SUBJECT_KEY_REGEX:key_regex}
+
+        (content, headers, msg) = yield self.rpc_send('get_subjects', msg, headers=headers)
         
         defer.returnValue(content)
 
@@ -892,6 +965,22 @@ class AssociationServiceClient(ServiceClient):
 
         defer.returnValue(content)
 
+    @defer.inlineCallbacks
+    def association_exists_many(self, subjects, predicate, obj):
+        """
+        @brief Check the association of many subjects with one predicate and object at once
+        @param subjects a list of subject keys
+        @param predicate the predicate key
+        @param obj the object key
+        @retval a list with True or False for each subject
+        """
+        yield self._check_init()
+
+        (content, headers, msg) = yield self.rpc_send('association_exists_many',
+                                                      {'subjects':list(subjects), 'predicate':predicate, 'object':obj})
+
+        defer.returnValue(content)
+
     @defer.inlineCallbacks
     def get_star(self, msg):
         """
@@ -12,7 +12,7 @@ import ion.util.ionlog
 log = ion.util.ionlog.getLogger(__name__)
 from twisted.internet import defer
 
-from ion.services.dm.inventory.ncml_generator import create_ncml, do_complete_rsync
+from ion.services.dm.inventory.ncml_generator import create_ncml, remove_ncml, list_ncml_ids, do_complete_rsync
 from ion.core import ioninit
 
 from ion.core.process.process import ProcessFactory
@@ -182,6 +182,9 @@ class DatasetController(ServiceProcess):
 
 
 
+        # Dataset ids with NcML files at the last rsync, None before the first
+        self.ncml_ids = None
+
         log.debug('Update interval: %f' % self.update_interval)
         log.debug('NcML URL: %s Local path: %s' % (self.server_url, self.ncml_path))
         log.debug('Scheduler queue name: %s Task ID: %s' % (self.queue_name, self.task_id))
@@ -242,16 +245,38 @@ class DatasetController(ServiceProcess):
         #if check_for_ncml_files(self.ncml_path):
 
         query_result = yield self._get_active_dataset_resources()
+        dataset_ids = set([id_ref.key for id_ref in query_result.idrefs])
+
+        if self.ncml_ids is None:
+            # Remove the files of datasets deleted while the service was down
+            added_ids = dataset_ids
+            removed_ids = list_ncml_ids(self.ncml_path) - dataset_ids
+        else:
+            added_ids = dataset_ids - self.ncml_ids
+            removed_ids = self.ncml_ids - dataset_ids
+
+        if self.ncml_ids is not None and not added_ids and not removed_ids:
+            log.debug('No dataset changes, skipping rsync')
+            defer.returnValue(None)
+
+        log.debug('NcML changes: %d added, %d removed' % (len(added_ids), len(removed_ids)))
+        for dataset_id in added_ids:
+            if create_ncml(dataset_id, self.ncml_path) is None:
+                # Try again on the next tick
+                dataset_ids.discard(dataset_id)
 
-        for id_ref in query_result.idrefs:
-            create_ncml(id_ref.key, self.ncml_path)
+        for dataset_id in removed_ids:
+            remove_ncml(dataset_id, self.ncml_path)
 
-        log.debug('NcML files found, invoking rsync')
+        log.debug('NcML files changed, invoking rsync')
         self.cwd = getcwd()
         chdir(self.ncml_path)
-        yield do_complete_rsync(self.ncml_path, self.server_url)
+        try:
+            yield do_complete_rsync(self.ncml_path, self.server_url)
+        finally:
+            chdir(self.cwd)
 
-        chdir(self.cwd)
+        self.ncml_ids = dataset_ids
         log.debug('rsync complete')
 
         defer.returnValue(None)
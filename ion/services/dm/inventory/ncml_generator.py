@@ -16,8 +16,11 @@ file_template = """<?xml version="1.0" encoding="UTF-8"?>\n<netcdf xmlns="http:/
 """
 
 from os import path, environ, listdir, remove
+import errno
 import fnmatch
+import hashlib
 import os
+import tempfile
 
 from twisted.internet import defer
 from ion.util.os_process import OSProcess
@@ -30,25 +33,97 @@ log = ion.util.ionlog.getLogger(__name__)
 CONF = ioninit.config(__name__)
 RSYNC_CMD = CONF['rsync']
 
+# Files are written via mkstemp, which creates them private. rsync --perms
+# copies the mode to the server, so give them the mode open() would have.
+_umask = os.umask(0)
+os.umask(_umask)
+NCML_FILE_MODE = 0666 & ~_umask
+
+def _content_hash(data):
+    return hashlib.sha1(data).digest()
+
 def create_ncml(id_ref, filepath=""):
     """
-    @brief for a given idref, generate an NcML file in the filepath directory
+    @brief for a given idref, generate an NcML file in the filepath directory.
+    An existing file with the same content is left untouched, so that its
+    mtime does not change and rsync does not transfer it again. Otherwise the
+    file is replaced atomically.
     @param filepath Output directory, defaults to current working directory
     @param id_ref idref object from which we pull GUID
-    @retval File contents, as a string, or None if error
+    @retval True if the file was written, False if it was unchanged, None if error
     """
 
     full_filename = path.join(filepath, id_ref + '.ncml')
-    log.debug('Generating NcML file %s' % full_filename)
+    contents = file_template % id_ref
+
     try:
-        fh = open(full_filename, 'w')
-        fh.write(file_template % id_ref)
-        fh.close()
+        fh = open(full_filename, 'rb')
+        try:
+            old_contents = fh.read()
+        finally:
+            fh.close()
     except IOError:
+        old_contents = None
+
+    if old_contents is not None and _content_hash(old_contents) == _content_hash(contents):
+        log.debug('NcML file %s unchanged' % full_filename)
+        return False
+
+    log.debug('Generating NcML file %s' % full_filename)
+    tmp_filename = None
+    try:
+        # Temp file in the same directory, rename() does not cross file systems
+        fd, tmp_filename = tempfile.mkstemp(suffix='.tmp', prefix='.' + id_ref, dir=filepath or '.')
+        fh = os.fdopen(fd, 'wb')
+        try:
+            fh.write(contents)
+        finally:
+            fh.close()
+        os.chmod(tmp_filename, NCML_FILE_MODE)
+        os.rename(tmp_filename, full_filename)
+    except (IOError, OSError):
         log.exception('Error writing NcML file')
+        if tmp_filename is not None and path.exists(tmp_filename):
+            remove(tmp_filename)
         return None
 
-    return file_template % id_ref
+    return True
+
+def remove_ncml(id_ref, filepath=""):
+    """
+    @brief for a given idref, remove its NcML file from the filepath directory
+    @param filepath Output directory, defaults to current working directory
+    @param id_ref idref object from which we pull GUID
+    @retval True if a file was removed, False if there was none or on error
+    """
+
+    full_filename = path.join(filepath, id_ref + '.ncml')
+    log.debug('Removing NcML file %s' % full_filename)
+    try:
+        remove(full_filename)
+    except OSError, ex:
+        if ex.errno == errno.ENOENT:
+            # Removed before a failed rsync, or never written
+            log.debug('NcML file %s already removed' % full_filename)
+        else:
+            log.exception('Error removing NcML file')
+        return False
+
+    return True
+
+def list_ncml_ids(local_filepath):
+    """
+    @brief The idrefs of the NcML files in a directory
+    @param local_filepath Directory to look in
+    @retval set of idrefs, empty if there are no files or on error
+    """
+    try:
+        allfiles = listdir(local_filepath)
+    except OSError:
+        log.exception('Error listing ncml files in %s' % local_filepath)
+        return set()
+
+    return set([fname[:-len('.ncml')] for fname in allfiles if fname.endswith('.ncml')])
 
 def check_for_ncml_files(local_filepath):
     """
@@ -61,19 +136,14 @@ def check_for_ncml_files(local_filepath):
 
     try:
         allfiles = listdir(local_filepath)
-        log.debug("all files %s" % (allfiles,))
-        ncml_files = []
-        for fname in allfiles:
-            log.debug("Got file %s" % (fname,))
-            if fnmatch.fnmatch(fname, '*.ncml'):
-                ncml_files.append(fname)
-    except IOError:
+    except OSError:
         log.exception('Error searching %s for ncml files' % local_filepath)
         return False
-    
-    log.debug("len(ncml_files): %s"% (len(ncml_files),))
-    if len(ncml_files) > 0:
-        return True
+
+    # One match is enough
+    for fname in allfiles:
+        if fname.endswith('.ncml'):
+            return True
 
     return False
 
@@ -37,6 +37,10 @@ from ion.services.coi.datastore_bootstrap.ion_preload_config import RESOURCE_TYP
 from ion.services.coi.datastore_bootstrap.ion_preload_config import HAS_A_ID
 
 from ion.services.dm.inventory.association_service import AssociationServiceClient, ASSOCIATION_QUERY_MSG_TYPE, ASSOCIATION_GET_STAR_MSG_TYPE
+from ion.services.dm.inventory.association_service import EXISTS_MANY_SUBJECT_QUERIES
+from ion.core.data.storage_configuration_utility import SUBJECT_KEY, PREDICATE_KEY, OBJECT_KEY
+from ion.core.intercept.policy import PolicyInterceptor
+from ion.core.process.cprocess import Invocation
 from ion.services.dm.inventory.association_service import PREDICATE_OBJECT_QUERY_TYPE, IDREF_TYPE, SUBJECT_PREDICATE_QUERY_TYPE
 
 
@@ -120,6 +124,66 @@ class AssociationServiceTest(IonTestCase):
         self.assertIn(result.idrefs[2].key, [ANONYMOUS_USER_ID, ROOT_USER_ID, MYOOICI_USER_ID])
 
 
+    @defer.inlineCallbacks
+    def test_association_by_type_key_regex(self):
+
+        request = yield self.proc.message_client.create_instance(PREDICATE_OBJECT_QUERY_TYPE)
+
+        pair = request.pairs.add()
+
+        # Set the predicate search term
+        pref = request.CreateObject(PREDICATE_REFERENCE_TYPE)
+        pref.key = TYPE_OF_ID
+
+        pair.predicate = pref
+
+        # Set the Object search term
+
+        type_ref = request.CreateObject(IDREF_TYPE)
+        type_ref.key = IDENTITY_RESOURCE_TYPE_ID
+
+        pair.object = type_ref
+
+        result = yield self.asc.get_subjects(request, key_regex='^' + ROOT_USER_ID)
+        self.assertEqual(len(result.idrefs),1)
+        self.assertEqual(result.idrefs[0].key, ROOT_USER_ID)
+
+        result = yield self.asc.get_subjects(request, key_regex='.+')
+        self.assertEqual(len(result.idrefs),3)
+
+        result = yield self.asc.get_subjects(request, key_regex='no such key')
+        self.assertEqual(len(result.idrefs),0)
+
+        yield self.failUnlessFailure(self.asc.get_subjects(request, key_regex='('), ReceivedApplicationError)
+
+    @defer.inlineCallbacks
+    def test_association_by_owner_key_regex(self):
+
+        request = yield self.proc.message_client.create_instance(PREDICATE_OBJECT_QUERY_TYPE)
+
+        pair = request.pairs.add()
+
+        # Set the predicate search term
+        pref = request.CreateObject(PREDICATE_REFERENCE_TYPE)
+        pref.key = OWNED_BY_ID
+
+        pair.predicate = pref
+
+        # Set the Object search term
+
+        type_ref = request.CreateObject(IDREF_TYPE)
+        type_ref.key = ANONYMOUS_USER_ID
+
+        pair.object = type_ref
+
+        result = yield self.asc.get_subjects(request, key_regex=SAMPLE_PROFILE_DATASET_ID)
+
+        key_list = []
+        for idref in result.idrefs:
+            key_list.append(idref.key)
+
+        self.assertEqual(key_list, [SAMPLE_PROFILE_DATASET_ID])
+
     @defer.inlineCallbacks
     def test_association_by_type_and_lcs(self):
 
@@ -734,6 +798,70 @@ class AssociationServiceTest(IonTestCase):
         result = yield self.asc.association_exists(request)
         self.assertEqual(result.result, True)
 
+    @defer.inlineCallbacks
+    def test_association_exists_many(self):
+        subjects = [SAMPLE_PROFILE_DATASET_ID, 'not_a_resource', SAMPLE_PROFILE_DATASET_ID]
+
+        result = yield self.asc.association_exists_many(subjects, OWNED_BY_ID, ANONYMOUS_USER_ID)
+        self.assertEqual(result, [True, False, True])
+
+        result = yield self.asc.association_exists_many(subjects, OWNED_BY_ID, ROOT_USER_ID)
+        self.assertEqual(result, [False, False, False])
+
+        # A batch of more distinct subjects is answered from one query
+        subjects = [SAMPLE_PROFILE_DATASET_ID] + ['not_a_resource_%d' % i for i in range(EXISTS_MANY_SUBJECT_QUERIES)]
+        result = yield self.asc.association_exists_many(subjects, OWNED_BY_ID, ANONYMOUS_USER_ID)
+        self.assertEqual(result, [True] + [False] * EXISTS_MANY_SUBJECT_QUERIES)
+
+    @defer.inlineCallbacks
+    def test_association_exists_many_single_subject(self):
+        asso_service = self._get_procinstance((yield self.sup.get_child_id('association_service')))
+
+        # Record the predicates of each query to the index store
+        queries = []
+        query = asso_service.index_store.query
+        def recording_query(q):
+            queries.append(dict([(name, value) for (name, value, op) in q.get_predicates()]))
+            return query(q)
+        self.patch(asso_service.index_store, 'query', recording_query)
+
+        result = yield self.asc.association_exists_many([SAMPLE_PROFILE_DATASET_ID], OWNED_BY_ID, ANONYMOUS_USER_ID)
+        self.assertEqual(result, [True])
+
+        # One query on the whole triple, not a scan of every row owned by the user
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(queries[0][SUBJECT_KEY], SAMPLE_PROFILE_DATASET_ID)
+        self.assertEqual(queries[0][PREDICATE_KEY], OWNED_BY_ID)
+        self.assertEqual(queries[0][OBJECT_KEY], ANONYMOUS_USER_ID)
+
+    @defer.inlineCallbacks
+    def test_check_owner(self):
+        # Count the requests to the association service
+        ops = []
+        rpc_send = AssociationServiceClient.rpc_send
+        def counting_rpc_send(client, operation, *args, **kwargs):
+            ops.append(operation)
+            return rpc_send(client, operation, *args, **kwargs)
+        self.patch(AssociationServiceClient, 'rpc_send', counting_rpc_send)
+
+        policy = PolicyInterceptor('policy')
+        uuid_list = [SAMPLE_PROFILE_DATASET_ID] * 100
+
+        invocation = Invocation(process=self.proc)
+        yield policy.check_owner(ANONYMOUS_USER_ID, uuid_list, invocation)
+        self.assertEqual(invocation.status, Invocation.STATUS_PROCESS)
+        self.assertEqual(ops, ['association_exists_many'])
+
+        # Dropped for the first resource which is not owned
+        uuid_list[50] = 'not_owned_50'
+        uuid_list[70] = 'not_owned_70'
+        del ops[:]
+        invocation = Invocation(process=self.proc)
+        yield policy.check_owner(ANONYMOUS_USER_ID, uuid_list, invocation)
+        self.assertEqual(invocation.status, Invocation.STATUS_DROP)
+        self.assertEqual(invocation.code, Invocation.CODE_UNAUTHORIZED)
+        self.assertEqual(ops, ['association_exists_many'])
+
     @defer.inlineCallbacks
     def test_get_star(self):
 
@@ -8,6 +8,10 @@
 import ion.util.ionlog
 log = ion.util.ionlog.getLogger(__name__)
 
+import os
+import shutil
+import tempfile
+
 from twisted.internet import defer
 
 from ion.core.process import process
@@ -19,8 +23,10 @@ from ion.util.procutils import asleep
 
 
 # Message types
+from ion.services.dm.inventory import dataset_controller
 from ion.services.dm.inventory.dataset_controller import FINDDATASETREQUEST_TYPE, \
-    DatasetControllerClient, CMD_DATASET_RESOURCE_TYPE
+    DatasetControllerClient, CMD_DATASET_RESOURCE_TYPE, DatasetController
+from ion.services.dm.inventory.ncml_generator import create_ncml
 
 
 from ion.core import ioninit
@@ -162,3 +168,106 @@ class DatasetControllerTest(IonTestCase):
 
             self.assertEqual(dataset.ResourceLifeCycleState, dataset.ACTIVE)
 
+
+class StubIdRef(object):
+    def __init__(self, key):
+        self.key = key
+
+class StubQueryResult(object):
+    def __init__(self, keys):
+        self.idrefs = [StubIdRef(key) for key in keys]
+
+class StubAssociationClient(object):
+    """
+    Returns a fixed list of dataset ids for any get_subjects query
+    """
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.calls = 0
+
+    def get_subjects(self, query):
+        self.calls += 1
+        return defer.succeed(StubQueryResult(self.keys))
+
+
+class DatasetControllerNcmlSyncTest(IonTestCase):
+    """
+    Tests that the scheduled NcML sync only touches the files of changed datasets
+    """
+
+    @defer.inlineCallbacks
+    def setUp(self):
+        yield self._start_container()
+
+        self.ncml_path = tempfile.mkdtemp()
+        self.dsc = DatasetController(spawnargs={'ncml_path':self.ncml_path, 'do-init':False})
+        self.dsc.asc = StubAssociationClient(['ds_a', 'ds_b'])
+
+        self.written = []
+        create_ncml = dataset_controller.create_ncml
+        def counting_create_ncml(id_ref, filepath=""):
+            self.written.append(id_ref)
+            return create_ncml(id_ref, filepath)
+        self.patch(dataset_controller, 'create_ncml', counting_create_ncml)
+
+        self.rsyncs = 0
+        def stub_rsync(local_ncml_path, server_url):
+            self.rsyncs += 1
+            return defer.succeed(None)
+        self.patch(dataset_controller, 'do_complete_rsync', stub_rsync)
+
+    @defer.inlineCallbacks
+    def tearDown(self):
+        shutil.rmtree(self.ncml_path)
+        yield self._stop_container()
+
+    def _ncml_files(self):
+        return sorted(os.listdir(self.ncml_path))
+
+    @defer.inlineCallbacks
+    def test_ncml_sync(self):
+        yield self.dsc.do_ncml_sync()
+        self.assertEqual(sorted(self.written), ['ds_a', 'ds_b'])
+        self.assertEqual(self._ncml_files(), ['ds_a.ncml', 'ds_b.ncml'])
+        self.assertEqual(self.rsyncs, 1)
+
+        # Unchanged tick: no file writes and no rsync
+        mtimes = [os.stat(os.path.join(self.ncml_path, fname)).st_mtime for fname in self._ncml_files()]
+        del self.written[:]
+        yield self.dsc.do_ncml_sync()
+        self.assertEqual(self.dsc.asc.calls, 2)
+        self.assertEqual(self.written, [])
+        self.assertEqual(self.rsyncs, 1)
+        self.assertEqual([os.stat(os.path.join(self.ncml_path, fname)).st_mtime for fname in self._ncml_files()], mtimes)
+
+        # Only the added dataset is written, the removed one is deleted
+        self.dsc.asc.keys = ['ds_b', 'ds_c']
+        yield self.dsc.do_ncml_sync()
+        self.assertEqual(self.written, ['ds_c'])
+        self.assertEqual(self._ncml_files(), ['ds_b.ncml', 'ds_c.ncml'])
+        self.assertEqual(self.rsyncs, 2)
+
+    @defer.inlineCallbacks
+    def test_ncml_sync_removes_stale_files(self):
+        # Left behind by a dataset deleted while the service was down
+        create_ncml('ds_gone', self.ncml_path)
+
+        yield self.dsc.do_ncml_sync()
+        self.assertEqual(self._ncml_files(), ['ds_a.ncml', 'ds_b.ncml'])
+
+    @defer.inlineCallbacks
+    def test_ncml_sync_after_rsync_failure(self):
+        yield self.dsc.do_ncml_sync()
+
+        def failing_rsync(local_ncml_path, server_url):
+            return defer.fail(RuntimeError('rsync failed'))
+        self.patch(dataset_controller, 'do_complete_rsync', failing_rsync)
+
+        self.dsc.asc.keys = ['ds_b']
+        yield self.failUnlessFailure(self.dsc.do_ncml_sync(), RuntimeError)
+        self.assertEqual(self._ncml_files(), ['ds_b.ncml'])
+
+        # The removal is retried with the file already gone
+        self.patch(dataset_controller, 'do_complete_rsync', lambda local_ncml_path, server_url: defer.succeed(None))
+        yield self.dsc.do_ncml_sync()
+        self.assertEqual(self.dsc.ncml_ids, set(['ds_b']))
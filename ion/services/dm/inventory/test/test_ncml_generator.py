@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""
+@file ion/services/dm/inventory/test/test_ncml_generator.py
+@brief Test cases for writing NcML files only when their content changes
+"""
+
+import os
+import shutil
+import stat
+import tempfile
+
+from twisted.trial import unittest
+
+from ion.services.dm.inventory import ncml_generator
+from ion.services.dm.inventory.ncml_generator import create_ncml, remove_ncml, list_ncml_ids, check_for_ncml_files
+
+
+class NcmlGeneratorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ncml_path = tempfile.mkdtemp()
+        self.filename = os.path.join(self.ncml_path, 'ds_a.ncml')
+
+    def tearDown(self):
+        shutil.rmtree(self.ncml_path)
+
+    def _read(self):
+        fh = open(self.filename)
+        try:
+            return fh.read()
+        finally:
+            fh.close()
+
+    def test_new_file(self):
+        self.assertFalse(check_for_ncml_files(self.ncml_path))
+
+        self.assertEqual(create_ncml('ds_a', self.ncml_path), True)
+        self.assertEqual(self._read(), ncml_generator.file_template % 'ds_a')
+        self.assertEqual(stat.S_IMODE(os.stat(self.filename).st_mode), ncml_generator.NCML_FILE_MODE)
+
+        # No temp files left behind
+        self.assertEqual(os.listdir(self.ncml_path), ['ds_a.ncml'])
+        self.assertTrue(check_for_ncml_files(self.ncml_path))
+
+    def test_unchanged_file(self):
+        self.assertEqual(create_ncml('ds_a', self.ncml_path), True)
+        os.utime(self.filename, (1000000000, 1000000000))
+
+        self.assertEqual(create_ncml('ds_a', self.ncml_path), False)
+        self.assertEqual(os.stat(self.filename).st_mtime, 1000000000)
+        self.assertEqual(os.listdir(self.ncml_path), ['ds_a.ncml'])
+
+    def test_changed_file(self):
+        fh = open(self.filename, 'w')
+        fh.write('<netcdf location="ion://stale"/>\n')
+        fh.close()
+        os.utime(self.filename, (1000000000, 1000000000))
+
+        self.assertEqual(create_ncml('ds_a', self.ncml_path), True)
+        self.assertEqual(self._read(), ncml_generator.file_template % 'ds_a')
+        self.assertNotEqual(os.stat(self.filename).st_mtime, 1000000000)
+        self.assertEqual(os.listdir(self.ncml_path), ['ds_a.ncml'])
+
+    def test_write_error(self):
+        missing_path = os.path.join(self.ncml_path, 'missing')
+        self.assertEqual(create_ncml('ds_a', missing_path), None)
+
+    def test_remove(self):
+        create_ncml('ds_a', self.ncml_path)
+        self.assertEqual(remove_ncml('ds_a', self.ncml_path), True)
+        self.assertEqual(os.listdir(self.ncml_path), [])
+        self.assertEqual(remove_ncml('ds_a', self.ncml_path), False)
+
+    def test_remove_missing_file(self):
+        def fail_exception(*args, **kwargs):
+            self.fail('Missing file logged as an error')
+        self.patch(ncml_generator.log, 'exception', fail_exception)
+
+        self.assertEqual(remove_ncml('ds_a', self.ncml_path), False)
+
+    def test_list_ncml_ids(self):
+        self.assertEqual(list_ncml_ids(self.ncml_path), set())
+
+        create_ncml('ds_a', self.ncml_path)
+        create_ncml('ds_b', self.ncml_path)
+        open(os.path.join(self.ncml_path, 'notes.txt'), 'w').close()
+        self.assertEqual(list_ncml_ids(self.ncml_path), set(['ds_a', 'ds_b']))
+
+        self.assertEqual(list_ncml_ids(os.path.join(self.ncml_path, 'missing')), set())
@@ -23,6 +23,7 @@ from ion.core.process.service_process import ServiceProcess, ServiceClient
 from ion.core.messaging.message_client import MessageClient
 from ion.core.object import object_utils
 from ion.services.dm.distribution.events import ScheduleEventPublisher
+from ion.services.dm.scheduler.task_timer import TaskTimer
 
 from ion.core.data.storage_configuration_utility import STORAGE_PROVIDER, PERSISTENT_ARCHIVE, get_cassandra_configuration
 
@@ -190,8 +191,12 @@ class SchedulerService(ServiceProcess):
 
         self.mc = MessageClient(proc=self)
 
-        # maps task_ids to IDelayedCall objects, popped off when callback is called, used to cancel tasks
-        self._callback_tasks = {}
+        # maps task_ids to task definitions (the index attributes in the store), loaded on activate
+        self._tasks = {}
+
+        # one reactor timer for all tasks; tasks due in the same tick are sent together
+        self._timer = TaskTimer(self._send_and_reschedule,
+                                tick=float(self.spawn_args.get('timer_tick', CONF.getValue('timer_tick', default=0.1))))
 
         # will move pub through the lifecycle states with the service
         self.pub = ScheduleEventPublisher(process=self)
@@ -226,33 +231,32 @@ class SchedulerService(ServiceProcess):
         rows = yield self.scheduled_events.query(query)
 
         for task_id, tdef in rows.iteritems():
-            log.debug("slc_activate: scheduling %s" % task_id)
+            log.debug("slc_activate: scheduling %s", task_id)
 
-            # could be None
-            try:
-                start_time = int(tdef['start_time'])
-            except ValueError:
-                start_time = None
+            self._tasks[task_id] = tdef
+            if not self._schedule_event(self._get_time(tdef, 'start_time'), int(tdef['interval_seconds']), task_id,
+                                        self._get_time(tdef, 'end_time')):
+                yield self._expire_task(task_id)
 
-            self._schedule_event(start_time, int(tdef['interval_seconds']), task_id)
-        
-        
-        
     def slc_terminate(self):
         """
         Called before terminate, this is a good place to tear down the AS and jobs.
-        @todo iterate over the list
-        foreach task in op_query:
-          rm_task(task)
         """
-        for k, v in self._callback_tasks.iteritems():
-            if v.active():
-                v.cancel()
+        self._timer.stop()
 
-    def _schedule_event(self, starttime, interval, task_id, query_result=None):
+    def _get_time(self, tdef, key):
+        """
+        Start and end times are stored as strings, 'None' if unset.
         """
-        Helper method to schedule and record a callback in the service.
-        Used by op_add_task and on startup.
+        try:
+            return int(tdef[key])
+        except (KeyError, ValueError):
+            return None
+
+    def _schedule_event(self, starttime, interval, task_id, endtime=None):
+        """
+        Helper method to schedule a callback in the service's task timer.
+        Used by op_add_task, on startup and after each callback.
 
         @param  starttime       The time to start the callbacks. This is used with the interval to calculate the
                                 first callback. If None is specified, will use now. Note: the first callback to
@@ -262,8 +266,8 @@ class SchedulerService(ServiceProcess):
                                 use the IonTime utility class.
         @param  interval        The interval to trigger scheduler events, in seconds.
         @param  task_id         The task_id to trigger.
-        @param  query_result    Internal param passed on from service activation which contains the query result already
-                                instead of making _send_and_reschedule go get it again.
+        @param  endtime         The time after which no more callbacks occur, UNIX epoch in ms. None for no end.
+        @retval False if the next callback would be after endtime and the task was not scheduled, True otherwise
         """
         assert interval and task_id and interval > 0
         curtime = IonTime().time_ms
@@ -279,10 +283,25 @@ class SchedulerService(ServiceProcess):
             # start time is in THE FUTURE
             calctime = 0 - int(diff/1000) + interval
 
-        log.debug("_schedule_event: calculated next callback time of %d" % calctime)
+        if endtime is not None and curtime + calctime * 1000 > endtime:
+            log.debug("_schedule_event: task %s ends before next callback", task_id)
+            self._timer.cancel(task_id)
+            return False
+
+        log.debug("_schedule_event: calculated next callback time of %d", calctime)
 
-        ccl = reactor.callLater(calctime, self._send_and_reschedule, task_id, query_result=query_result)
-        self._callback_tasks[task_id] = ccl
+        self._timer.schedule(task_id, calctime)
+        return True
+
+    @defer.inlineCallbacks
+    def _expire_task(self, task_id):
+        """
+        Drops a task that is past its end_time from the task table and store.
+        """
+        log.info("Task %s reached its end_time, removing", task_id)
+        self._timer.cancel(task_id)
+        del self._tasks[task_id]
+        yield self.scheduled_events.remove(task_id)
 
     @defer.inlineCallbacks
     def op_add_task(self, content, headers, msg):
@@ -321,8 +340,10 @@ class SchedulerService(ServiceProcess):
             else:
                 payload = None
             if content.IsFieldSet('end_time'):
-                log.warn("Scheduler does not handle end_time yet!")
                 endtime = content.end_time
+
+                if starttime is not None and endtime < starttime:
+                    raise SchedulerError("end_time is before start_time", content.ResponseCodes.BAD_REQUEST)
             else:
                 endtime = None
             if content.IsFieldSet('user_id'):
@@ -338,10 +359,9 @@ class SchedulerService(ServiceProcess):
 
         resp = yield self.mc.create_instance(ADDTASK_RSP_TYPE)
 
-        # check to see if the task_id already exists in the store
-        existing_task = yield self.scheduled_events.get(task_id)
-        if existing_task is not None:
-            log.info("Already have task with id %s scheduled." % task_id)
+        # check to see if the task_id already exists, the task table mirrors the store
+        if task_id in self._tasks:
+            log.info("Already have task with id %s scheduled.", task_id)
             resp.duplicate = True
             resp.task_id = task_id
             yield self.reply_ok(msg, resp)
@@ -352,21 +372,24 @@ class SchedulerService(ServiceProcess):
         resp.origin     = desired_origin
 
         # extract content of message
+        tdef = {'task_id': task_id,
+                'constant': '1',    # used for being able to pull all tasks
+                'user_id': user_id,
+                'start_time': str(starttime),
+                'end_time': str(endtime),
+                'interval_seconds': str(msg_interval),
+                'desired_origin': desired_origin,
+                'payload': str(payload)}
         yield self.scheduled_events.put(task_id,
                                         task_id,  # ok to use for value? seems kind of silly
-                                        index_attributes={'task_id': task_id,
-                                                          'constant': '1',    # used for being able to pull all tasks
-                                                          'user_id': user_id,
-                                                          'start_time': str(starttime),
-                                                          'end_time': str(endtime),
-                                                          'interval_seconds': str(msg_interval),
-                                                          'desired_origin': desired_origin,
-                                                          'payload': str(payload)})
+                                        index_attributes=tdef)
 
         # Now that task is stored into registry, add to messaging callback
         log.debug('Adding task to scheduler')
 
-        self._schedule_event(starttime, msg_interval, task_id)
+        self._tasks[task_id] = tdef
+        if not self._schedule_event(starttime, msg_interval, task_id, endtime):
+            yield self._expire_task(task_id)
 
         log.debug('Add completed OK')
 
@@ -375,8 +398,7 @@ class SchedulerService(ServiceProcess):
     @defer.inlineCallbacks
     def op_rm_task(self, content, headers, msg):
         """
-        Remove a task from the list/store. Will be dropped from the reactor
-        when the timer fires and _send_and_reschedule checks the registry.
+        Remove a task from the task table, timer and store.
         """
         task_id = content.task_id
 
@@ -387,9 +409,8 @@ class SchedulerService(ServiceProcess):
             return
 
         # if the task is active, remove it
-        if self._callback_tasks.has_key(task_id):
-            self._callback_tasks[task_id].cancel()
-            del self._callback_tasks[task_id]
+        self._timer.cancel(task_id)
+        self._tasks.pop(task_id, None)
 
         log.debug('Removing task_id %s from store...' % task_id)
         yield self.scheduled_events.remove(task_id)
@@ -404,37 +425,43 @@ class SchedulerService(ServiceProcess):
     # Internal methods
 
     @defer.inlineCallbacks
-    def _send_and_reschedule(self, task_id, query_result=None):
+    def _send_and_reschedule(self, task_ids):
         """
-        Check to see if we're still in the store - if not, we've been removed
-        and should abort the run.
-
-        @param  query_result    Internal param - passed in from Scheduler activation, which has already done a query.
-                                Allows us to skip making another query for the info we already have.
+        Timer callback with the tasks that are due in this tick. Each task is
+        rescheduled (or expired, past its end_time) first, so a failing task
+        does not keep the others from running again. Then the events of all
+        the tasks are published at once.
         """
-        log.debug('Worker activated for task %s' % task_id)
-
-        if query_result is None:
-            q = Query()
-            q.add_predicate_eq('task_id', task_id)
+        sends = []
+        for task_id in task_ids:
+            tdef = self._tasks.get(task_id, None)
+            if tdef is None:
+                log.warn("task_id %s no longer in task table, aborting", task_id)
+                continue
 
-            tdefs = yield self.scheduled_events.query(q)
-            if len(tdefs) != 1:
-                log.error("Query did not find task_id: %s, expected 1, got %d" % (task_id, len(tdefs)))
-                defer.returnValue(False)
+            try:
+                # start time of None is fine, we just happened so we can be sure interval_seconds is just about right
+                if self._schedule_event(None, int(tdef['interval_seconds']), task_id, self._get_time(tdef, 'end_time')):
+                    log.debug('Task %s rescheduled for %s seconds OK', task_id, tdef['interval_seconds'])
+                else:
+                    yield self._expire_task(task_id)
+            except Exception:
+                log.exception("Could not reschedule task %s", task_id)
 
-            tdef = tdefs.values()[0]
-        else:
-            tdef = query_result
+            sends.append((task_id, self._send_event(task_id, tdef)))
 
-        # pop callback object off of scheduled items
-        if not self._callback_tasks.has_key(task_id):
-            log.warn("task_id %s no longer in list of callbacks, aborting" % task_id)
-            defer.returnValue(False)
-        del self._callback_tasks[task_id]
+        results = yield defer.DeferredList([d for (task_id, d) in sends], consumeErrors=True)
+        for (task_id, d), (success, result) in zip(sends, results):
+            if not success:
+                log.error("Could not send event for task %s: %s", task_id, result.getTraceback())
 
+    @defer.inlineCallbacks
+    def _send_event(self, task_id, tdef):
+        """
+        Publishes the schedule event of a task, with the task payload.
+        """
         # deserialize and objectify payload
-        log.debug('Time to send to "%s", id "%s"' % (tdef['desired_origin'], task_id))
+        log.debug('Time to send to "%s", id "%s"', tdef['desired_origin'], task_id)
 
         msg = yield self.pub.create_event(origin=tdef['desired_origin'],
                                           task_id=tdef['task_id'],
@@ -451,7 +478,7 @@ class SchedulerService(ServiceProcess):
 
         yield self.pub.publish_event(msg, origin=tdef['desired_origin'])
 
-        log.debug('Send completed, rescheduling %s' % task_id)
+        log.debug('Send completed for %s', task_id)
 
         #################################################
         ## BANDAID FIX FOR 262 RE-OPEN
@@ -467,14 +494,9 @@ class SchedulerService(ServiceProcess):
         try:
             self.workbench.clear_repository(msg.Repository)
         except Exception, ex:
-            log.error("Could not clear repository: %s" % str(ex))
+            log.error("Could not clear repository: %s", ex)
             pass
 
-        # start time of None is fine, we just happened so we can be sure interval_seconds is just about right
-        self._schedule_event(None, int(tdef['interval_seconds']), task_id)
-
-        log.debug('Task %s rescheduled for %s seconds OK' % (task_id, tdef['interval_seconds']))
-
 class SchedulerServiceClient(ServiceClient):
     """
     Client class for the SchedulerService, simple muster/send/reply.
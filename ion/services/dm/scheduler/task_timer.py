@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""
+@file ion/services/dm/scheduler/task_timer.py
+@package ion.services.dm.scheduler.task_timer Single reactor timer for many scheduled tasks
+"""
+
+import heapq
+
+from twisted.internet import reactor
+
+import ion.util.ionlog
+log = ion.util.ionlog.getLogger(__name__)
+
+
+class TaskTimer(object):
+    """
+    Keeps the next firing time of any number of tasks in a heap and drives
+    them all from one reactor DelayedCall, armed for the earliest task.
+    Tasks that are due within the same tick are handed to the callback
+    together, as a list of task ids.
+
+    Rescheduling or cancelling a task leaves its old heap entry in place; such
+    stale entries are skipped when popped and dropped when the heap is
+    compacted.
+    """
+
+    def __init__(self, callback, tick=0.1, clock=None):
+        """
+        @param callback Called with a list of due task ids
+        @param tick     Tasks due within this many seconds of each other fire together
+        @param clock    IReactorTime provider, the reactor by default
+        """
+        self.callback = callback
+        self.tick = tick
+        self.clock = clock or reactor
+
+        # heap of (fire time, sequence number, task id)
+        self._heap = []
+        self._seq = 0
+        # maps task ids to their current fire time
+        self._due = {}
+        self._delayed_call = None
+
+    def __len__(self):
+        return len(self._due)
+
+    def __contains__(self, task_id):
+        return task_id in self._due
+
+    def schedule(self, task_id, delay):
+        """
+        Schedules (or reschedules) a task to fire after delay seconds.
+        """
+        fire_time = self.clock.seconds() + delay
+        self._due[task_id] = fire_time
+        self._seq += 1
+        heapq.heappush(self._heap, (fire_time, self._seq, task_id))
+
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._compact()
+        self._arm()
+
+    def cancel(self, task_id):
+        """
+        Removes a task, returns True if it was scheduled.
+        """
+        if self._due.pop(task_id, None) is None:
+            return False
+        if not self._due:
+            del self._heap[:]
+        self._arm()
+        return True
+
+    def stop(self):
+        """
+        Removes all tasks and the reactor timer.
+        """
+        self._due.clear()
+        del self._heap[:]
+        self._arm()
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if self._due.get(entry[2]) == entry[0]]
+        heapq.heapify(self._heap)
+
+    def _pop_stale(self):
+        heap = self._heap
+        while heap and self._due.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _arm(self):
+        """
+        Points the DelayedCall at the earliest fire time, or cancels it if
+        there are no tasks.
+        """
+        self._pop_stale()
+        dc = self._delayed_call
+        if not self._heap:
+            if dc is not None and dc.active():
+                dc.cancel()
+            self._delayed_call = None
+            return
+
+        fire_time = self._heap[0][0]
+        if dc is not None and dc.active():
+            # An earlier timer fires without due tasks and re-arms
+            if dc.getTime() > fire_time:
+                dc.reset(max(0, fire_time - self.clock.seconds()))
+        else:
+            self._delayed_call = self.clock.callLater(max(0, fire_time - self.clock.seconds()), self._fire)
+
+    def _fire(self):
+        self._delayed_call = None
+        horizon = self.clock.seconds() + self.tick
+
+        heap = self._heap
+        task_ids = []
+        while heap and heap[0][0] <= horizon:
+            (fire_time, seq, task_id) = heapq.heappop(heap)
+            if self._due.get(task_id) == fire_time:
+                del self._due[task_id]
+                task_ids.append(task_id)
+
+        self._arm()
+
+        if task_ids:
+            log.debug("TaskTimer firing %d tasks", len(task_ids))
+            self.callback(task_ids)
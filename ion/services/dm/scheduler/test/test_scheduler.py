@@ -341,3 +341,70 @@ class SchedulerTest(IonTestCase):
         scdef = sc.add_task(msg_a)
         yield self.failUnlessFailure(scdef, ReceivedApplicationError)
         self.failUnlessEquals(scdef.result.msg_content.MessageResponseCode, scdef.result.msg_content.ResponseCodes.BAD_REQUEST)
+
+    @defer.inlineCallbacks
+    def test_end_time(self):
+
+        mc = MessageClient(proc=self.proc)
+        sc = SchedulerServiceClient(proc=self.proc)
+
+        msg_a = yield mc.create_instance(ADDTASK_REQ_TYPE)
+        msg_a.desired_origin    = SCHEDULE_TYPE_PERFORM_INGESTION_UPDATE
+        msg_a.interval_seconds  = 1
+
+        msg_a.payload           = msg_a.CreateObject(SCHEDULE_TYPE_PERFORM_INGESTION_UPDATE_PAYLOAD_TYPE)
+        msg_a.payload.dataset_id = "THE END"
+        msg_a.payload.datasource_id = "IS NEAR"
+
+        # stop sending after 2.5 sec
+        msg_a.end_time          = IonTime().time_ms + 2500
+
+        yield sc.add_task(msg_a)
+
+        yield asleep(5)
+        self.failUnless(len(self._notices) > 0, "Could be an intermittent failure, waiting for message delivery")
+        self.failUnless(len(self._notices) <= 2)
+
+        # end time before start time is an error
+        msg_a = yield mc.create_instance(ADDTASK_REQ_TYPE)
+        msg_a.desired_origin    = SCHEDULE_TYPE_PERFORM_INGESTION_UPDATE
+        msg_a.interval_seconds  = 30
+        msg_a.start_time        = IonTime().time_ms + 5000
+        msg_a.end_time          = IonTime().time_ms
+
+        scdef = sc.add_task(msg_a)
+        yield self.failUnlessFailure(scdef, ReceivedApplicationError)
+        self.failUnlessEquals(scdef.result.msg_content.MessageResponseCode, scdef.result.msg_content.ResponseCodes.BAD_REQUEST)
+
+    @defer.inlineCallbacks
+    def test_failing_task_in_batch(self):
+        sched = self._get_service_by_name('scheduler')
+
+        tasks = {}
+        for task_id, interval in (('bad_interval', 'never'), ('slow_send', '30'), ('fast_send', '30')):
+            tasks[task_id] = {'task_id': task_id, 'interval_seconds': interval, 'end_time': 'None'}
+        self.patch(sched, '_tasks', tasks)
+
+        sends = {}
+        def deferred_send_event(task_id, tdef):
+            sends[task_id] = defer.Deferred()
+            return sends[task_id]
+        self.patch(sched, '_send_event', deferred_send_event)
+
+        done = sched._send_and_reschedule(['bad_interval', 'slow_send', 'fast_send'])
+
+        # The tasks after the one which could not be rescheduled run again
+        self.failIf('bad_interval' in sched._timer)
+        self.failUnless('slow_send' in sched._timer)
+        self.failUnless('fast_send' in sched._timer)
+
+        # All the events are sent at once, a slow or failing send holds up no other
+        self.assertEqual(sorted(sends), ['bad_interval', 'fast_send', 'slow_send'])
+        sends['bad_interval'].errback(Exception('publish failed'))
+        sends['fast_send'].callback(None)
+        self.failIf(done.called)
+        sends['slow_send'].callback(None)
+        yield done
+
+        sched._timer.cancel('slow_send')
+        sched._timer.cancel('fast_send')
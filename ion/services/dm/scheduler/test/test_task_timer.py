@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""
+@file ion/services/dm/scheduler/test/test_task_timer.py
+@test ion.services.dm.scheduler.task_timer Single timer for many tasks
+"""
+
+from twisted.internet import task
+from twisted.trial import unittest
+
+from ion.services.dm.scheduler.task_timer import TaskTimer
+
+
+class TaskTimerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = task.Clock()
+        self.fired = []
+        self.timer = TaskTimer(self.fired.append, tick=0.1, clock=self.clock)
+
+    def test_single_delayed_call(self):
+        for i in range(1000):
+            self.timer.schedule('task%d' % i, 10 + i)
+        self.assertEqual(len(self.timer), 1000)
+        self.assertEqual(len(self.clock.getDelayedCalls()), 1)
+
+        self.clock.advance(10)
+        self.assertEqual(self.fired, [['task0']])
+        self.clock.advance(1)
+        self.assertEqual(self.fired, [['task0'], ['task1']])
+
+        # Overdue tasks all fire at once
+        self.clock.advance(998)
+        self.assertEqual(len(self.fired), 3)
+        self.assertEqual(sum([len(task_ids) for task_ids in self.fired]), 1000)
+        self.assertEqual(self.clock.getDelayedCalls(), [])
+
+    def test_coalesce_tick(self):
+        self.timer.schedule('a', 5)
+        self.timer.schedule('b', 5.05)
+        self.timer.schedule('c', 5.5)
+        self.clock.advance(5)
+        self.assertEqual(self.fired, [['a', 'b']])
+        self.clock.advance(0.5)
+        self.assertEqual(self.fired, [['a', 'b'], ['c']])
+
+    def test_reschedule_and_cancel(self):
+        self.timer.schedule('a', 5)
+        self.timer.schedule('b', 6)
+        self.timer.schedule('a', 8)
+        self.assertTrue(self.timer.cancel('b'))
+        self.assertFalse(self.timer.cancel('b'))
+        self.assertFalse('b' in self.timer)
+
+        self.clock.advance(7)
+        self.assertEqual(self.fired, [])
+        self.clock.advance(1)
+        self.assertEqual(self.fired, [['a']])
+
+    def test_earlier_task_rearms(self):
+        self.timer.schedule('a', 10)
+        self.timer.schedule('b', 2)
+        self.clock.advance(2)
+        self.assertEqual(self.fired, [['b']])
+
+    def test_stop(self):
+        self.timer.schedule('a', 1)
+        self.timer.stop()
+        self.assertEqual(self.clock.getDelayedCalls(), [])
+        self.clock.advance(2)
+        self.assertEqual(self.fired, [])
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""
+@file ion/test/loadtests/logbench.py
+@brief Microbenchmark of the per message logging overhead on the messaging
+hot path, comparing eager '%' formatting on a plain logging.Logger with
+deferred arguments on an ionlog IonLogger.
+
+Use: bin/python -m ion.test.loadtests.logbench [messages]
+"""
+
+import logging
+import os
+import sys
+import time
+
+import ion.util.ionlog
+from ion.util.ionlog import IonLogger
+
+class FakeWorkbench(object):
+    """
+    Stands in for a WorkBench, whose string form walks every repository.
+    """
+    def __str__(self):
+        return '\n'.join(['Repository %d: %s' % (i, 'x' * 64) for i in range(50)])
+
+def eager_message(log, headers, workbench):
+    # The pattern of log statements in Receiver.receive and Process.receive
+    # before the conversion to deferred arguments.
+    log.info('Start Receiver.Receive on proc: %s' % str(headers['receiver']))
+    log.info('Process "%s" Receiver Message Headers: OP - %s, Sender - %s, Convid - %s, Performative - %s, Protocol - %s' % (
+        headers['receiver'], headers['op'], headers['sender'], headers['conv-id'], headers['performative'], headers['protocol']))
+    log.info('Receiver Context: %s' % str(headers))
+    log.debug("WORKBENCH STATE after incoming message is added:\n%s" % str(workbench))
+    log.debug("[%s] receive(): IN:user-id='%s',expiry='%s'" % (headers['receiver'], headers['user-id'], headers['expiry']))
+    log.info('>>> [%s] receive(): Message from [%s] ... >>>' % (headers['receiver'], headers['sender']))
+    log.debug('[%s] send(): using user id from msgheaders [%s]' % (headers['receiver'], headers['user-id']))
+    log.info("===Message SENT! >>>> %s -> %s: %s:%s:%s===" % (headers['sender'], headers['receiver'],
+        headers['protocol'], headers['performative'], headers['op']))
+    log.info('End Receiver.Receive on proc: %s' % str(headers['receiver']))
+
+def deferred_message(log, headers, workbench):
+    log.info('Start Receiver.Receive on proc: %s', headers['receiver'])
+    log.info('Process "%s" Receiver Message Headers: OP - %s, Sender - %s, Convid - %s, Performative - %s, Protocol - %s',
+        headers['receiver'], headers['op'], headers['sender'], headers['conv-id'], headers['performative'], headers['protocol'])
+    log.info('Receiver Context: %s', headers)
+    log.debug("WORKBENCH STATE after incoming message is added:\n%s", workbench)
+    log.debug("[%s] receive(): IN:user-id='%s',expiry='%s'", headers['receiver'], headers['user-id'], headers['expiry'])
+    log.info('>>> [%s] receive(): Message from [%s] ... >>>', headers['receiver'], headers['sender'])
+    log.debug('[%s] send(): using user id from msgheaders [%s]', headers['receiver'], headers['user-id'])
+    log.info("===Message SENT! >>>> %s -> %s: %s:%s:%s===", headers['sender'], headers['receiver'],
+        headers['protocol'], headers['performative'], headers['op'])
+    log.info('End Receiver.Receive on proc: %s', headers['receiver'])
+
+def make_logger(cls, name, stream):
+    logger = cls(name)
+    logger.parent = logging.getLogger('ion.test.loadtests')
+    logger.propagate = False
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] {%(module)s:%(lineno)3d} %(message)s'))
+    logger.addHandler(handler)
+    return logger
+
+def run(count):
+    headers = {'receiver':'datastore', 'sender':'ingestion', 'op':'push', 'conv-id':'conv#17',
+               'performative':'request', 'protocol':'rpc', 'user-id':'ANONYMOUS', 'expiry':'0'}
+    workbench = FakeWorkbench()
+    stream = open(os.devnull, 'w')
+
+    eager = make_logger(logging.Logger, 'ion.test.loadtests.eager', stream)
+    deferred = make_logger(IonLogger, 'ion.test.loadtests.deferred', stream)
+
+    for levelname in ('INFO', 'WARN'):
+        logging.getLogger('ion.test.loadtests').setLevel(getattr(logging, levelname))
+        ion.util.ionlog.refresh_log_levels()
+        for (label, func, log) in (('eager %', eager_message, eager),
+                                   ('deferred args', deferred_message, deferred)):
+            tzero = time.time()
+            for x in xrange(count):
+                func(log, headers, workbench)
+            delta_t = time.time() - tzero
+            print '%-5s %-14s %8.2f usec per message' % (levelname, label, delta_t / count * 1e6)
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    run(count)
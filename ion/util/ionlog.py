@@ -8,6 +8,74 @@
 import logging
 from ion.core import ioninit
 
+class IonLogger(logging.Logger):
+    """
+    Logger with cached level checks. The stock isEnabledFor walks the logger
+    hierarchy on every call; on the message hot paths most debug and info
+    calls are dropped, so the result is cached per level. The cache is
+    refreshed whenever ioninit.set_log_levels runs or any IonLogger level
+    is changed.
+    Use deferred formatting arguments with these loggers, e.g.
+    log.debug('Received %s', msg) instead of log.debug('Received %s' % msg),
+    and wrap expensive arguments with lazy().
+    """
+    def __init__(self, name, level=logging.NOTSET):
+        logging.Logger.__init__(self, name, level)
+        self._enabled = {}
+        self._levels_version = ioninit.log_levels_version
+
+    def isEnabledFor(self, level):
+        """
+        Is this logger enabled for the given level? Cached version of
+        logging.Logger.isEnabledFor.
+        """
+        if self.manager.disable >= level:
+            return False
+        if self._levels_version != ioninit.log_levels_version:
+            self._enabled = {}
+            self._levels_version = ioninit.log_levels_version
+        try:
+            return self._enabled[level]
+        except KeyError:
+            enabled = level >= self.getEffectiveLevel()
+            self._enabled[level] = enabled
+            return enabled
+
+    def setLevel(self, level):
+        """
+        Set the logging level and invalidate the cached level checks of all
+        loggers, since descendants inherit this level.
+        """
+        logging.Logger.setLevel(self, level)
+        refresh_log_levels()
+
+logging.setLoggerClass(IonLogger)
+
+def refresh_log_levels():
+    """
+    Invalidate the cached level checks of all IonLogger instances. Called by
+    ioninit.set_log_levels; call it after changing logger levels directly.
+    """
+    ioninit.log_levels_version += 1
+
+class lazy(object):
+    """
+    Defers an expensive computation in a log argument until the message is
+    actually formatted, e.g. log.debug('Head:\n%s', lazy(head.Debug)).
+    """
+    __slots__ = ('func', 'args', 'kwargs')
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+    def __repr__(self):
+        return repr(self.func(*self.args, **self.kwargs))
+
 class LogFactory(object):
     """
     Factory for producing logger objects with additional handlers.
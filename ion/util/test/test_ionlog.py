@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""
+@file ion/util/test/test_ionlog.py
+@brief Test cases for the cached level checks and deferred arguments of
+the ionlog logger facade.
+"""
+
+import logging
+
+from twisted.trial import unittest
+
+import ion.util.ionlog
+from ion.util.ionlog import IonLogger, lazy, refresh_log_levels
+from ion.core import ioninit
+
+
+class CountingHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class IonLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.parent = logging.getLogger('ion.util.test.ionlogtest')
+        self.parent_level = self.parent.level
+        self.log = ion.util.ionlog.getLogger('ion.util.test.ionlogtest.child')
+        self.handler = CountingHandler()
+        self.log.addHandler(self.handler)
+        self.log.propagate = False
+
+    def tearDown(self):
+        self.log.removeHandler(self.handler)
+        self.parent.setLevel(self.parent_level)
+        refresh_log_levels()
+
+    def test_logger_class(self):
+        self.assertIsInstance(self.log, IonLogger)
+
+    def test_cached_level_refresh(self):
+        self.parent.setLevel(logging.WARNING)
+        self.assertFalse(self.log.isEnabledFor(logging.INFO))
+        self.assertTrue(self.log.isEnabledFor(logging.ERROR))
+
+        # Level changes on the parent are picked up after a refresh
+        self.parent.setLevel(logging.DEBUG)
+        refresh_log_levels()
+        self.assertTrue(self.log.isEnabledFor(logging.INFO))
+
+    def test_set_log_levels_refresh(self):
+        version = ioninit.log_levels_version
+        ioninit.set_log_levels()
+        self.assertTrue(ioninit.log_levels_version > version)
+
+    def test_deferred_arguments(self):
+        calls = []
+        def expensive():
+            calls.append(1)
+            return 'state'
+
+        self.parent.setLevel(logging.WARNING)
+        refresh_log_levels()
+        self.log.info('State: %s', lazy(expensive))
+        self.assertEqual(calls, [])
+        self.assertEqual(self.handler.messages, [])
+
+        self.log.warn('State: %s', lazy(expensive))
+        self.assertEqual(calls, [1])
+        self.assertEqual(self.handler.messages, ['State: state'])
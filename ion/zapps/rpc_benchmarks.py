@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""
+@file ion/zapps/rpc_benchmarks.py
+@brief app that measures the RPC round trip latency in-container, with the
+    FSM based RpcType and the FastRpcType conversation implementation.
+    Use from the shell: rpc_latency() or rpc_latency(count)
+"""
+import time
+from twisted.internet import defer
+
+from ion.core.pack import app_supervisor
+from ion.core.process.process import ProcessDesc, Process
+from ion.core.cc.shell import control
+from ion.interact.conversation import conv_mgr_instance
+from ion.interact.rpc import RpcType
+from ion.interact.fast_rpc import FastRpcType
+
+from ion.play.hello_service import HelloServiceClient
+
+
+from ion.core import ioninit
+CONF = ioninit.config(__name__)
+
+@defer.inlineCallbacks
+def rpc_latency(count=2000):
+    proc = Process()
+    yield proc.spawn()
+    hc = HelloServiceClient(proc)
+    yield hc._check_init()
+
+    conv_types = conv_mgr_instance.conv_types
+    default_type = conv_types[RpcType.CONV_TYPE_RPC]
+    try:
+        for conv_type in (RpcType, FastRpcType):
+            # Both sides of the RPC are in this container
+            conv_types[RpcType.CONV_TYPE_RPC] = conv_type(id=RpcType.CONV_TYPE_RPC)
+
+            latencies = []
+            for x in xrange(count):
+                t0 = time.time()
+                yield hc.hello_deferred("Hi there, hello1")
+                latencies.append(time.time() - t0)
+
+            latencies.sort()
+            delta_t = sum(latencies)
+            print('%-12s %i RPCs: %f elapsed, mean %.3f ms, median %.3f ms, 99%% %.3f ms' % (
+                conv_type.__name__, count, delta_t, delta_t / count * 1000,
+                latencies[count / 2] * 1000, latencies[int(count * 0.99)] * 1000))
+    finally:
+        conv_types[RpcType.CONV_TYPE_RPC] = default_type
+
+    defer.returnValue(None)
+
+@defer.inlineCallbacks
+def start(container, starttype, app_definition, *args, **kwargs):
+
+    services = [
+            {'name':'hello1','module':'ion.play.hello_service','class':'HelloService'},
+    ]
+    appsup_desc = ProcessDesc(name='app-supervisor-' + app_definition.name,
+                              module=app_supervisor.__name__,
+                              spawnargs={'spawn-procs':services})
+    supid = yield appsup_desc.spawn()
+    control.add_term_name('rpc_latency', rpc_latency)
+    res = (supid.full, [appsup_desc])
+    defer.returnValue(res)
+
+@defer.inlineCallbacks
+def stop(container, state):
+
+    supdesc = state[0]
+    yield supdesc.terminate()